@@ -0,0 +1,276 @@
+"""
+Agregados por hora e por dia das séries temporais de um evento.
+
+AgregadoHora e AgregadoDia guardam, por (evento, período), inscrições
+(pela data de criação), confirmações (inscrições confirmadas, pela data de
+criação), check-ins (pela data do check-in), visualizações e interações com
+simuladores. As timelines de analytics leem só essas tabelas (ver
+`serie`), então o custo de um intervalo depende do número de períodos, não
+do número de registros: um ano em dias são no máximo 366 linhas de um
+índice, e semanas e meses são somados no banco a partir dos dias.
+
+A atualização é incremental (`atualizar`): MarcaAgregacao guarda até onde
+os dados brutos já foram lidos, cada registro criado ou alterado depois da
+marca torna "sujo" o período em que é contado, e só esses períodos são
+recalculados do zero a partir dos dados brutos e gravados por upsert.
+Recalcular em vez de somar deltas deixa a passada idempotente, então a
+leitura recomeça um pouco antes da marca (SOBREPOSICAO) para pegar
+transações confirmadas depois dela sem contar nada duas vezes. Os dias
+sujos são então resomados a partir das horas.
+
+Remoções não mudam nenhum updated_at e só são refletidas por
+`reconstruir` (manage.py update_analytics_rollups --rebuild).
+
+A atualização roda como job recorrente (`executar`), que se reagenda a
+cada settings.ANALYTICS_AGREGADOS_SEGUNDOS, com ou sem sucesso; as
+timelines ficam atrasadas no máximo esse tanto. `agendar` está em
+settings.JOBS_RECORRENTES, então os trabalhadores recriam o job se a
+cadeia se perder (banco fora do ar por mais que as tentativas, deploy
+novo).
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate, TruncHour, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from apps.inscricoes.models import Inscricao
+from apps.jobs.filas import enfileirar
+from .models import AgregadoDia, AgregadoHora, InteracaoSimulador, MarcaAgregacao, VisualizacaoEvento
+
+CAMPOS = [
+    'inscricoes',
+    'confirmacoes',
+    'checkins',
+    'visualizacoes',
+    'interacoes_simulador',
+    'duracao_simulador',
+]
+GRANULARIDADES = ['hora', 'dia', 'semana', 'mes']
+
+MARCA = 'timelines'
+CHAVE_JOB = 'analytics:agregados'
+SOBREPOSICAO = timedelta(minutes=5)
+LOTE_EVENTOS = 200
+TAMANHO_LOTE = 500
+
+
+def _fontes():
+    """
+    (registros, campo que define o período, campo que indica alteração,
+    agregados) de cada métrica.
+    """
+    return [
+        (
+            Inscricao.objects.all(), 'created_at', 'updated_at',
+            {'inscricoes': Count('id'), 'confirmacoes': Count('id', filter=Q(status='confirmada'))},
+        ),
+        (
+            Inscricao.objects.filter(data_checkin__isnull=False), 'data_checkin', 'updated_at',
+            {'checkins': Count('id', filter=Q(checkin_realizado=True))},
+        ),
+        (
+            VisualizacaoEvento.objects.all(), 'created_at', 'created_at',
+            {'visualizacoes': Count('id')},
+        ),
+        (
+            InteracaoSimulador.objects.all(), 'created_at', 'created_at',
+            {'interacoes_simulador': Count('id'), 'duracao_simulador': Sum('duracao_segundos')},
+        ),
+    ]
+
+
+def agendar(atraso=None):
+    if atraso is None:
+        atraso = getattr(settings, 'ANALYTICS_AGREGADOS_SEGUNDOS', 60)
+    enfileirar(executar, atraso=atraso, chave=CHAVE_JOB)
+
+
+def executar():
+    """Job recorrente: uma passada de `atualizar` e o agendamento da próxima."""
+    try:
+        sujos = atualizar()
+    finally:
+        # Mesmo se a passada falhar: a nova tentativa deste job é incorporada
+        # ao agendado (ver jobs.trabalhador._repetir) e a cadeia não para
+        agendar()
+    return {'horas': sujos}
+
+
+def atualizar(agora=None):
+    """
+    Recalcula os períodos com registros alterados desde a marca e avança a
+    marca. Sem marca (primeira execução), reconstrói tudo. Retorna o número
+    de horas recalculadas.
+    """
+    agora = agora or timezone.now()
+    marca = MarcaAgregacao.objects.filter(pk=MARCA).values_list('ate', flat=True).first()
+    if marca is None:
+        total = reconstruir()
+    else:
+        desde = marca - SOBREPOSICAO
+        sujos = defaultdict(set)
+        for registros, campo_periodo, campo_alteracao, _ in _fontes():
+            alterados = (
+                registros.filter(**{f'{campo_alteracao}__gt': desde, f'{campo_alteracao}__lte': agora})
+                .annotate(hora=TruncHour(campo_periodo))
+                .values_list('evento_id', 'hora')
+                .distinct()
+                .order_by()
+            )
+            for evento_id, hora in alterados:
+                sujos[evento_id].add(hora)
+
+        total = 0
+        evento_ids = list(sujos)
+        for inicio in range(0, len(evento_ids), LOTE_EVENTOS):
+            lote = {evento_id: sujos[evento_id] for evento_id in evento_ids[inicio:inicio + LOTE_EVENTOS]}
+            with transaction.atomic():
+                total += _recalcular(lote)
+
+    MarcaAgregacao.objects.update_or_create(pk=MARCA, defaults={'ate': agora})
+    return total
+
+
+def reconstruir(evento_ids=None):
+    """Refaz os agregados dos eventos (todos, se None) a partir dos dados brutos."""
+    if evento_ids is None:
+        evento_ids = set()
+        for registros, _, _, _ in _fontes():
+            evento_ids.update(registros.values_list('evento_id', flat=True).distinct().order_by())
+    evento_ids = list(evento_ids)
+
+    total = 0
+    for inicio in range(0, len(evento_ids), LOTE_EVENTOS):
+        lote = evento_ids[inicio:inicio + LOTE_EVENTOS]
+        with transaction.atomic():
+            AgregadoHora.objects.filter(evento_id__in=lote).delete()
+            AgregadoDia.objects.filter(evento_id__in=lote).delete()
+            total += _recalcular({evento_id: None for evento_id in lote})
+    return total
+
+
+def _recalcular(horas_por_evento):
+    """
+    Recalcula as horas indicadas de cada evento (todas, se None) e os dias
+    que as contêm. Retorna o número de horas gravadas.
+    """
+    evento_ids = list(horas_por_evento)
+    horas = set().union(*(horas for horas in horas_por_evento.values() if horas))
+    janela = (min(horas), max(horas) + timedelta(hours=1)) if horas else None
+
+    contagens = defaultdict(dict)
+    for registros, campo_periodo, _, agregados in _fontes():
+        filtro = {'evento_id__in': evento_ids}
+        if janela:
+            filtro[f'{campo_periodo}__gte'], filtro[f'{campo_periodo}__lt'] = janela
+        linhas = (
+            registros.filter(**filtro)
+            .annotate(hora=TruncHour(campo_periodo))
+            .values('evento_id', 'hora')
+            .annotate(**agregados)
+            .order_by()
+        )
+        for linha in linhas:
+            contagens[(linha.pop('evento_id'), linha.pop('hora'))].update(linha)
+
+    chaves = {
+        (evento_id, hora)
+        for evento_id, hora in contagens
+        if horas_por_evento[evento_id] is None or hora in horas_por_evento[evento_id]
+    }
+    chaves.update(
+        (evento_id, hora)
+        for evento_id, horas_evento in horas_por_evento.items()
+        for hora in horas_evento or ()
+    )
+    AgregadoHora.objects.bulk_create(
+        [
+            AgregadoHora(
+                evento_id=evento_id,
+                hora=hora,
+                **{campo: contagens.get((evento_id, hora), {}).get(campo) or 0 for campo in CAMPOS},
+            )
+            for evento_id, hora in chaves
+        ],
+        batch_size=TAMANHO_LOTE,
+        update_conflicts=True,
+        unique_fields=['evento', 'hora'],
+        update_fields=CAMPOS,
+    )
+
+    _resomar_dias({(evento_id, timezone.localdate(hora)) for evento_id, hora in chaves})
+    return len(chaves)
+
+
+def _resomar_dias(dias_sujos):
+    if not dias_sujos:
+        return
+    evento_ids = {evento_id for evento_id, _ in dias_sujos}
+    dias = [dia for _, dia in dias_sujos]
+    linhas = (
+        AgregadoHora.objects.filter(
+            evento_id__in=evento_ids,
+            hora__gte=_inicio_do_dia(min(dias)),
+            hora__lt=_inicio_do_dia(max(dias) + timedelta(days=1)),
+        )
+        .annotate(dia=TruncDate('hora'))
+        .values('evento_id', 'dia')
+        .annotate(**{campo: Sum(campo) for campo in CAMPOS})
+        .order_by()
+    )
+    somas = {(linha.pop('evento_id'), linha.pop('dia')): linha for linha in linhas}
+    AgregadoDia.objects.bulk_create(
+        [
+            AgregadoDia(
+                evento_id=evento_id,
+                dia=dia,
+                **{campo: somas.get((evento_id, dia), {}).get(campo) or 0 for campo in CAMPOS},
+            )
+            for evento_id, dia in dias_sujos
+        ],
+        batch_size=TAMANHO_LOTE,
+        update_conflicts=True,
+        unique_fields=['evento', 'dia'],
+        update_fields=CAMPOS,
+    )
+
+
+def _inicio_do_dia(dia):
+    return timezone.make_aware(datetime.combine(dia, time.min))
+
+
+def serie(evento, inicio=None, fim=None, granularidade='dia', campos=CAMPOS):
+    """
+    Totais do evento por período em [inicio, fim) (sem limite quando
+    None), em ordem. `inicio` e `fim` são datetimes; para granularidades de
+    dia ou mais, valem as datas locais.
+    """
+    if granularidade == 'hora':
+        linhas = AgregadoHora.objects.filter(evento=evento)
+        if inicio is not None:
+            linhas = linhas.filter(hora__gte=inicio)
+        if fim is not None:
+            linhas = linhas.filter(hora__lt=fim)
+        linhas = linhas.values('hora', *campos).order_by('hora')
+        return [{'periodo': linha.pop('hora'), **linha} for linha in linhas]
+
+    linhas = AgregadoDia.objects.filter(evento=evento)
+    if inicio is not None:
+        linhas = linhas.filter(dia__gte=timezone.localdate(inicio))
+    if fim is not None:
+        linhas = linhas.filter(dia__lt=timezone.localdate(fim))
+    if granularidade == 'dia':
+        linhas = linhas.values('dia', *campos).order_by('dia')
+        return [{'periodo': linha.pop('dia'), **linha} for linha in linhas]
+
+    truncar = {'semana': TruncWeek, 'mes': TruncMonth}[granularidade]
+    return list(
+        linhas.annotate(periodo=truncar('dia'))
+        .values('periodo')
+        .annotate(**{campo: Sum(campo) for campo in campos})
+        .order_by('periodo')
+    )
@@ -0,0 +1,51 @@
+"""
+HyperLogLog: contagem aproximada de elementos distintos em espaço fixo.
+
+Com PRECISAO = 12 o esboço tem 4096 registradores de um byte (4 KB por
+evento) e erro padrão de ~1,6%, qualquer que seja o número de visitantes.
+Esboços se combinam pegando o máximo de cada registrador, então cada
+processo pode resumir o próprio lote e depois mesclar com o que está no
+banco (ver visualizacoes.py).
+"""
+import hashlib
+import math
+
+PRECISAO = 12
+
+
+class HyperLogLog:
+    def __init__(self, registradores=None, precisao=PRECISAO):
+        self.precisao = precisao
+        self.m = 1 << precisao
+        if registradores:
+            if len(registradores) != self.m:
+                raise ValueError(f'Esboço com {len(registradores)} registradores; esperado {self.m}')
+            self.registradores = bytearray(registradores)
+        else:
+            self.registradores = bytearray(self.m)
+
+    def adicionar(self, valor):
+        h = int.from_bytes(hashlib.blake2b(str(valor).encode(), digest_size=8).digest(), 'big')
+        indice = h >> (64 - self.precisao)
+        resto = h & ((1 << (64 - self.precisao)) - 1)
+        # Posição do primeiro bit 1 nos 64 - precisao bits restantes
+        posicao = (64 - self.precisao) - resto.bit_length() + 1
+        if posicao > self.registradores[indice]:
+            self.registradores[indice] = posicao
+
+    def mesclar(self, outro):
+        self.registradores = bytearray(map(max, self.registradores, outro.registradores))
+        return self
+
+    def estimativa(self):
+        m = self.m
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimativa = alfa * m * m / sum(2.0 ** -registrador for registrador in self.registradores)
+        vazios = self.registradores.count(0)
+        if estimativa <= 2.5 * m and vazios:
+            # Correção para poucos elementos (linear counting)
+            estimativa = m * math.log(m / vazios)
+        return round(estimativa)
+
+    def __bytes__(self):
+        return bytes(self.registradores)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics import visualizacoes
+from apps.analytics.models import VisualizacaoEvento
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-event view counters and unique-visitor sketches from the raw view records."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--event", help="Only rebuild this event id.")
+
+    def handle(self, *args, **options):
+        if options["event"]:
+            evento_ids = [options["event"]]
+        else:
+            evento_ids = VisualizacaoEvento.objects.values_list("evento_id", flat=True).distinct().order_by()
+
+        total = 0
+        for evento_id in evento_ids:
+            total += visualizacoes.recalcular(evento_id)
+        self.stdout.write(self.style.SUCCESS(f"Done. {total} views processed."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics import agregados
+
+
+class Command(BaseCommand):
+    help = (
+        "Update the hourly and daily analytics rollups from the last high-water mark "
+        "and schedule the recurring update job."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true", help="Recompute the rollups from all raw records.")
+        parser.add_argument("--event", help="With --rebuild, only rebuild this event id.")
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            total = agregados.reconstruir([options["event"]] if options["event"] else None)
+        else:
+            total = agregados.atualizar()
+        agregados.agendar()
+        self.stdout.write(self.style.SUCCESS(f"Done. {total} hourly buckets written; update job scheduled."))
@@ -0,0 +1,308 @@
+"""
+Cálculo das métricas de analytics de um evento.
+
+`MetricasEvento` reúne as consultas usadas pelas seções de analytics
+(geral, ROI, interações, demográficos) e faz cada uma no máximo uma vez:
+todos os números sobre as inscrições saem de um único aggregate com
+filtros condicionais, avaliações têm uma consulta, e custo e
+visualizações vêm juntos da linha de EventoAnalytics.
+As views por seção e o endpoint consolidado usam a mesma instância, então
+o consolidado não repete consultas.
+
+Nada aqui grava no banco: o custo vem de EventoAnalytics quando existe
+(0 caso contrário), e só o POST de atualizar-custo escreve nele.
+
+As timelines de `interacoes` vêm das tabelas de agregados por hora e por
+dia (ver agregados.py), para qualquer intervalo e granularidade.
+
+Os demográficos são agrupados no banco (gênero x faixa etária, um GROUP
+BY com poucas linhas, qualquer que seja o número de inscritos) e ficam em
+cache por evento (`demograficos_em_cache`), invalidado quando as
+inscrições do evento mudam (ver signals.py). Mudanças no perfil dos
+participantes só aparecem quando o cache expira
+(settings.ANALYTICS_CACHE_SEGUNDOS).
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+from functools import cached_property
+
+from django.conf import settings
+from django.db.models import Avg, Case, CharField, Count, F, Q, Sum, Value, When
+from django.utils import timezone
+
+from apps import cache_versions
+from apps.avaliacoes.models import Avaliacao
+from apps.inscricoes.models import Inscricao
+from . import agregados
+from .models import EventoAnalytics, InteracaoSimulador
+
+PAGA = Q(status_pagamento='aprovado')
+PRESENTE = Q(checkin_realizado=True)
+
+ROTULOS_GENERO = {'M': 'Masculino', 'F': 'Feminino', 'O': 'Outro'}
+# (faixa, idade mínima, idade máxima); idade = dias desde o nascimento // 365
+FAIXAS_ETARIAS = [
+    ('18-25', 18, 25),
+    ('26-35', 26, 35),
+    ('36-45', 36, 45),
+    ('46-55', 46, 55),
+    ('56+', 56, None),
+]
+SEM_NASCIMENTO = 'Não informado'
+
+
+def escopo_evento(evento_id):
+    return f'analytics:{evento_id}'
+
+
+def demograficos_em_cache(evento):
+    return cache_versions.obter(
+        escopo_evento(evento.pk),
+        'demograficos',
+        MetricasEvento(evento).demograficos,
+        timeout=getattr(settings, 'ANALYTICS_CACHE_SEGUNDOS', 600),
+    )
+
+
+def rotulo_periodo(periodo):
+    """Início do período: 'AAAA-MM-DD HH:MM' para horas, 'AAAA-MM-DD' para os demais."""
+    if isinstance(periodo, datetime):
+        return timezone.localtime(periodo).strftime('%Y-%m-%d %H:%M')
+    return periodo.strftime('%Y-%m-%d')
+
+
+def faixa_etaria(hoje):
+    """
+    Expressão com a faixa etária do usuário inscrito. Os limites viram
+    datas de nascimento, então o banco só compara datas; menores de 18
+    ficam com ''.
+    """
+    casos = [When(usuario__data_nascimento__isnull=True, then=Value(SEM_NASCIMENTO))]
+    for faixa, minima, maxima in FAIXAS_ETARIAS:
+        condicao = Q(usuario__data_nascimento__lte=hoje - timedelta(days=minima * 365))
+        if maxima is not None:
+            condicao &= Q(usuario__data_nascimento__gt=hoje - timedelta(days=(maxima + 1) * 365))
+        casos.append(When(condicao, then=Value(faixa)))
+    return Case(*casos, default=Value(''), output_field=CharField())
+
+
+class MetricasEvento:
+    def __init__(self, evento):
+        self.evento = evento
+
+    @cached_property
+    def inscricoes(self):
+        """Contagens e somas das inscrições do evento, numa passada."""
+        totais = Inscricao.objects.filter(evento=self.evento).aggregate(
+            total=Count('id'),
+            confirmadas=Count('id', filter=Q(status='confirmada')),
+            checkins=Count('id', filter=PRESENTE),
+            pagas=Count('id', filter=PAGA),
+            pagas_presentes=Count('id', filter=PAGA & PRESENTE),
+            receita=Sum('valor_final', filter=PAGA),
+            receita_presentes=Sum('valor_final', filter=PAGA & PRESENTE),
+        )
+        totais['receita'] = totais['receita'] or Decimal('0')
+        totais['receita_presentes'] = totais['receita_presentes'] or Decimal('0')
+        return totais
+
+    @cached_property
+    def analytics(self):
+        """Custo e contadores de visualização guardados em EventoAnalytics."""
+        return (
+            EventoAnalytics.objects.filter(evento=self.evento)
+            .values('custo_total', 'total_visualizacoes', 'visualizacoes_unicas')
+            .first()
+        ) or {}
+
+    @cached_property
+    def score_medio(self):
+        return Avaliacao.objects.filter(evento=self.evento).aggregate(media=Avg('nota'))['media'] or 0
+
+    @property
+    def custo_total(self):
+        return self.analytics.get('custo_total') or Decimal('0')
+
+    @property
+    def visualizacoes(self):
+        # Mantidos pela gravação das visitas (ver visualizacoes.py): sem
+        # varrer VisualizacaoEvento; os únicos são a estimativa HyperLogLog
+        return {
+            'total': self.analytics.get('total_visualizacoes', 0),
+            'unicas': self.analytics.get('visualizacoes_unicas', 0),
+        }
+
+    def geral(self):
+        inscricoes = self.inscricoes
+        visualizacoes = self.visualizacoes
+
+        taxa_comparecimento = 0
+        if inscricoes['confirmadas'] > 0:
+            taxa_comparecimento = round((inscricoes['checkins'] / inscricoes['confirmadas']) * 100, 1)
+
+        taxa_conversao = 0
+        if visualizacoes['total'] > 0:
+            taxa_conversao = round((inscricoes['total'] / visualizacoes['total']) * 100, 1)
+
+        return {
+            'evento_id': str(self.evento.id),
+            'evento_titulo': self.evento.titulo,
+            'metricas_gerais': {
+                'total_inscricoes': inscricoes['total'],
+                'inscricoes_confirmadas': inscricoes['confirmadas'],
+                'taxa_comparecimento': taxa_comparecimento,
+                'total_visualizacoes': visualizacoes['total'],
+                'visualizacoes_unicas': visualizacoes['unicas'],
+                'taxa_conversao': taxa_conversao,
+                'receita_total': float(inscricoes['receita']),
+                'score_medio': round(float(self.score_medio), 1),
+            }
+        }
+
+    def roi(self):
+        inscricoes = self.inscricoes
+        # Receita que ficou: depósitos de quem compareceu (não reembolsados)
+        receita_liquida = inscricoes['receita_presentes']
+        custo_total = self.custo_total
+
+        if custo_total > 0:
+            retorno = receita_liquida - custo_total
+            roi_percentual = float((retorno / custo_total) * 100)
+            roi_multiplicador = float(receita_liquida / custo_total)
+        else:
+            retorno = receita_liquida
+            roi_percentual = 0
+            roi_multiplicador = 0
+
+        return {
+            'receita': {
+                'depositos_totais': float(inscricoes['receita']),
+                'reembolsos_nao_realizados': float(receita_liquida),
+                'receita_liquida': float(receita_liquida)
+            },
+            'custos': {
+                'custo_total_evento': float(custo_total)
+            },
+            'roi': {
+                'retorno_financeiro': float(retorno),
+                'roi_percentual': round(roi_percentual, 1),
+                'roi_multiplicador': round(roi_multiplicador, 2)
+            },
+            'metricas_adicionais': {
+                'total_inscritos': inscricoes['pagas'],
+                'total_comparecimento': inscricoes['pagas_presentes'],
+                'taxa_comparecimento': round(
+                    (inscricoes['pagas_presentes'] / inscricoes['pagas'] * 100), 1
+                ) if inscricoes['pagas'] > 0 else 0
+            }
+        }
+
+    def interacoes(self, inicio=None, fim=None, granularidade=None):
+        """
+        Timelines de inscrições e check-ins, lidas dos agregados (ver
+        agregados.py). Sem intervalo: inscrições por dia nos últimos 30 dias
+        e check-ins por hora desde o início.
+        """
+        inicio_inscricoes = inicio
+        if inicio is None and fim is None:
+            inicio_inscricoes = timezone.now() - timedelta(days=30)
+        inscricoes_por_periodo = [
+            linha for linha in agregados.serie(
+                self.evento, inicio_inscricoes, fim, granularidade or 'dia', ['inscricoes']
+            )
+            if linha['inscricoes']
+        ]
+        checkins_por_periodo = [
+            linha for linha in agregados.serie(self.evento, inicio, fim, granularidade or 'hora', ['checkins'])
+            if linha['checkins']
+        ]
+
+        simuladores_stats = (
+            InteracaoSimulador.objects.filter(evento=self.evento)
+            .values('tipo_simulador')
+            .annotate(total_acessos=Count('id'), tempo_medio=Avg('duracao_segundos'))
+            .order_by('-total_acessos')
+        )
+
+        return {
+            'timeline_inscricoes': [
+                {'data': rotulo_periodo(item['periodo']), 'quantidade': item['inscricoes']}
+                for item in inscricoes_por_periodo
+            ],
+            'timeline_checkins': [
+                {
+                    'data': rotulo_periodo(item['periodo']),
+                    'horario': timezone.localtime(item['periodo']).strftime('%H:%M')
+                    if isinstance(item['periodo'], datetime) else rotulo_periodo(item['periodo']),
+                    'quantidade': item['checkins'],
+                }
+                for item in checkins_por_periodo
+            ],
+            'interacoes_simuladores': [
+                {
+                    'nome': item['tipo_simulador'],
+                    'acessos': item['total_acessos'],
+                    'tempo_medio_minutos': round(item['tempo_medio'] / 60, 1) if item['tempo_medio'] else 0
+                }
+                for item in simuladores_stats
+            ],
+        }
+
+    def demograficos(self):
+        """Gênero, faixa etária e score médio dos inscritos confirmados."""
+        grupos = list(
+            Inscricao.objects.filter(evento=self.evento, status='confirmada')
+            .values(sexo=F('usuario__sexo'), faixa=faixa_etaria(timezone.now().date()))
+            .annotate(quantidade=Count('id'), soma_score=Sum('usuario__score'))
+            .order_by()
+        )
+        total = sum(grupo['quantidade'] for grupo in grupos)
+
+        def percentual(quantidade):
+            return round((quantidade / total * 100), 1) if total > 0 else 0
+
+        por_sexo = {}
+        faixas = {faixa: 0 for faixa, _, _ in FAIXAS_ETARIAS}
+        faixas[SEM_NASCIMENTO] = 0
+        for grupo in grupos:
+            por_sexo[grupo['sexo']] = por_sexo.get(grupo['sexo'], 0) + grupo['quantidade']
+            if grupo['faixa']:
+                faixas[grupo['faixa']] += grupo['quantidade']
+
+        genero_data = [
+            {
+                'categoria': ROTULOS_GENERO.get(sexo, 'Não informado'),
+                'quantidade': quantidade,
+                'percentual': percentual(quantidade),
+            }
+            for sexo, quantidade in sorted(por_sexo.items(), key=lambda item: -item[1])
+        ]
+        faixa_etaria_data = [
+            {'faixa': faixa, 'quantidade': quantidade, 'percentual': percentual(quantidade)}
+            for faixa, quantidade in faixas.items()
+        ]
+
+        soma_score = sum(grupo['soma_score'] or 0 for grupo in grupos)
+        score_medio = round(float(soma_score / total), 1) if total else 0
+
+        return {
+            'distribuicao_genero': genero_data,
+            'distribuicao_faixa_etaria': faixa_etaria_data,
+            'score_medio_participantes': score_medio,
+            'perfil_ideal': {
+                'genero': genero_data[0]['categoria'] if genero_data else 'Não definido',
+                'faixa_etaria': max(faixas, key=faixas.get),
+                'score_medio': score_medio,
+            }
+        }
+
+    def consolidado(self, **periodo):
+        """
+        Todas as seções numa resposta, cada uma no formato do seu endpoint;
+        `periodo` vai para `interacoes`.
+        """
+        return {
+            'geral': self.geral(),
+            'roi': self.roi(),
+            'interacoes': self.interacoes(**periodo),
+        }
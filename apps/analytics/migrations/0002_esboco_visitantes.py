@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventoanalytics',
+            name='esboco_visitantes',
+            field=models.BinaryField(default=bytes, help_text='Esboço HyperLogLog dos visitantes únicos'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_esboco_visitantes'),
+        ('eventos', '0008_evento_reservas_ativas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarcaAgregacao',
+            fields=[
+                ('nome', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('ate', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Marca de Agregação',
+                'verbose_name_plural': 'Marcas de Agregação',
+            },
+        ),
+        migrations.CreateModel(
+            name='AgregadoDia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('inscricoes', models.IntegerField(default=0)),
+                ('confirmacoes', models.IntegerField(default=0)),
+                ('checkins', models.IntegerField(default=0)),
+                ('visualizacoes', models.IntegerField(default=0)),
+                ('interacoes_simulador', models.IntegerField(default=0)),
+                ('duracao_simulador', models.IntegerField(default=0, help_text='Soma das durações das interações com simuladores, em segundos')),
+                ('dia', models.DateField()),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='agregados_dia', to='eventos.evento')),
+            ],
+            options={
+                'verbose_name': 'Agregado por Dia',
+                'verbose_name_plural': 'Agregados por Dia',
+                'constraints': [models.UniqueConstraint(fields=('evento', 'dia'), name='agregado_dia_unico')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AgregadoHora',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('inscricoes', models.IntegerField(default=0)),
+                ('confirmacoes', models.IntegerField(default=0)),
+                ('checkins', models.IntegerField(default=0)),
+                ('visualizacoes', models.IntegerField(default=0)),
+                ('interacoes_simulador', models.IntegerField(default=0)),
+                ('duracao_simulador', models.IntegerField(default=0, help_text='Soma das durações das interações com simuladores, em segundos')),
+                ('hora', models.DateTimeField(help_text='Início da hora')),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='agregados_hora', to='eventos.evento')),
+            ],
+            options={
+                'verbose_name': 'Agregado por Hora',
+                'verbose_name_plural': 'Agregados por Hora',
+                'constraints': [models.UniqueConstraint(fields=('evento', 'hora'), name='agregado_hora_unico')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_agregados'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interacaosimulador',
+            index=models.Index(fields=['created_at'], name='interacao_criada_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visualizacaoevento',
+            index=models.Index(fields=['created_at'], name='visualizacao_criada_idx'),
+        ),
+    ]
@@ -32,8 +32,15 @@ class EventoAnalytics(models.Model):
         help_text="Return on Investment calculado automaticamente"
     )
 
+    # Mantidos pela gravação das visualizações (ver visualizacoes.py);
+    # visualizacoes_unicas é a estimativa do esboço HyperLogLog
     total_visualizacoes = models.IntegerField(default=0)
     visualizacoes_unicas = models.IntegerField(default=0)
+    esboco_visitantes = models.BinaryField(
+        default=bytes,
+        editable=False,
+        help_text="Esboço HyperLogLog dos visitantes únicos"
+    )
     total_interacoes_simulador = models.IntegerField(default=0)
     tempo_medio_simulador = models.DecimalField(
         max_digits=10,
@@ -97,6 +104,10 @@ class InteracaoSimulador(models.Model):
         verbose_name_plural = "Interações com Simuladores"
         ordering = ['-created_at']
         db_table = "api_interacaosimulador"
+        indexes = [
+            # Faixa de registros novos lida a cada passada dos agregados
+            models.Index(fields=['created_at'], name='interacao_criada_idx'),
+        ]
 
     def __str__(self):
         return f"{self.usuario.username} - {self.tipo_simulador} ({self.evento.titulo})"
@@ -138,8 +149,81 @@ class VisualizacaoEvento(models.Model):
         verbose_name_plural = "Visualizações de Eventos"
         ordering = ['-created_at']
         db_table = "api_visualizacaoevento"
+        indexes = [
+            # Faixa de registros novos lida a cada passada dos agregados
+            models.Index(fields=['created_at'], name='visualizacao_criada_idx'),
+        ]
 
     def __str__(self):
         usuario_str = self.usuario.username if self.usuario else "Anônimo"
         return f"{usuario_str} visualizou {self.evento.titulo}"
 
+
+
+class AgregadoBase(models.Model):
+    """Totais de um evento num período (ver agregados.py)."""
+
+    inscricoes = models.IntegerField(default=0)
+    confirmacoes = models.IntegerField(default=0)
+    checkins = models.IntegerField(default=0)
+    visualizacoes = models.IntegerField(default=0)
+    interacoes_simulador = models.IntegerField(default=0)
+    duracao_simulador = models.IntegerField(
+        default=0,
+        help_text="Soma das durações das interações com simuladores, em segundos"
+    )
+
+    class Meta:
+        abstract = True
+
+
+class AgregadoHora(AgregadoBase):
+    evento = models.ForeignKey(
+        'eventos.Evento',
+        on_delete=models.CASCADE,
+        related_name='agregados_hora'
+    )
+    hora = models.DateTimeField(help_text="Início da hora")
+
+    class Meta:
+        verbose_name = "Agregado por Hora"
+        verbose_name_plural = "Agregados por Hora"
+        constraints = [
+            models.UniqueConstraint(fields=['evento', 'hora'], name='agregado_hora_unico'),
+        ]
+
+    def __str__(self):
+        return f"{self.evento_id} @ {self.hora:%Y-%m-%d %H:00}"
+
+
+class AgregadoDia(AgregadoBase):
+    evento = models.ForeignKey(
+        'eventos.Evento',
+        on_delete=models.CASCADE,
+        related_name='agregados_dia'
+    )
+    dia = models.DateField()
+
+    class Meta:
+        verbose_name = "Agregado por Dia"
+        verbose_name_plural = "Agregados por Dia"
+        constraints = [
+            models.UniqueConstraint(fields=['evento', 'dia'], name='agregado_dia_unico'),
+        ]
+
+    def __str__(self):
+        return f"{self.evento_id} @ {self.dia:%Y-%m-%d}"
+
+
+class MarcaAgregacao(models.Model):
+    """Até onde os dados brutos já foram incorporados aos agregados."""
+
+    nome = models.CharField(max_length=50, primary_key=True)
+    ate = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Marca de Agregação"
+        verbose_name_plural = "Marcas de Agregação"
+
+    def __str__(self):
+        return f"{self.nome}: {self.ate}"
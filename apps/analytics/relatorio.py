@@ -0,0 +1,232 @@
+"""
+Relatório de analytics do evento em PDF.
+
+O PDF renderizado é guardado com o nome derivado de um
+carimbo de versão dos dados (`versao`): quantidade e última alteração das
+inscrições, dados do evento e do organizador e o custo total. Do
+EventoAnalytics entra só o valor do custo, não o updated_at, que muda a
+cada gravação de visualizações (ver visualizacoes.py).
+Exportar de novo sem mudanças só lê o arquivo; qualquer mudança gera um
+carimbo novo, e a versão anterior é apagada quando a nova é gravada. Como o
+carimbo vem do banco, funciona igual em todos os processos, com ou sem
+cache compartilhado.
+
+Os arquivos ficam em settings.ANALYTICS_PDF_ROOT, fora de MEDIA_ROOT: os
+dados são do organizador e só saem pela view de exportação, que confere a
+permissão, nunca por /media/.
+
+Eventos com muitas inscrições (settings.ANALYTICS_PDF_LIMITE_SINCRONO) são
+renderizados pelo job `gerar` na fila 'documentos'; a view responde 202
+com o link de download, que passa a servir o arquivo quando ele fica
+pronto.
+"""
+import hashlib
+import io
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from apps.eventos.models import Evento
+from apps.inscricoes.models import Inscricao
+from .metricas import MetricasEvento
+from .models import EventoAnalytics
+
+# Incrementar quando o layout mudar, para não servir PDFs antigos
+VERSAO_RENDERIZACAO = 1
+PASTA = 'analytics'
+FILA = 'documentos'
+
+
+def versao(evento):
+    """Retorna (carimbo dos dados do relatório, total de inscrições)."""
+    inscricoes = Inscricao.objects.filter(evento=evento).aggregate(total=Count('id'), alterada=Max('updated_at'))
+    custo = EventoAnalytics.objects.filter(evento=evento).values_list('custo_total', flat=True).first()
+    organizador = evento.organizador
+    partes = [
+        VERSAO_RENDERIZACAO,
+        evento.updated_at.isoformat(),
+        organizador.get_full_name() or organizador.username,
+        inscricoes['total'],
+        inscricoes['alterada'].isoformat() if inscricoes['alterada'] else '',
+        f'{custo or 0:.2f}',
+    ]
+    carimbo = hashlib.sha256('|'.join(map(str, partes)).encode('utf-8')).hexdigest()[:32]
+    return carimbo, inscricoes['total']
+
+
+def armazenamento():
+    """Storage privado dos relatórios (sem URL pública)."""
+    pasta = getattr(settings, 'ANALYTICS_PDF_ROOT', settings.BASE_DIR / 'privado' / 'relatorios')
+    return FileSystemStorage(location=pasta, base_url=None)
+
+
+def caminho(evento_id, carimbo):
+    return f'{PASTA}/{evento_id}/{carimbo}.pdf'
+
+
+def nome_arquivo(evento):
+    return f'analytics_{evento.titulo.replace(" ", "_")}_{timezone.now().strftime("%Y%m%d")}.pdf'
+
+
+def grande(total_inscricoes):
+    return total_inscricoes >= getattr(settings, 'ANALYTICS_PDF_LIMITE_SINCRONO', 5000)
+
+
+def chave_job(evento_id):
+    return f'analytics:relatorio:{evento_id}'
+
+
+def gerar(evento_id):
+    """Job: renderiza e guarda o relatório na versão atual dos dados."""
+    evento = Evento.objects.select_related('organizador').get(pk=evento_id)
+    carimbo, _ = versao(evento)
+    nome = caminho(evento.pk, carimbo)
+    if not armazenamento().exists(nome):
+        guardar(evento, carimbo, renderizar(evento))
+    return {'arquivo': nome}
+
+
+def guardar(evento, carimbo, conteudo):
+    """Grava o PDF da versão `carimbo` e apaga as versões anteriores."""
+    nome = caminho(evento.pk, carimbo)
+    storage = armazenamento()
+    # Outra requisição pode ter gravado no meio do caminho; o conteúdo é equivalente
+    if not storage.exists(nome):
+        storage.save(nome, ContentFile(conteudo))
+    _, arquivos = storage.listdir(f'{PASTA}/{evento.pk}')
+    for arquivo in arquivos:
+        if arquivo != f'{carimbo}.pdf':
+            storage.delete(f'{PASTA}/{evento.pk}/{arquivo}')
+    return nome
+
+
+def renderizar(evento):
+    """Monta o PDF com ReportLab e retorna os bytes."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.enums import TA_CENTER
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    story = []
+    styles = getSampleStyleSheet()
+
+    # Estilo customizado para título
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1E3A8A'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+
+    # Título do relatório
+    story.append(Paragraph(f"Relatório de Analytics<br/>{evento.titulo}", title_style))
+    story.append(Spacer(1, 0.3*inch))
+
+    # Informações básicas do evento
+    info_evento = [
+        ['Evento:', evento.titulo],
+        ['Data:', evento.data_evento.strftime('%d/%m/%Y')],
+        ['Local:', evento.endereco],
+        ['Organizador:', evento.organizador.get_full_name() or evento.organizador.username],
+        ['Gerado em:', timezone.now().strftime('%d/%m/%Y às %H:%M')]
+    ]
+
+    table = Table(info_evento, colWidths=[2*inch, 4*inch])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E5E7EB')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+    ]))
+
+    story.append(table)
+    story.append(Spacer(1, 0.5*inch))
+
+    # Seção: Métricas Gerais
+    story.append(Paragraph("Métricas Gerais", styles['Heading2']))
+    story.append(Spacer(1, 0.2*inch))
+
+    metricas = MetricasEvento(evento)
+    total_inscricoes = metricas.inscricoes['total']
+    checkins = metricas.inscricoes['checkins']
+    taxa_comparecimento = round((checkins / total_inscricoes * 100), 1) if total_inscricoes > 0 else 0
+
+    receita_total = metricas.inscricoes['receita']
+
+    metricas_data = [
+        ['Métrica', 'Valor'],
+        ['Total de Inscrições', str(total_inscricoes)],
+        ['Check-ins Realizados', str(checkins)],
+        ['Taxa de Comparecimento', f'{taxa_comparecimento}%'],
+        ['Receita Total', _reais(receita_total)]
+    ]
+
+    table = Table(metricas_data, colWidths=[3*inch, 2*inch])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3B82F6')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F3F4F6')])
+    ]))
+
+    story.append(table)
+    story.append(Spacer(1, 0.3*inch))
+
+    # Seção: ROI
+    story.append(Paragraph("Retorno sobre Investimento (ROI)", styles['Heading2']))
+    story.append(Spacer(1, 0.2*inch))
+
+    custo_total = metricas.custo_total
+    receita_liquida = metricas.inscricoes['receita_presentes']
+
+    if custo_total > 0:
+        retorno = receita_liquida - custo_total
+        roi_percentual = float((retorno / custo_total) * 100)
+    else:
+        retorno = receita_liquida
+        roi_percentual = 0
+
+    roi_data = [
+        ['Item', 'Valor'],
+        ['Custo Total do Evento', _reais(custo_total)],
+        ['Receita Líquida', _reais(receita_liquida)],
+        ['Retorno Financeiro', _reais(retorno)],
+        ['ROI', f'{roi_percentual:.1f}%']
+    ]
+
+    table = Table(roi_data, colWidths=[3*inch, 2*inch])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#10B981')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F3F4F6')])
+    ]))
+
+    story.append(table)
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def _reais(valor):
+    return f'R$ {valor:,.2f}'.replace(',', 'X').replace('.', ',').replace('X', '.')
@@ -0,0 +1,23 @@
+"""Invalidação dos analytics em cache do evento (ver metricas.py)."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps import cache_versions
+from apps.inscricoes.models import Inscricao
+from apps.tracking import transicao_status
+from .metricas import escopo_evento
+
+
+@receiver(post_save, sender=Inscricao)
+@receiver(post_delete, sender=Inscricao)
+def invalidar_por_inscricao(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    eventos = {instance.evento_id, instance.valor_carregado('evento_id')} - {None}
+    cache_versions.invalidar(*(escopo_evento(evento_id) for evento_id in eventos))
+
+
+@receiver(transicao_status, sender=Inscricao)
+def invalidar_por_transicao(sender, instancias, **kwargs):
+    # Mudanças em lote (update/bulk_update) não passam pelo post_save
+    cache_versions.invalidar(*{escopo_evento(instancia.evento_id) for instancia in instancias})
@@ -4,15 +4,32 @@ Arquivo criado separadamente para não alterar urls.py existente
 """
 from django.urls import path
 from .views import (
+    evento_analytics,
     evento_analytics_geral,
     evento_analytics_demograficos,
     evento_analytics_interacoes,
+    evento_analytics_serie,
     evento_analytics_roi,
     evento_analytics_atualizar_custo,
     evento_analytics_exportar_pdf,
+    registrar_visualizacao,
 )
 
 urlpatterns = [
+    # Beacon de visualização da página do evento
+    path(
+        'eventos/<uuid:evento_id>/visualizacao/',
+        registrar_visualizacao,
+        name='evento-registrar-visualizacao'
+    ),
+
+    # Métricas gerais, ROI e interações numa resposta
+    path(
+        'eventos/<uuid:evento_id>/analytics/',
+        evento_analytics,
+        name='evento-analytics'
+    ),
+
     # Métricas gerais do evento
     path(
         'eventos/<uuid:evento_id>/analytics/geral/',
@@ -34,6 +51,13 @@ urlpatterns = [
         name='evento-analytics-interacoes'
     ),
 
+    # Todas as métricas por período, dos agregados por hora/dia
+    path(
+        'eventos/<uuid:evento_id>/analytics/serie/',
+        evento_analytics_serie,
+        name='evento-analytics-serie'
+    ),
+
     # ROI do evento
     path(
         'eventos/<uuid:evento_id>/analytics/roi/',
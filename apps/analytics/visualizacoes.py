@@ -0,0 +1,196 @@
+"""
+Registro de visualizações de eventos com buffer em memória.
+
+O beacon (views.registrar_visualizacao) só chama `registrar`, que descarta
+robôs pelo user agent e põe a visita no buffer do processo, sem tocar no
+banco. Uma thread do processo grava o buffer a cada INTERVALO segundos, ou
+antes, quando ele chega a TAMANHO_LOTE visitas:
+
+- as VisualizacaoEvento, num bulk_create;
+- por evento, em EventoAnalytics: total_visualizacoes somado e o esboço
+  HyperLogLog dos visitantes (ver hll.py) mesclado com o do lote, com
+  visualizacoes_unicas = estimativa do esboço.
+
+Cada gravação faz um número fixo de consultas, qualquer que seja o tamanho
+do lote. Visitas ainda no buffer se perdem se o processo morrer: são
+métricas, não dados de negócio.
+"""
+import atexit
+import logging
+import re
+import threading
+from collections import defaultdict
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from apps.eventos.models import Evento
+from .hll import HyperLogLog
+from .models import EventoAnalytics, VisualizacaoEvento
+
+logger = logging.getLogger(__name__)
+
+# Segundos entre gravações do buffer
+INTERVALO = 5
+TAMANHO_LOTE = 500
+# Acima disso (banco fora do ar, por exemplo) as visitas novas são descartadas
+MAXIMO_PENDENTES = 20 * TAMANHO_LOTE
+
+ROBOS = re.compile(
+    r'bot|crawl|spider|slurp|curl|wget|python-requests|httpclient|okhttp|headless'
+    r'|lighthouse|facebookexternalhit|embedly|preview|monitor|uptime',
+    re.IGNORECASE,
+)
+
+
+def eh_robo(user_agent):
+    return not user_agent or bool(ROBOS.search(user_agent))
+
+
+def chave_visitante(usuario_id, ip_address, user_agent):
+    """Identidade usada no esboço: o usuário, ou IP + navegador para anônimos."""
+    if usuario_id:
+        return f'u:{usuario_id}'
+    return f'a:{ip_address}:{user_agent}'
+
+
+def registrar(evento_id, usuario_id=None, ip_address=None, user_agent=''):
+    """Enfileira a visita no buffer. Retorna False se ela foi descartada."""
+    if eh_robo(user_agent):
+        return False
+    return buffer().adicionar(VisualizacaoEvento(
+        evento_id=evento_id,
+        usuario_id=usuario_id,
+        ip_address=ip_address,
+        user_agent=user_agent[:1000],
+    ))
+
+
+def gravar(visitas):
+    """Grava um lote de visitas e atualiza os contadores dos eventos."""
+    existentes = set(
+        Evento.objects.filter(pk__in={visita.evento_id for visita in visitas}).values_list('pk', flat=True)
+    )
+    por_evento = defaultdict(list)
+    for visita in visitas:
+        if visita.evento_id in existentes:
+            por_evento[visita.evento_id].append(visita)
+    if not por_evento:
+        return 0
+
+    # Esboço de cada evento resumido fora da transação; com as linhas
+    # travadas só resta mesclar com o que está no banco
+    esbocos = {}
+    for evento_id, grupo in por_evento.items():
+        esboco = esbocos[evento_id] = HyperLogLog()
+        for visita in grupo:
+            esboco.adicionar(chave_visitante(visita.usuario_id, visita.ip_address, visita.user_agent))
+
+    agora = timezone.now()
+    with transaction.atomic():
+        VisualizacaoEvento.objects.bulk_create(
+            [visita for grupo in por_evento.values() for visita in grupo],
+            batch_size=TAMANHO_LOTE,
+        )
+        EventoAnalytics.objects.bulk_create(
+            [EventoAnalytics(evento_id=evento_id) for evento_id in sorted(por_evento)],
+            ignore_conflicts=True,
+        )
+        # Trava as linhas, sempre na mesma ordem para que gravações de outros
+        # processos esperem em vez de entrar em deadlock
+        analytics = list(
+            EventoAnalytics.objects.select_for_update().filter(evento_id__in=por_evento).order_by('evento_id')
+        )
+        for linha in analytics:
+            grupo = por_evento[linha.evento_id]
+            esboco = HyperLogLog(bytes(linha.esboco_visitantes)).mesclar(esbocos[linha.evento_id])
+            linha.esboco_visitantes = bytes(esboco)
+            linha.visualizacoes_unicas = esboco.estimativa()
+            linha.total_visualizacoes += len(grupo)
+            linha.updated_at = agora
+        EventoAnalytics.objects.bulk_update(
+            analytics,
+            ['esboco_visitantes', 'visualizacoes_unicas', 'total_visualizacoes', 'updated_at'],
+        )
+    return sum(len(grupo) for grupo in por_evento.values())
+
+
+def recalcular(evento_id):
+    """Refaz contadores e esboço do evento a partir de todas as VisualizacaoEvento."""
+    esboco = HyperLogLog()
+    total = 0
+    visitas = (
+        VisualizacaoEvento.objects.filter(evento_id=evento_id)
+        .values_list('usuario_id', 'ip_address', 'user_agent')
+        .iterator(chunk_size=2000)
+    )
+    for usuario_id, ip_address, user_agent in visitas:
+        esboco.adicionar(chave_visitante(usuario_id, ip_address, user_agent))
+        total += 1
+    EventoAnalytics.objects.update_or_create(
+        evento_id=evento_id,
+        defaults={
+            'esboco_visitantes': bytes(esboco),
+            'visualizacoes_unicas': esboco.estimativa(),
+            'total_visualizacoes': total,
+        },
+    )
+    return total
+
+
+class Buffer:
+    """Visitas pendentes do processo, gravadas por uma thread daemon."""
+
+    def __init__(self, intervalo=INTERVALO, tamanho_lote=TAMANHO_LOTE):
+        self.intervalo = intervalo
+        self.tamanho_lote = tamanho_lote
+        self.pendentes = []
+        self._trava = threading.Lock()
+        self._aviso = threading.Event()
+        self._thread = None
+
+    def adicionar(self, visita):
+        with self._trava:
+            if len(self.pendentes) >= MAXIMO_PENDENTES:
+                return False
+            self.pendentes.append(visita)
+            cheio = len(self.pendentes) >= self.tamanho_lote
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executar, name='visualizacoes', daemon=True)
+                self._thread.start()
+        if cheio:
+            self._aviso.set()
+        return True
+
+    def gravar(self):
+        """Grava o que estiver pendente. Retorna quantas visitas foram gravadas."""
+        with self._trava:
+            lote, self.pendentes = self.pendentes, []
+        gravadas = 0
+        for inicio in range(0, len(lote), self.tamanho_lote):
+            gravadas += gravar(lote[inicio:inicio + self.tamanho_lote])
+        return gravadas
+
+    def _executar(self):
+        while True:
+            self._aviso.wait(self.intervalo)
+            self._aviso.clear()
+            try:
+                self.gravar()
+            except Exception:
+                logger.exception('Falha ao gravar visualizações; lote descartado')
+            finally:
+                close_old_connections()
+
+
+_buffer = None
+_trava_buffer = threading.Lock()
+
+
+def buffer():
+    global _buffer
+    with _trava_buffer:
+        if _buffer is None:
+            _buffer = Buffer()
+            atexit.register(_buffer.gravar)
+    return _buffer
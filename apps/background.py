@@ -0,0 +1,17 @@
+"""
+Execução de tarefas fora do ciclo da requisição.
+
+`executar_apos_commit` enfileira a função na fila de jobs persistida no
+banco (ver apps/jobs/filas.py), dentro da transação atual: a tarefa só
+roda depois do commit, de modo que sempre enxerga os dados gravados pela
+requisição, sobrevive a reinícios do processo e é repetida em caso de
+falha. A função precisa ser de nível de módulo e os argumentos
+serializáveis em JSON (ids, strings). Com JOBS_SINCRONO=True a tarefa roda
+na própria thread (útil em scripts e testes manuais).
+"""
+from apps.jobs.filas import enfileirar
+
+
+def executar_apos_commit(funcao, *args, **kwargs):
+    """Agenda `funcao(*args, **kwargs)` para depois do commit da transação atual."""
+    return enfileirar(funcao, args, kwargs)
@@ -0,0 +1,62 @@
+"""
+Cache invalidado por versão.
+
+Cada escopo (ex.: 'dashboard:42') tem uma versão guardada no cache, e a
+chave de cada valor calculado inclui a versão atual do escopo. Invalidar é
+trocar a versão: as entradas antigas deixam de ser lidas e expiram
+sozinhas, sem precisar saber quais chaves existiam.
+
+A versão é um valor aleatório, não um contador: se ela for descartada do
+cache, a próxima é nova e nunca reaproveita um valor antigo.
+
+    snapshot = cache_versions.obter('dashboard:42', 'resumo', calcular, timeout=300)
+    cache_versions.invalidar('dashboard:42')  # depois do commit
+
+Com REDIS_URL o cache é compartilhado entre os processos (ver
+settings.CACHES); sem ela, cada processo tem o seu.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+PREFIXO = 'versao'
+
+
+def _chave_versao(escopo):
+    return f'{PREFIXO}:{escopo}'
+
+
+def versao(escopo):
+    """Versão atual do escopo, criada no primeiro uso."""
+    chave = _chave_versao(escopo)
+    atual = cache.get(chave)
+    if atual is None:
+        # add() não sobrescreve uma versão criada por outro processo
+        cache.add(chave, uuid.uuid4().hex, None)
+        atual = cache.get(chave)
+    return atual
+
+
+def obter(escopo, nome, calcular, timeout=None):
+    """
+    Valor `nome` do escopo na versão atual; calcula com `calcular()` e
+    guarda por `timeout` segundos se não estiver em cache.
+    """
+    # A versão é lida antes do cálculo: se o escopo for invalidado no
+    # meio, o resultado fica guardado sob a versão antiga e não é lido
+    chave = f'{nome}:{escopo}:{versao(escopo)}'
+    valor = cache.get(chave)
+    if valor is None:
+        valor = calcular()
+        cache.set(chave, valor, timeout)
+    return valor
+
+
+def invalidar(*escopos):
+    """Troca a versão dos escopos quando a transação atual for confirmada."""
+    escopos = [escopo for escopo in escopos if escopo is not None]
+    if escopos:
+        transaction.on_commit(
+            lambda: cache.set_many({_chave_versao(escopo): uuid.uuid4().hex for escopo in escopos}, None)
+        )
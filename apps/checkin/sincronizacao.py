@@ -0,0 +1,127 @@
+"""
+Sincronização em lote das leituras de QR code feitas sem conexão.
+
+Cada leitor (ex.: o celular de uma porta) guarda as leituras com o
+horário em que aconteceram e envia todas de uma vez quando tem rede. O
+lote é aplicado numa transação, com as inscrições bloqueadas, e cada
+leitura recebe um resultado:
+
+- registrado: o check-in foi feito por esta leitura;
+- ja_registrado: esta mesma leitura (dispositivo e horário) já tinha sido
+  aplicada; reenviar um lote depois de uma falha de rede não muda nada;
+- duplicado: o ingresso já tinha check-in deste mesmo dispositivo;
+- conflito: o ingresso já tinha check-in de outro dispositivo (duas
+  portas leram o mesmo ingresso); o resultado traz quem registrou e quando;
+- nao_confirmada: a inscrição não está confirmada;
+- nao_encontrado: nenhum ingresso do evento tem esse código;
+- invalida: leitura sem qr_code ou com horário inválido ou no futuro.
+
+Dentro do lote as leituras são aplicadas em ordem de horário, então a
+primeira leitura de um ingresso vence e as seguintes viram duplicado ou
+conflito. Um check-in já registrado nunca é alterado.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.dashboard import resumo
+from apps.inscricoes.models import Inscricao
+
+MAXIMO_LEITURAS = 1000
+# Folga para o relógio do leitor adiantado; além disso a leitura é inválida
+TOLERANCIA_RELOGIO = timedelta(minutes=5)
+
+REGISTRADO = 'registrado'
+JA_REGISTRADO = 'ja_registrado'
+DUPLICADO = 'duplicado'
+CONFLITO = 'conflito'
+NAO_CONFIRMADA = 'nao_confirmada'
+NAO_ENCONTRADO = 'nao_encontrado'
+INVALIDA = 'invalida'
+
+
+def sincronizar(evento, dispositivo, leituras, agora=None):
+    """
+    Aplica as `leituras` ([{'qr_code', 'lido_em'}]) do `dispositivo` no
+    evento. Retorna (resultados na ordem das leituras, inscrições com
+    check-in novo).
+    """
+    agora = agora or timezone.now()
+    resultados = [None] * len(leituras)
+    validas = []
+    for indice, leitura in enumerate(leituras):
+        qr_code = leitura.get('qr_code') if isinstance(leitura, dict) else None
+        lido_em = _horario(leitura.get('lido_em')) if qr_code else None
+        if not qr_code or lido_em is None or lido_em > agora + TOLERANCIA_RELOGIO:
+            resultados[indice] = {'indice': indice, 'qr_code': qr_code, 'resultado': INVALIDA}
+            continue
+        validas.append((lido_em, indice, str(qr_code)))
+
+    registradas = {}
+    with transaction.atomic():
+        # Ordem fixa de bloqueio: lotes simultâneos de portas diferentes não
+        # se travam mutuamente
+        inscricoes = {
+            inscricao.qr_code: inscricao
+            for inscricao in Inscricao.objects.select_for_update()
+            .filter(evento=evento, qr_code__in={qr_code for _, _, qr_code in validas})
+            .only('id', 'qr_code', 'status', 'nome_completo_inscricao', 'checkin_realizado', 'data_checkin', 'checkin_dispositivo')
+            .order_by('id')
+        }
+
+        for lido_em, indice, qr_code in sorted(validas):
+            inscricao = inscricoes.get(qr_code)
+            resultados[indice] = _aplicar(inscricao, dispositivo, lido_em, agora, registradas)
+            resultados[indice].update({'indice': indice, 'qr_code': qr_code})
+
+        if registradas:
+            Inscricao.objects.bulk_update(
+                registradas.values(),
+                ['checkin_realizado', 'data_checkin', 'checkin_dispositivo', 'updated_at'],
+            )
+            # bulk_update não dispara post_save
+            resumo.invalidar_organizadores([evento.organizador_id])
+
+    return resultados, list(registradas.values())
+
+
+def _aplicar(inscricao, dispositivo, lido_em, agora, registradas):
+    if inscricao is None:
+        return {'resultado': NAO_ENCONTRADO}
+
+    participante = {'participante': inscricao.nome_completo_inscricao}
+    if inscricao.checkin_realizado:
+        existente = {
+            **participante,
+            'data_checkin': inscricao.data_checkin.isoformat() if inscricao.data_checkin else None,
+            'dispositivo': inscricao.checkin_dispositivo,
+        }
+        if inscricao.checkin_dispositivo != dispositivo:
+            return {'resultado': CONFLITO, **existente}
+        if inscricao.data_checkin == lido_em and inscricao.pk not in registradas:
+            return {'resultado': JA_REGISTRADO, **existente}
+        return {'resultado': DUPLICADO, **existente}
+
+    if inscricao.status != 'confirmada':
+        return {'resultado': NAO_CONFIRMADA, **participante, 'status': inscricao.status}
+
+    inscricao.checkin_realizado = True
+    inscricao.data_checkin = lido_em
+    inscricao.checkin_dispositivo = dispositivo
+    inscricao.updated_at = agora
+    registradas[inscricao.pk] = inscricao
+    return {'resultado': REGISTRADO, **participante, 'data_checkin': lido_em.isoformat()}
+
+
+def _horario(valor):
+    if not isinstance(valor, str):
+        return None
+    try:
+        horario = parse_datetime(valor)
+    except ValueError:
+        return None
+    if horario is not None and timezone.is_naive(horario):
+        horario = timezone.make_aware(horario)
+    return horario
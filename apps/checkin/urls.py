@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import realizar_checkin
+from .views import realizar_checkin, sincronizar_checkins
 
 urlpatterns = [
     path('checkin/<uuid:inscricao_id>/', realizar_checkin, name='realizar-checkin'),
+    path('checkin/evento/<uuid:evento_id>/sincronizar/', sincronizar_checkins, name='sincronizar-checkins'),
 ]
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
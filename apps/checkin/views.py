@@ -1,10 +1,56 @@
+import logging
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 
+from apps.eventos.models import Evento
 from apps.inscricoes.models import Inscricao
+from . import sincronizacao
+
+logger = logging.getLogger(__name__)
+
+
+def _notificar_checkin(inscricao, evento):
+    """Avisa a tela do participante (CheckinConsumer) que o check-in foi feito."""
+    _notificar_checkins([inscricao], evento)
+
+
+def _notificar_checkins(inscricoes, evento):
+    """
+    Avisa as telas dos participantes, todas num único loop de eventos. O
+    check-in já foi gravado: falhas no channel layer só vão para o log.
+    """
+    from channels.layers import get_channel_layer
+    from asgiref.sync import async_to_sync
+
+    channel_layer = get_channel_layer()
+    if channel_layer is None or not inscricoes:
+        return
+
+    mensagens = {
+        f'checkin_{str(inscricao.id)}': {
+            'type': 'checkin_update',
+            'data': {
+                'checkin_realizado': True,
+                'data_checkin': inscricao.data_checkin.isoformat(),
+                'participante': inscricao.nome_completo_inscricao,
+                'evento': evento.titulo,
+            }
+        }
+        for inscricao in inscricoes
+    }
+    try:
+        async_to_sync(_enviar_aos_grupos)(channel_layer, mensagens)
+    except Exception:
+        logger.exception('Falha ao avisar %s check-in(s) em tempo real', len(mensagens))
+
+
+async def _enviar_aos_grupos(channel_layer, mensagens):
+    for nome, mensagem in mensagens.items():
+        await channel_layer.group_send(nome, mensagem)
 
 
 @api_view(['POST'])
@@ -34,26 +80,7 @@ def realizar_checkin(request, inscricao_id):
         inscricao.data_checkin = timezone.now()
         inscricao.save()
 
-        from channels.layers import get_channel_layer
-        from asgiref.sync import async_to_sync
-
-        channel_layer = get_channel_layer()
-        room_group_name = f'checkin_{str(inscricao.id)}'
-
-        checkin_data = {
-            'checkin_realizado': True,
-            'data_checkin': inscricao.data_checkin.isoformat(),
-            'participante': inscricao.nome_completo_inscricao,
-            'evento': inscricao.evento.titulo,
-        }
-
-        async_to_sync(channel_layer.group_send)(
-            room_group_name,
-            {
-                'type': 'checkin_update',
-                'data': checkin_data
-            }
-        )
+        _notificar_checkin(inscricao, inscricao.evento)
 
         return Response({
             'success': True,
@@ -69,3 +96,41 @@ def realizar_checkin(request, inscricao_id):
     except Exception as e:
         return Response({'error': f'Erro ao realizar check-in: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def sincronizar_checkins(request, evento_id):
+    """
+    Aplica de uma vez as leituras de QR code feitas por um leitor sem
+    conexão (ver sincronizacao.py). Corpo:
+    {"dispositivo": "porta-1", "leituras": [{"qr_code": "...", "lido_em": "2025-05-10T19:02:11Z"}]}
+    """
+    evento = get_object_or_404(Evento, id=evento_id)
+    if evento.organizador_id != request.user.pk:
+        return Response({'error': 'Você não tem permissão para realizar check-in neste evento.'}, status=status.HTTP_403_FORBIDDEN)
+
+    dispositivo = str(request.data.get('dispositivo') or '').strip()
+    leituras = request.data.get('leituras')
+    if not dispositivo or len(dispositivo) > 100:
+        return Response({'error': 'Informe o dispositivo (até 100 caracteres).'}, status=status.HTTP_400_BAD_REQUEST)
+    if not isinstance(leituras, list):
+        return Response({'error': 'Informe as leituras em uma lista.'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(leituras) > sincronizacao.MAXIMO_LEITURAS:
+        return Response(
+            {'error': f'Envie no máximo {sincronizacao.MAXIMO_LEITURAS} leituras por lote.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # sincronizar confirma a própria transação: as leituras já estão gravadas
+    resultados, registradas = sincronizacao.sincronizar(evento, dispositivo, leituras)
+    _notificar_checkins(registradas, evento)
+
+    resumo = {}
+    for resultado in resultados:
+        resumo[resultado['resultado']] = resumo.get(resultado['resultado'], 0) + 1
+    return Response({
+        'dispositivo': dispositivo,
+        'resumo': resumo,
+        'resultados': resultados,
+    }, status=status.HTTP_200_OK)
@@ -6,3 +6,5 @@ class DashboardConfig(AppConfig):
     name = 'apps.dashboard'
     label = 'dashboard'
 
+    def ready(self):
+        from . import signals  # noqa: F401
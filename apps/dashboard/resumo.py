@@ -0,0 +1,199 @@
+"""
+Resumo do dashboard do organizador.
+
+Todos os blocos do dashboard (métricas, próximos e anteriores, avisos e
+gráficos) saem de duas consultas agregadas: uma linha por evento do
+organizador, com inscrições, presenças e receita somadas por GROUP BY, e
+as notas das avaliações agrupadas por evento. O resto é calculado em
+memória.
+
+O resultado fica em cache por organizador (ver apps/cache_versions.py) e é
+invalidado pelos sinais em signals.py quando inscrições, check-ins,
+avaliações ou os próprios eventos do organizador mudam. Como "próximos" e
+"anteriores" dependem da hora, o snapshot também expira sozinho depois de
+settings.DASHBOARD_CACHE_SEGUNDOS.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from apps import cache_versions
+from apps.avaliacoes.models import Avaliacao
+from apps.eventos.models import Evento
+
+MESES = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+CORES_STATUS = [
+    ('finalizado', 'Finalizados', '#10B981'),
+    ('publicado', 'Publicados', '#3B82F6'),
+    ('em_andamento', 'Em Andamento', '#F59E0B'),
+    ('rascunho', 'Rascunho', '#6B7280'),
+    ('cancelado', 'Cancelados', '#EF4444'),
+]
+
+
+def escopo(organizador_id):
+    return f'dashboard:{organizador_id}'
+
+
+def obter(usuario):
+    """Resumo do organizador, do cache quando possível."""
+    return cache_versions.obter(
+        escopo(usuario.pk),
+        'resumo',
+        lambda: calcular(usuario.pk),
+        timeout=getattr(settings, 'DASHBOARD_CACHE_SEGUNDOS', 300),
+    )
+
+
+def invalidar_organizadores(organizador_ids):
+    cache_versions.invalidar(*(escopo(organizador_id) for organizador_id in organizador_ids))
+
+
+def invalidar_eventos(evento_ids):
+    """Invalida o resumo dos organizadores dos eventos (uma consulta)."""
+    evento_ids = [evento_id for evento_id in evento_ids if evento_id is not None]
+    if evento_ids:
+        invalidar_organizadores(set(
+            Evento.objects.filter(pk__in=evento_ids).values_list('organizador_id', flat=True)
+        ))
+
+
+def calcular(organizador_id, agora=None):
+    agora = agora or timezone.now()
+    eventos = list(
+        Evento.objects.filter(organizador_id=organizador_id)
+        .values('id', 'titulo', 'data_evento', 'status', 'endereco', 'local_especifico')
+        .annotate(
+            inscricoes_total=Count('inscricoes'),
+            presentes=Count('inscricoes', filter=Q(inscricoes__checkin_realizado=True)),
+            receita=Sum('inscricoes__valor_final', filter=Q(inscricoes__status_pagamento='aprovado')),
+        )
+        .order_by('-data_evento')
+    )
+    notas = {
+        linha['evento_id']: (linha['soma'], linha['quantidade'])
+        for linha in Avaliacao.objects.filter(evento__organizador_id=organizador_id)
+        .values('evento_id')
+        .annotate(soma=Sum('nota'), quantidade=Count('id'))
+        .order_by()
+    }
+    for evento in eventos:
+        soma, quantidade = notas.get(evento['id'], (0, 0))
+        evento['score'] = round(soma / quantidade, 1) if quantidade else 0
+
+    # Mesmo critério de Evento.Meta.ordering (mais recentes primeiro)
+    proximos = [evento for evento in eventos if evento['data_evento'] >= agora]
+    anteriores = [evento for evento in eventos if evento['data_evento'] < agora]
+
+    return {
+        'metricas': _metricas(eventos, notas),
+        'eventosProximos': [_proximo(evento) for evento in reversed(proximos[-5:])],
+        'eventosAnteriores': [_anterior(evento) for evento in anteriores[:5]],
+        'notificacoes': _notificacoes(proximos, agora),
+        'graficos': _graficos(eventos, anteriores, agora),
+    }
+
+
+def _metricas(eventos, notas):
+    finalizados = [evento for evento in eventos if evento['status'] == 'finalizado']
+    inscritos_finalizados = sum(evento['inscricoes_total'] for evento in finalizados)
+    presentes_finalizados = sum(evento['presentes'] for evento in finalizados)
+    soma_notas = sum(soma for soma, _ in notas.values())
+    total_notas = sum(quantidade for _, quantidade in notas.values())
+    return {
+        'totalInscricoes': sum(evento['inscricoes_total'] for evento in eventos),
+        'taxaComparecimento': round((presentes_finalizados / inscritos_finalizados) * 100, 1) if inscritos_finalizados > 0 else 0,
+        'receitaTotal': float(sum(evento['receita'] or 0 for evento in eventos)),
+        'scoreMedia': round(soma_notas / total_notas, 1) if total_notas else 0,
+    }
+
+
+def _proximo(evento):
+    return {
+        'id': evento['id'],
+        'titulo': evento['titulo'],
+        'data': evento['data_evento'].isoformat(),
+        'status': evento['status'].capitalize() if evento['status'] else 'Confirmado',
+        'inscricoes': evento['inscricoes_total'],
+        'local': f"{evento['endereco']}, {evento['local_especifico']}" if evento['local_especifico'] else evento['endereco'],
+    }
+
+
+def _anterior(evento):
+    return {
+        'id': evento['id'],
+        'titulo': evento['titulo'],
+        'data': evento['data_evento'].isoformat(),
+        'inscricoes': evento['inscricoes_total'],
+        'comparecimento': evento['presentes'],
+        'receita': float(evento['receita'] or 0),
+        'score': evento['score'],
+    }
+
+
+def _notificacoes(proximos, agora):
+    notificacoes_list = [
+        {
+            'id': f"evento-{evento['id']}",
+            'tipo': 'warning',
+            'titulo': 'Evento se aproximando',
+            'mensagem': f"{evento['titulo']} acontecerá em breve!",
+            'tempo': 'Hoje',
+        }
+        for evento in proximos
+        if evento['data_evento'] <= agora + timedelta(days=1)
+    ]
+    pouco_inscritos = [evento for evento in proximos if evento['inscricoes_total'] < 5]
+    notificacoes_list += [
+        {
+            'id': f"baixa-inscricao-{evento['id']}",
+            'tipo': 'info',
+            'titulo': 'Poucas inscrições',
+            'mensagem': f"{evento['titulo']} tem apenas {evento['inscricoes_total']} inscrições",
+            'tempo': 'Recente',
+        }
+        for evento in pouco_inscritos[:3]
+    ]
+    return notificacoes_list[:10]
+
+
+def _graficos(eventos, anteriores, agora):
+    # Comparecimento mensal: mesmos meses de antes (passos de 30 dias)
+    por_mes = {}
+    for evento in eventos:
+        data = timezone.localtime(evento['data_evento'])
+        inscritos, presentes = por_mes.get((data.year, data.month), (0, 0))
+        por_mes[(data.year, data.month)] = (inscritos + evento['inscricoes_total'], presentes + evento['presentes'])
+
+    comparecimento_mensal = []
+    for i in range(6):
+        mes_data = timezone.localtime(agora - timedelta(days=30 * i))
+        total_inscritos, total_presentes = por_mes.get((mes_data.year, mes_data.month), (0, 0))
+        comparecimento_mensal.insert(0, {
+            'mes': MESES[mes_data.month - 1],
+            'comparecimento': round((total_presentes / total_inscritos) * 100) if total_inscritos > 0 else 0,
+        })
+
+    score_medio = [
+        {
+            'evento': evento['titulo'][:15] + '...' if len(evento['titulo']) > 15 else evento['titulo'],
+            'score': evento['score'],
+        }
+        for evento in reversed(anteriores[:5])
+    ]
+
+    por_status = {}
+    for evento in eventos:
+        por_status[evento['status']] = por_status.get(evento['status'], 0) + 1
+
+    return {
+        'comparecimentoMensal': comparecimento_mensal,
+        'scoreMedio': score_medio,
+        'desempenhoEventos': [
+            {'name': nome, 'value': por_status.get(status, 0), 'color': cor}
+            for status, nome, cor in CORES_STATUS
+        ],
+    }
@@ -0,0 +1,54 @@
+"""Invalidação do resumo do dashboard (ver resumo.py)."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.avaliacoes.models import Avaliacao
+from apps.eventos.models import Evento
+from apps.inscricoes.models import Inscricao
+from apps.tracking import transicao_status
+from . import resumo
+
+
+@receiver(post_save, sender=Inscricao)
+@receiver(post_delete, sender=Inscricao)
+def invalidar_por_inscricao(sender, instance, raw=False, **kwargs):
+    """Inscrições, pagamentos e check-ins mudam as métricas do organizador."""
+    if raw:
+        return
+    evento_anterior = instance.valor_carregado('evento_id')
+    if evento_anterior not in (None, instance.evento_id):
+        resumo.invalidar_eventos([evento_anterior])
+    _invalidar_pelo_evento([instance])
+
+
+@receiver(transicao_status, sender=Inscricao)
+def invalidar_por_transicao(sender, instancias, **kwargs):
+    # Cobre as mudanças em lote (update/bulk_update), que não passam pelo post_save
+    _invalidar_pelo_evento(instancias)
+
+
+@receiver(post_save, sender=Avaliacao)
+@receiver(post_delete, sender=Avaliacao)
+def invalidar_por_avaliacao(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _invalidar_pelo_evento([instance])
+
+
+@receiver(post_save, sender=Evento)
+@receiver(post_delete, sender=Evento)
+def invalidar_por_evento(sender, instance, raw=False, **kwargs):
+    if not raw:
+        resumo.invalidar_organizadores([instance.organizador_id])
+
+
+def _invalidar_pelo_evento(instancias):
+    # Com o evento já carregado, o organizador sai dele sem consulta
+    organizadores, sem_evento = set(), set()
+    for instancia in instancias:
+        evento = instancia._state.fields_cache.get('evento')
+        if evento is not None:
+            organizadores.add(evento.organizador_id)
+        else:
+            sem_evento.add(instancia.evento_id)
+    resumo.invalidar_organizadores(organizadores)
+    resumo.invalidar_eventos(sem_evento)
@@ -0,0 +1,46 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from apps.jobs.filas import enfileirar
+
+from . import envio
+from .models import Email
+
+
+@admin.register(Email)
+class EmailAdmin(admin.ModelAdmin):
+    list_display = ['id', 'destinatario_email', 'assunto', 'status', 'tentativas', 'created_at', 'enviado_em']
+    list_filter = ['status', 'modelo', 'created_at']
+    search_fields = ['destinatario_email', 'assunto', 'id_mensagem', 'id_lote']
+    readonly_fields = [
+        'destinatario_email', 'destinatario_nome', 'assunto', 'modelo', 'html', 'texto',
+        'status', 'tentativas', 'proxima_tentativa_em', 'reservado_ate', 'token',
+        'id_mensagem', 'id_lote', 'ultimo_erro', 'created_at', 'enviado_em',
+    ]
+    list_per_page = 50
+    actions = ['reenviar']
+
+    fieldsets = (
+        ('Mensagem', {
+            'fields': ('destinatario_email', 'destinatario_nome', 'assunto', 'modelo', 'html', 'texto')
+        }),
+        ('Entrega', {
+            'fields': ('status', 'tentativas', 'proxima_tentativa_em', 'reservado_ate', 'token',
+                       'id_mensagem', 'id_lote', 'ultimo_erro', 'created_at', 'enviado_em')
+        }),
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description='Reenviar e-mails que falharam')
+    def reenviar(self, request, queryset):
+        total = queryset.filter(status=Email.FALHOU).update(
+            status=Email.PENDENTE,
+            tentativas=0,
+            proxima_tentativa_em=timezone.now(),
+            ultimo_erro='',
+        )
+        if total:
+            enfileirar(envio.enviar_pendentes, fila=envio.FILA, chave=envio.CHAVE_ENVIO)
+        self.message_user(request, f'{total} e-mail(s) reenfileirado(s).')
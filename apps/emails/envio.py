@@ -0,0 +1,283 @@
+"""
+Caixa de saída de e-mails transacionais (MailerSend).
+
+`agendar` renderiza o template e grava o Email na transação atual; a
+requisição não espera nenhuma chamada externa. O job `enviar_pendentes`
+(fila 'emails'; no máximo um pendente por vez, pela chave) manda tudo o
+que estiver disponível por uma requests.Session compartilhada, que
+reaproveita as conexões TLS entre envios:
+
+- um e-mail: POST /email, confirmado na resposta (202 + X-Message-Id);
+- vários: POST /bulk-email em lotes de até TAMANHO_LOTE; o job
+  `atualizar_lote` consulta depois o resultado e marca cada e-mail como
+  enviado ou falhou. Um lote que termina como 'failed' volta para a fila
+  como falha temporária; um que não termina em MAX_CONSULTAS_LOTE
+  consultas falha, já que reenviá-lo poderia duplicar as mensagens.
+
+Falhas temporárias (rede, 429, 5xx) voltam o e-mail para pendente, com
+espera exponencial com jitter, até MAX_TENTATIVAS. Recusas definitivas
+(4xx) marcam o e-mail como falhou; um lote recusado é reenviado e-mail a
+e-mail para isolar o inválido.
+
+A URL da API vem de settings.MAILERSEND_API_URL, o que permite apontar o
+envio para um servidor HTTP local em testes.
+"""
+import logging
+import threading
+import uuid
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db.models import F, Min, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from apps.jobs import reserva
+from apps.jobs.filas import backoff, enfileirar
+from .models import Email
+
+logger = logging.getLogger(__name__)
+
+FILA = 'emails'
+CHAVE_ENVIO = 'emails:enviar'
+# Máximo de mensagens por requisição aceito pelo /bulk-email
+TAMANHO_LOTE = 500
+MAX_TENTATIVAS = 6
+# (conexão, leitura) em segundos
+TIMEOUT = (5, 30)
+# Tempo que um envio pode levar antes de os e-mails voltarem para a fila
+RESERVA = timedelta(minutes=5)
+# Segundos até consultar o resultado de um lote, e quantas consultas fazer
+# antes de desistir dele (cerca de 10 minutos)
+ESPERA_LOTE = 15
+MAX_CONSULTAS_LOTE = 40
+# Estados finais de um /bulk-email que não foi enviado
+ESTADOS_FALHA_LOTE = {'failed'}
+
+_sessao = None
+_trava_sessao = threading.Lock()
+
+
+def agendar(destinatario_email, assunto, modelo, contexto, destinatario_nome=''):
+    """
+    Renderiza `modelo`.html e `modelo`.txt com `contexto` e põe o e-mail na
+    caixa de saída. Retorna o Email.
+    """
+    email = Email.objects.create(
+        destinatario_email=destinatario_email,
+        destinatario_nome=destinatario_nome,
+        assunto=assunto,
+        modelo=modelo,
+        html=render_to_string(f'{modelo}.html', contexto),
+        texto=render_to_string(f'{modelo}.txt', contexto),
+    )
+    enfileirar(enviar_pendentes, fila=FILA, chave=CHAVE_ENVIO)
+    return email
+
+
+def sessao():
+    """Session HTTP do processo, com o pool de conexões reaproveitado entre envios."""
+    global _sessao
+    with _trava_sessao:
+        if _sessao is None:
+            _sessao = requests.Session()
+            _sessao.headers.update({
+                'Authorization': f'Bearer {settings.MAILERSEND_API_TOKEN}',
+                'Content-Type': 'application/json',
+                'X-Requested-With': 'XMLHttpRequest',
+            })
+            adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+            _sessao.mount('https://', adaptador)
+            _sessao.mount('http://', adaptador)
+    return _sessao
+
+
+def enviar_pendentes():
+    """Job: envia os e-mails disponíveis. Retorna quantos foram processados."""
+    processados = 0
+    while True:
+        agora = timezone.now()
+        lote = reserva.reservar(
+            Email.objects.disponiveis(agora).order_by('id'),
+            TAMANHO_LOTE,
+            token=uuid.uuid4(),
+            status=Email.ENVIANDO,
+            reservado_ate=agora + RESERVA,
+            tentativas=F('tentativas') + 1,
+        )
+        if not lote:
+            break
+        if len(lote) == 1:
+            _enviar_um(lote[0])
+        else:
+            _enviar_lote(lote)
+        processados += len(lote)
+
+    _agendar_proximo_envio()
+    return processados
+
+
+def atualizar_lote(id_lote, consulta=1):
+    """Job: lê o resultado de um /bulk-email e marca cada e-mail do lote."""
+    resposta = sessao().get(_url(f'/bulk-email/{id_lote}'), timeout=TIMEOUT)
+    # Falha aqui vira exceção e o job é repetido
+    resposta.raise_for_status()
+    dados = resposta.json().get('data', {})
+    estado = dados.get('state')
+    if estado in ESTADOS_FALHA_LOTE:
+        aguardando = list(Email.objects.filter(id_lote=id_lote, status=Email.AGUARDANDO))
+        if aguardando:
+            _falha_temporaria(aguardando, f'Lote {id_lote} terminou como {estado!r}')
+            _agendar_proximo_envio()
+        return estado
+    if estado != 'completed':
+        if consulta >= MAX_CONSULTAS_LOTE:
+            logger.warning('Lote %s sem resultado após %s consultas (estado %r)', id_lote, consulta, estado)
+            Email.objects.filter(id_lote=id_lote, status=Email.AGUARDANDO).update(
+                status=Email.FALHOU,
+                ultimo_erro=f'Lote {id_lote} sem resultado após {consulta} consultas (estado {estado!r})',
+            )
+        else:
+            enfileirar(atualizar_lote, [id_lote, consulta + 1], fila=FILA, atraso=ESPERA_LOTE)
+        return estado
+
+    # Os índices de validation_errors ('message.<i>...') seguem a ordem do
+    # envio, que é a ordem dos ids
+    emails = list(Email.objects.filter(id_lote=id_lote).order_by('id'))
+    invalidos = {}
+    for chave, erros in (dados.get('validation_errors') or {}).items():
+        partes = chave.split('.')
+        if len(partes) > 1 and partes[0] == 'message' and partes[1].isdigit():
+            invalidos.setdefault(int(partes[1]), []).append(f'{chave}: {erros}')
+    ids_mensagem = iter(dados.get('messages_id') or [])
+
+    agora = timezone.now()
+    atualizados = []
+    for indice, email in enumerate(emails):
+        if email.status != Email.AGUARDANDO:
+            continue
+        if indice in invalidos:
+            email.status = Email.FALHOU
+            email.ultimo_erro = '\n'.join(invalidos[indice])
+        else:
+            email.status = Email.ENVIADO
+            email.id_mensagem = next(ids_mensagem, '')
+            email.enviado_em = agora
+        atualizados.append(email)
+    Email.objects.bulk_update(atualizados, ['status', 'ultimo_erro', 'id_mensagem', 'enviado_em'])
+    return estado
+
+
+def _enviar_um(email):
+    try:
+        resposta = sessao().post(_url('/email'), json=_payload(email), timeout=TIMEOUT)
+    except requests.RequestException as erro:
+        _falha_temporaria([email], str(erro))
+        return
+
+    if resposta.ok:
+        _marcar(
+            [email],
+            status=Email.ENVIADO,
+            id_mensagem=resposta.headers.get('X-Message-Id', ''),
+            enviado_em=timezone.now(),
+            ultimo_erro='',
+        )
+    elif _temporaria(resposta):
+        _falha_temporaria([email], _erro(resposta), _retry_after(resposta))
+    else:
+        logger.warning('E-mail %s recusado pelo provedor: %s', email.pk, _erro(resposta))
+        _marcar([email], status=Email.FALHOU, ultimo_erro=_erro(resposta))
+
+
+def _enviar_lote(lote):
+    try:
+        resposta = sessao().post(_url('/bulk-email'), json=[_payload(email) for email in lote], timeout=TIMEOUT)
+    except requests.RequestException as erro:
+        _falha_temporaria(lote, str(erro))
+        return
+
+    if resposta.ok:
+        id_lote = resposta.json().get('bulk_email_id', '')
+        _marcar(lote, status=Email.AGUARDANDO, id_lote=id_lote, ultimo_erro='')
+        enfileirar(atualizar_lote, [id_lote], fila=FILA, atraso=ESPERA_LOTE)
+    elif _temporaria(resposta):
+        _falha_temporaria(lote, _erro(resposta), _retry_after(resposta))
+    else:
+        # Lote recusado por validação: um a um, só o inválido falha
+        logger.warning('Lote de %s e-mails recusado, enviando um a um: %s', len(lote), _erro(resposta))
+        for email in lote:
+            _enviar_um(email)
+
+
+def _falha_temporaria(emails, erro, espera=None):
+    """Devolve os e-mails para a fila com backoff; os que esgotaram as tentativas falham."""
+    tentativas = max(email.tentativas for email in emails)
+    espera = espera if espera is not None else backoff(tentativas)
+    esgotados = [email for email in emails if email.tentativas >= MAX_TENTATIVAS]
+    restantes = [email for email in emails if email.tentativas < MAX_TENTATIVAS]
+    logger.warning('Falha temporária ao enviar %s e-mail(s): %s', len(emails), erro)
+    if esgotados:
+        _marcar(esgotados, status=Email.FALHOU, ultimo_erro=erro)
+    if restantes:
+        _marcar(
+            restantes,
+            status=Email.PENDENTE,
+            ultimo_erro=erro,
+            proxima_tentativa_em=timezone.now() + timedelta(seconds=espera),
+        )
+
+
+def _marcar(emails, **campos):
+    # Só quem ainda tem a reserva grava (ver RESERVA)
+    Email.objects.filter(pk__in=[email.pk for email in emails], token=emails[0].token).update(
+        token=None,
+        reservado_ate=None,
+        **campos,
+    )
+
+
+def _agendar_proximo_envio():
+    """Garante um job para as novas tentativas e para envios interrompidos."""
+    proximas = Email.objects.aggregate(
+        pendente=Min('proxima_tentativa_em', filter=Q(status=Email.PENDENTE)),
+        interrompido=Min('reservado_ate', filter=Q(status=Email.ENVIANDO)),
+    )
+    proxima = min((momento for momento in proximas.values() if momento), default=None)
+    if proxima is not None:
+        atraso = max(0, (proxima - timezone.now()).total_seconds())
+        enfileirar(enviar_pendentes, fila=FILA, atraso=atraso, chave=CHAVE_ENVIO)
+
+
+def _url(caminho):
+    return settings.MAILERSEND_API_URL.rstrip('/') + caminho
+
+
+def _payload(email):
+    destinatario = {'email': email.destinatario_email}
+    if email.destinatario_nome:
+        destinatario['name'] = email.destinatario_nome
+    return {
+        'from': {'email': settings.DEFAULT_FROM_EMAIL, 'name': 'Backstage'},
+        'to': [destinatario],
+        'subject': email.assunto,
+        'html': email.html,
+        'text': email.texto,
+    }
+
+
+def _temporaria(resposta):
+    return resposta.status_code == 429 or resposta.status_code >= 500
+
+
+def _retry_after(resposta):
+    try:
+        return max(0, int(resposta.headers['Retry-After']))
+    except (KeyError, ValueError):
+        return None
+
+
+def _erro(resposta):
+    return f'HTTP {resposta.status_code}: {resposta.text[:1000]}'
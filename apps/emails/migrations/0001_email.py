@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:06
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Email',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('destinatario_email', models.EmailField(max_length=254, verbose_name='E-mail do destinatário')),
+                ('destinatario_nome', models.CharField(blank=True, max_length=200, verbose_name='Nome do destinatário')),
+                ('assunto', models.CharField(max_length=255, verbose_name='Assunto')),
+                ('modelo', models.CharField(blank=True, help_text='Template usado para renderizar o corpo', max_length=100, verbose_name='Modelo')),
+                ('html', models.TextField(verbose_name='HTML')),
+                ('texto', models.TextField(verbose_name='Texto')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('enviando', 'Enviando'), ('aguardando', 'Aguardando confirmação do lote'), ('enviado', 'Enviado'), ('falhou', 'Falhou')], default='pendente', max_length=20, verbose_name='Status')),
+                ('tentativas', models.PositiveIntegerField(default=0, verbose_name='Tentativas')),
+                ('proxima_tentativa_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próxima tentativa em')),
+                ('reservado_ate', models.DateTimeField(blank=True, null=True, verbose_name='Reservado até')),
+                ('token', models.UUIDField(blank=True, db_index=True, null=True, verbose_name='Token da reserva')),
+                ('id_mensagem', models.CharField(blank=True, max_length=100, verbose_name='ID da mensagem no provedor')),
+                ('id_lote', models.CharField(blank=True, db_index=True, max_length=100, verbose_name='ID do lote no provedor')),
+                ('ultimo_erro', models.TextField(blank=True, verbose_name='Último erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('enviado_em', models.DateTimeField(blank=True, null=True, verbose_name='Enviado em')),
+            ],
+            options={
+                'verbose_name': 'E-mail',
+                'verbose_name_plural': 'E-mails',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'proxima_tentativa_em'], name='email_disponivel_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,121 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class EmailQuerySet(models.QuerySet):
+    def disponiveis(self, agora):
+        """E-mails prontos para envio, inclusive os de um envio interrompido."""
+        return self.filter(
+            Q(status=Email.PENDENTE, proxima_tentativa_em__lte=agora)
+            | Q(status=Email.ENVIANDO, reservado_ate__lte=agora)
+        )
+
+
+class Email(models.Model):
+    """
+    E-mail transacional na caixa de saída (ver apps/emails/envio.py).
+    O corpo é renderizado ao agendar, então o envio não depende de dados
+    que possam mudar depois.
+    """
+
+    PENDENTE = 'pendente'
+    ENVIANDO = 'enviando'
+    AGUARDANDO = 'aguardando'
+    ENVIADO = 'enviado'
+    FALHOU = 'falhou'
+
+    STATUS_CHOICES = [
+        (PENDENTE, 'Pendente'),
+        (ENVIANDO, 'Enviando'),
+        (AGUARDANDO, 'Aguardando confirmação do lote'),
+        (ENVIADO, 'Enviado'),
+        (FALHOU, 'Falhou'),
+    ]
+
+    destinatario_email = models.EmailField(
+        verbose_name='E-mail do destinatário'
+    )
+    destinatario_nome = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name='Nome do destinatário'
+    )
+    assunto = models.CharField(
+        max_length=255,
+        verbose_name='Assunto'
+    )
+    modelo = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text='Template usado para renderizar o corpo',
+        verbose_name='Modelo'
+    )
+    html = models.TextField(
+        verbose_name='HTML'
+    )
+    texto = models.TextField(
+        verbose_name='Texto'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=PENDENTE,
+        verbose_name='Status'
+    )
+    tentativas = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Tentativas'
+    )
+    proxima_tentativa_em = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Próxima tentativa em'
+    )
+    reservado_ate = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Reservado até'
+    )
+    token = models.UUIDField(
+        blank=True,
+        null=True,
+        db_index=True,
+        verbose_name='Token da reserva'
+    )
+    id_mensagem = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name='ID da mensagem no provedor'
+    )
+    id_lote = models.CharField(
+        max_length=100,
+        blank=True,
+        db_index=True,
+        verbose_name='ID do lote no provedor'
+    )
+    ultimo_erro = models.TextField(
+        blank=True,
+        verbose_name='Último erro'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Criado em'
+    )
+    enviado_em = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Enviado em'
+    )
+
+    objects = EmailQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'E-mail'
+        verbose_name_plural = 'E-mails'
+        indexes = [
+            models.Index(fields=['status', 'proxima_tentativa_em'], name='email_disponivel_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.assunto} -> {self.destinatario_email} ({self.get_status_display()})"
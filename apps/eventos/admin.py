@@ -3,7 +3,7 @@ from .models import Evento
 
 @admin.register(Evento)
 class EventoAdmin(admin.ModelAdmin):
-    list_display = ('titulo', 'categoria', 'organizador', 'data_evento', 'capacidade_maxima', 'valor_deposito', 'status')
+    list_display = ('titulo', 'categoria', 'organizador', 'data_evento', 'capacidade_maxima', 'inscritos_confirmados', 'reservas_ativas', 'valor_deposito', 'status')
     list_filter = ('categoria', 'status', 'data_evento', 'permite_transferencia')
     search_fields = ('titulo', 'organizador__username', 'endereco')
     date_hierarchy = 'data_evento'
@@ -6,3 +6,6 @@ class EventosConfig(AppConfig):
     name = 'apps.eventos'
     label = 'eventos'
 
+    def ready(self):
+        # Conecta os receivers que mantêm o índice de busca e as variantes da capa
+        from . import signals  # noqa: F401
@@ -0,0 +1,123 @@
+"""
+Geohash e distâncias para a busca de eventos por proximidade.
+
+Cada evento guarda o geohash da sua coordenada (Evento.geohash). Para buscar
+num raio, escolhe-se a maior precisão cuja célula ainda é maior que o raio:
+assim o círculo inteiro cabe na célula do ponto mais as 8 vizinhas, e cada
+uma vira um intervalo [prefixo, fim_prefixo(prefixo)) no índice
+(status, geohash). Os candidatos são então filtrados pela distância exata
+(haversine).
+
+Módulo sem dependências do Django.
+"""
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+PRECISAO_MAXIMA = 9
+RAIO_TERRA_KM = 6371.0088
+KM_POR_GRAU = math.pi * RAIO_TERRA_KM / 180
+
+
+def coordenada_valida(lat, lng):
+    return lat is not None and lng is not None and -90 <= lat <= 90 and -180 <= lng <= 180
+
+
+def codificar(lat, lng, precisao=PRECISAO_MAXIMA):
+    """Geohash da coordenada com `precisao` caracteres."""
+    lat_min, lat_max = -90.0, 90.0
+    lng_min, lng_max = -180.0, 180.0
+    resultado = []
+    bits, valor, longitude = 0, 0, True
+
+    while len(resultado) < precisao:
+        if longitude:
+            meio = (lng_min + lng_max) / 2
+            if lng >= meio:
+                valor = (valor << 1) | 1
+                lng_min = meio
+            else:
+                valor <<= 1
+                lng_max = meio
+        else:
+            meio = (lat_min + lat_max) / 2
+            if lat >= meio:
+                valor = (valor << 1) | 1
+                lat_min = meio
+            else:
+                valor <<= 1
+                lat_max = meio
+        longitude = not longitude
+        bits += 1
+        if bits == 5:
+            resultado.append(BASE32[valor])
+            bits, valor = 0, 0
+
+    return ''.join(resultado)
+
+
+def tamanho_celula(precisao):
+    """(altura, largura) da célula em graus para a precisão dada."""
+    bits = 5 * precisao
+    bits_lat = bits // 2
+    bits_lng = bits - bits_lat
+    return 180.0 / (1 << bits_lat), 360.0 / (1 << bits_lng)
+
+
+def precisao_para_raio(lat, raio_km):
+    """Maior precisão cuja célula cobre o raio nas duas direções."""
+    # A largura em km encolhe com a latitude; usa a borda mais próxima do polo
+    lat_extrema = min(abs(lat) + raio_km / KM_POR_GRAU, 90.0)
+    fator_lng = max(math.cos(math.radians(lat_extrema)), 1e-6)
+
+    for precisao in range(PRECISAO_MAXIMA, 0, -1):
+        altura, largura = tamanho_celula(precisao)
+        if altura * KM_POR_GRAU >= raio_km and largura * KM_POR_GRAU * fator_lng >= raio_km:
+            return precisao
+    return 0
+
+
+def fim_prefixo(prefixo):
+    """
+    Menor geohash maior que todos os que começam com `prefixo` (limite
+    exclusivo do intervalo), ou None quando não há limite. Sucede o último
+    caractere no próprio alfabeto, que fica na mesma ordem em qualquer
+    collation, em vez de depender de um caractere sentinela.
+    """
+    prefixo = prefixo.rstrip(BASE32[-1])
+    if not prefixo:
+        return None
+    return prefixo[:-1] + BASE32[BASE32.index(prefixo[-1]) + 1]
+
+
+def prefixos_vizinhanca(lat, lng, raio_km):
+    """
+    Prefixos de geohash (célula do ponto + vizinhas) que cobrem o raio.
+    Retorna [''] quando o raio é grande demais para o grid (varre tudo).
+    """
+    precisao = precisao_para_raio(lat, raio_km)
+    if precisao == 0:
+        return ['']
+
+    altura, largura = tamanho_celula(precisao)
+    # Centro da célula do ponto; as vizinhas ficam a uma célula de distância
+    centro_lat = (math.floor((lat + 90) / altura) + 0.5) * altura - 90
+    centro_lng = (math.floor((lng + 180) / largura) + 0.5) * largura - 180
+
+    prefixos = set()
+    for d_lat in (-1, 0, 1):
+        vizinha_lat = centro_lat + d_lat * altura
+        if not -90 < vizinha_lat < 90:
+            continue
+        for d_lng in (-1, 0, 1):
+            vizinha_lng = (centro_lng + d_lng * largura + 180) % 360 - 180
+            prefixos.add(codificar(vizinha_lat, vizinha_lng, precisao))
+    return sorted(prefixos)
+
+
+def distancia_km(lat1, lng1, lat2, lng2):
+    """Distância haversine entre dois pontos, em km."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * RAIO_TERRA_KM * math.asin(min(1.0, math.sqrt(a)))
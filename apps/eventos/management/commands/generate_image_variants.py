@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from apps import images
+from apps.eventos.models import Evento
+from apps.users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Generate resized WebP/JPEG variants for event covers and profile photos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate variants even when they are already up to date.",
+        )
+
+    def handle(self, *args, **options):
+        force = options["force"]
+        alvos = [
+            (Evento, "foto_capa"),
+            (CustomUser, "profile_photo"),
+        ]
+
+        for modelo, campo in alvos:
+            registros = (
+                modelo.objects.exclude(**{campo: ""})
+                .exclude(**{f"{campo}__isnull": True})
+                .only("pk", campo, "variantes_imagem")
+                .iterator(chunk_size=500)
+            )
+            total = 0
+            for registro in registros:
+                if force or images.variantes_desatualizadas(registro, campo):
+                    images.processar_variantes(modelo._meta.label, registro.pk, campo, sobrescrever=force)
+                    total += 1
+            self.stdout.write(f"{modelo._meta.verbose_name_plural}: {total} image(s) processed")
+
+        self.stdout.write(self.style.SUCCESS("Done."))
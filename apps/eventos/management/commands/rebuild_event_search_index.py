@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.eventos import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for all events."
+
+    def handle(self, *args, **options):
+        search.reindexar_todos()
+        self.stdout.write(self.style.SUCCESS("Done. Event search index rebuilt."))
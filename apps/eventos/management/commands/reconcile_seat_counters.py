@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from apps.eventos.models import Evento
+from apps.inscricoes.models import Inscricao
+
+CONFIRMADAS = Q(status="confirmada")
+RESERVAS = Q(status="pendente", reserva_expira_em__isnull=False)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount confirmed registrations and active seat holds and fix drift in "
+        "Evento.inscritos_confirmados / Evento.reservas_ativas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report events whose counter drifted, without fixing them",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options.get("dry_run", False)
+
+        divergentes = (
+            Evento.objects.annotate(
+                confirmadas_reais=self._contagem(CONFIRMADAS),
+                reservas_reais=self._contagem(RESERVAS),
+            )
+            .filter(~Q(inscritos_confirmados=F("confirmadas_reais")) | ~Q(reservas_ativas=F("reservas_reais")))
+            .values_list(
+                "id", "titulo",
+                "inscritos_confirmados", "confirmadas_reais",
+                "reservas_ativas", "reservas_reais",
+            )
+        )
+
+        corrigidos = 0
+        for evento_id, titulo, confirmadas, confirmadas_reais, reservas, reservas_reais in divergentes.iterator():
+            self.stdout.write(
+                f" - {titulo}: confirmed stored {confirmadas}, actual {confirmadas_reais} | "
+                f"holds stored {reservas}, actual {reservas_reais}"
+            )
+            if dry_run:
+                continue
+
+            # Recontagem sob lock da linha do evento: inscrições concorrentes
+            # esperam o commit e aplicam seus deltas sobre o valor corrigido.
+            with transaction.atomic():
+                list(Evento.objects.select_for_update().filter(pk=evento_id).values_list("pk", flat=True))
+                Evento.objects.filter(pk=evento_id).update(
+                    inscritos_confirmados=Inscricao.objects.filter(CONFIRMADAS, evento_id=evento_id).count(),
+                    reservas_ativas=Inscricao.objects.filter(RESERVAS, evento_id=evento_id).count(),
+                )
+            corrigidos += 1
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING("\nDry-run complete. No counters were changed."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"\nDone. Counters fixed: {corrigidos}"))
+
+    @staticmethod
+    def _contagem(condicao):
+        total = (
+            Inscricao.objects.filter(condicao, evento=OuterRef("pk"))
+            .order_by()
+            .values("evento")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        return Coalesce(Subquery(total, output_field=IntegerField()), Value(0))
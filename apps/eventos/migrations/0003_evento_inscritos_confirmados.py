@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:22
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def preencher_inscritos_confirmados(apps, schema_editor):
+    Evento = apps.get_model('eventos', 'Evento')
+    Inscricao = apps.get_model('inscricoes', 'Inscricao')
+
+    totais = (
+        Inscricao.objects.filter(status='confirmada')
+        .order_by()
+        .values('evento')
+        .annotate(total=Count('id'))
+    )
+    for item in totais:
+        Evento.objects.filter(pk=item['evento']).update(inscritos_confirmados=item['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0002_evento_qr_code_pix'),
+        ('inscricoes', '0002_inscricao_comprovante_pagamento_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='inscritos_confirmados',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(preencher_inscritos_confirmados, migrations.RunPython.noop),
+    ]
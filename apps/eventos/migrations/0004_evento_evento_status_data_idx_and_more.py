@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0003_evento_inscritos_confirmados'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evento',
+            index=models.Index(fields=['status', '-data_evento', '-id'], name='evento_status_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evento',
+            index=models.Index(fields=['status', 'categoria', '-data_evento', '-id'], name='evento_status_cat_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evento',
+            index=models.Index(fields=['organizador', '-created_at', '-id'], name='evento_org_criado_idx'),
+        ),
+    ]
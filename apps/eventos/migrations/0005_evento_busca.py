@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:25
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension, UnaccentExtension
+from django.db import migrations
+from django.db.models import F, Func, TextField
+
+# Cópia do estado de apps/eventos/search.py quando esta migration foi criada;
+# mudanças posteriores no módulo não devem alterar o que ela faz
+CAMPOS = ('titulo', 'descricao', 'itens_incluidos', 'endereco', 'categoria')
+PESOS_POSTGRES = {'titulo': 'A', 'categoria': 'B', 'itens_incluidos': 'C', 'endereco': 'C', 'descricao': 'D'}
+TABELA_FTS = 'api_evento_busca'
+
+
+def _vetor_postgres():
+    from django.contrib.postgres.search import SearchVector
+
+    vetor = None
+    for campo in CAMPOS:
+        parte = SearchVector(
+            Func(F(campo), function='unaccent', output_field=TextField()),
+            config='simple',
+            weight=PESOS_POSTGRES[campo],
+        )
+        vetor = parte if vetor is None else vetor + parte
+    return vetor
+
+
+def criar_indice_busca(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS evento_busca_vetor_idx ON api_evento USING gin (busca_vetor)'
+        )
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS evento_titulo_trgm_idx ON api_evento USING gin (titulo gin_trgm_ops)'
+        )
+        Evento = apps.get_model('eventos', 'Evento')
+        Evento.objects.update(busca_vetor=_vetor_postgres())
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA_FTS} USING fts5('
+            f'evento_id UNINDEXED, {", ".join(CAMPOS)}, '
+            f"tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f'INSERT INTO {TABELA_FTS} (evento_id, {", ".join(CAMPOS)}) '
+            f'SELECT id, {", ".join(CAMPOS)} FROM api_evento'
+        )
+
+
+def remover_indice_busca(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS evento_titulo_trgm_idx')
+        schema_editor.execute('DROP INDEX IF EXISTS evento_busca_vetor_idx')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {TABELA_FTS}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0004_evento_evento_status_data_idx_and_more'),
+    ]
+
+    operations = [
+        # As extensões só são criadas no PostgreSQL; nos outros bancos são no-op
+        TrigramExtension(),
+        UnaccentExtension(),
+        migrations.AddField(
+            model_name='evento',
+            name='busca_vetor',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(criar_indice_busca, remover_indice_busca),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Cópia da codificação de apps/eventos/geo.py quando esta migration foi
+# criada; mudanças posteriores no módulo não devem alterar o que ela faz
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+PRECISAO = 9
+
+
+def coordenada_valida(lat, lng):
+    return lat is not None and lng is not None and -90 <= lat <= 90 and -180 <= lng <= 180
+
+
+def codificar(lat, lng):
+    lat_min, lat_max = -90.0, 90.0
+    lng_min, lng_max = -180.0, 180.0
+    resultado = []
+    bits, valor, longitude = 0, 0, True
+
+    while len(resultado) < PRECISAO:
+        if longitude:
+            meio = (lng_min + lng_max) / 2
+            if lng >= meio:
+                valor = (valor << 1) | 1
+                lng_min = meio
+            else:
+                valor <<= 1
+                lng_max = meio
+        else:
+            meio = (lat_min + lat_max) / 2
+            if lat >= meio:
+                valor = (valor << 1) | 1
+                lat_min = meio
+            else:
+                valor <<= 1
+                lat_max = meio
+        longitude = not longitude
+        bits += 1
+        if bits == 5:
+            resultado.append(BASE32[valor])
+            bits, valor = 0, 0
+
+    return ''.join(resultado)
+
+
+def preencher_geohash(apps, schema_editor):
+    Evento = apps.get_model('eventos', 'Evento')
+
+    lote = []
+    eventos = (
+        Evento.objects.filter(latitude__isnull=False, longitude__isnull=False)
+        .only('id', 'latitude', 'longitude')
+        .iterator(chunk_size=1000)
+    )
+    for evento in eventos:
+        if coordenada_valida(evento.latitude, evento.longitude):
+            evento.geohash = codificar(evento.latitude, evento.longitude)
+            lote.append(evento)
+        if len(lote) >= 1000:
+            Evento.objects.bulk_update(lote, ['geohash'])
+            lote = []
+    if lote:
+        Evento.objects.bulk_update(lote, ['geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0005_evento_busca'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='geohash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=9),
+        ),
+        migrations.AddIndex(
+            model_name='evento',
+            index=models.Index(fields=['status', 'geohash'], name='evento_status_geohash_idx'),
+        ),
+        migrations.RunPython(preencher_geohash, migrations.RunPython.noop),
+    ]
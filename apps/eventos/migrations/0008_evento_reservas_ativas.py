@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0007_evento_variantes_imagem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='reservas_ativas',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+    ]
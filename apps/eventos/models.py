@@ -1,9 +1,22 @@
 from django.db import models
+from django.db.models import F
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
 import uuid
 from decimal import Decimal
 
-class Evento(models.Model):
+from apps.tracking import RastreiaCampos
+from . import geo
+
+
+class EventoLotado(Exception):
+    """Não há vaga disponível no evento para confirmar a inscrição."""
+
+    def __init__(self, mensagem='Este evento está lotado.'):
+        super().__init__(mensagem)
+
+
+class Evento(RastreiaCampos, models.Model):
     CATEGORIA_CHOICES = [
     ('Workshop', 'Workshop'),
     ('Palestra', 'Palestra'),
@@ -19,6 +32,9 @@ class Evento(models.Model):
         ('cancelado', 'Cancelado'),
     ]
 
+    # Atualizados apenas por UPDATEs dedicados, nunca pelo save() da instância
+    CAMPOS_MANTIDOS_PELO_BANCO = ('inscritos_confirmados', 'reservas_ativas', 'busca_vetor', 'variantes_imagem')
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     titulo = models.CharField(max_length=200)
     descricao = models.TextField()
@@ -54,29 +70,112 @@ class Evento(models.Model):
 
     foto_capa = models.ImageField(upload_to='eventos/capas/', blank=True, null=True)
     qr_code_pix = models.ImageField(upload_to='eventos/qrcodes_pix/', blank=True, null=True)
+    # Versões redimensionadas da capa, geradas em segundo plano (ver apps/images.py)
+    variantes_imagem = models.JSONField(default=dict, blank=True, editable=False)
 
     latitude = models.FloatField(blank=True, null=True)
     longitude = models.FloatField(blank=True, null=True)
+    # Derivado de latitude/longitude no save(); indexado para a busca por proximidade
+    geohash = models.CharField(max_length=geo.PRECISAO_MAXIMA, blank=True, default='', editable=False)
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='rascunho')
 
+    # Mantido pelas transições de Inscricao (ver Inscricao.save); nunca
+    # é gravado a partir de uma instância carregada em memória.
+    inscritos_confirmados = models.IntegerField(default=0, editable=False)
+    # Vagas seguradas por inscrições pendentes de pagamento (Inscricao.reserva_expira_em)
+    reservas_ativas = models.IntegerField(default=0, editable=False)
+
+    # Índice de busca textual no PostgreSQL (ver apps/eventos/search.py);
+    # fica vazio no SQLite, que usa uma tabela FTS5 própria.
+    busca_vetor = SearchVectorField(null=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-data_evento']
         db_table = 'api_evento'
+        indexes = [
+            # Catálogo público: status + ordem de paginação (e filtro por categoria)
+            models.Index(fields=['status', '-data_evento', '-id'], name='evento_status_data_idx'),
+            models.Index(fields=['status', 'categoria', '-data_evento', '-id'], name='evento_status_cat_data_idx'),
+            models.Index(fields=['organizador', '-created_at', '-id'], name='evento_org_criado_idx'),
+            # Busca por proximidade: intervalos de prefixo de geohash
+            models.Index(fields=['status', 'geohash'], name='evento_status_geohash_idx'),
+        ]
 
     def __str__(self):
         return f"{self.titulo} - {self.data_evento.strftime('%d/%m/%Y')}"
 
+    def save(self, *args, **kwargs):
+        self.geohash = (
+            geo.codificar(self.latitude, self.longitude)
+            if geo.coordenada_valida(self.latitude, self.longitude) else ''
+        )
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+
+        # Um save() com a instância desatualizada sobrescreveria o contador
+        # incrementado por outras requisições no meio do caminho (e o vetor
+        # de busca e as variantes da capa, gravados depois do save).
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.CAMPOS_MANTIDOS_PELO_BANCO
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def ajustar_inscritos_confirmados(cls, evento_id, delta):
+        """Aplica delta ao contador de confirmadas com um UPDATE atômico."""
+        if delta:
+            cls.objects.filter(pk=evento_id).update(
+                inscritos_confirmados=F('inscritos_confirmados') + delta
+            )
+
+    @classmethod
+    def ajustar_reservas_ativas(cls, evento_id, delta):
+        """Aplica delta ao contador de reservas com um UPDATE atômico."""
+        if delta:
+            cls.objects.filter(pk=evento_id).update(
+                reservas_ativas=F('reservas_ativas') + delta
+            )
+
+    @classmethod
+    def reservar_vaga(cls, evento_id, reserva=False):
+        """
+        Ocupa uma vaga com um UPDATE condicional: o incremento só acontece
+        se ainda houver vaga, de forma atômica no banco, sem janela entre a
+        verificação e a gravação. Levanta EventoLotado se não houver vaga.
+
+        Com reserva=True a vaga fica apenas segurada (reservas_ativas) até
+        o pagamento ser aprovado ou a reserva expirar.
+        """
+        campo = 'reservas_ativas' if reserva else 'inscritos_confirmados'
+        reservadas = cls.objects.filter(
+            pk=evento_id,
+            capacidade_maxima__gt=F('inscritos_confirmados') + F('reservas_ativas'),
+        ).update(**{campo: F(campo) + 1})
+        if not reservadas:
+            raise EventoLotado()
+
+    @classmethod
+    def confirmar_reserva(cls, evento_id):
+        """Converte uma vaga segurada em confirmada (a vaga já era dela)."""
+        cls.objects.filter(pk=evento_id).update(
+            reservas_ativas=F('reservas_ativas') - 1,
+            inscritos_confirmados=F('inscritos_confirmados') + 1,
+        )
+
     @property
     def inscritos_count(self):
-        return self.inscricoes.filter(status='confirmada').count()
+        return self.inscritos_confirmados
 
     @property
     def vagas_disponiveis(self):
-        return self.capacidade_maxima - self.inscritos_count
+        return self.capacidade_maxima - self.inscritos_count - self.reservas_ativas
 
     @property
     def esta_lotado(self):
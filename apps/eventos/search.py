@@ -0,0 +1,143 @@
+"""
+Índice de busca textual dos eventos.
+
+- PostgreSQL: coluna tsvector (Evento.busca_vetor) com pesos por campo e
+  índice GIN, mais um índice de trigramas em `titulo` usado como fallback
+  tolerante a erros de digitação.
+- SQLite: tabela virtual FTS5 (api_evento_busca) com remoção de acentos,
+  ranqueada por bm25.
+
+Os dois backends indexam texto sem acentos e em minúsculas, e o índice é
+mantido pelos receivers de apps/eventos/signals.py.
+"""
+import re
+import unicodedata
+import uuid
+
+from django.db import connection
+from django.db.models import F, Func, TextField
+
+CAMPOS = ('titulo', 'descricao', 'itens_incluidos', 'endereco', 'categoria')
+
+# Relevância de cada campo no ranqueamento (PostgreSQL usa as letras A-D,
+# o bm25 do FTS5 usa os pesos numéricos na ordem das colunas).
+PESOS_POSTGRES = {'titulo': 'A', 'categoria': 'B', 'itens_incluidos': 'C', 'endereco': 'C', 'descricao': 'D'}
+PESOS_FTS5 = {'titulo': 10.0, 'descricao': 1.0, 'itens_incluidos': 2.0, 'endereco': 3.0, 'categoria': 5.0}
+
+TABELA_FTS = 'api_evento_busca'
+MAX_TERMOS = 10
+
+
+def normalizar(texto):
+    """Remove acentos e converte para minúsculas."""
+    decomposto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in decomposto if not unicodedata.combining(c)).lower()
+
+
+def extrair_termos(consulta):
+    return re.findall(r'\w+', normalizar(consulta))[:MAX_TERMOS]
+
+
+def indexar_evento(evento):
+    if connection.vendor == 'postgresql':
+        type(evento).objects.filter(pk=evento.pk).update(busca_vetor=_vetor_postgres())
+    elif connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABELA_FTS} WHERE evento_id = %s', [evento.pk.hex])
+            cursor.execute(
+                f'INSERT INTO {TABELA_FTS} (evento_id, {", ".join(CAMPOS)}) VALUES (%s, %s, %s, %s, %s, %s)',
+                [evento.pk.hex] + [getattr(evento, campo) or '' for campo in CAMPOS],
+            )
+
+
+def remover_evento(evento_id):
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABELA_FTS} WHERE evento_id = %s', [evento_id.hex])
+
+
+def reindexar_todos():
+    from .models import Evento
+
+    if connection.vendor == 'postgresql':
+        Evento.objects.update(busca_vetor=_vetor_postgres())
+    elif connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABELA_FTS}')
+            cursor.execute(
+                f'INSERT INTO {TABELA_FTS} (evento_id, {", ".join(CAMPOS)}) '
+                f'SELECT id, {", ".join(CAMPOS)} FROM {Evento._meta.db_table}'
+            )
+
+
+def buscar_eventos(consulta, queryset, limite=20):
+    """
+    Retorna até `limite` eventos de `queryset` que casam com `consulta`,
+    do mais para o menos relevante. Cada termo casa por prefixo.
+    """
+    termos = extrair_termos(consulta)
+    if not termos:
+        return []
+
+    if connection.vendor == 'postgresql':
+        return _buscar_postgres(termos, consulta, queryset, limite)
+    if connection.vendor == 'sqlite':
+        return _buscar_sqlite(termos, queryset, limite)
+
+    # Outros bancos: busca simples sem índice
+    resultado = queryset
+    for termo in termos:
+        resultado = resultado.filter(titulo__icontains=termo)
+    return list(resultado[:limite])
+
+
+def _vetor_postgres():
+    from django.contrib.postgres.search import SearchVector
+
+    vetor = None
+    for campo in CAMPOS:
+        parte = SearchVector(
+            Func(F(campo), function='unaccent', output_field=TextField()),
+            config='simple',
+            weight=PESOS_POSTGRES[campo],
+        )
+        vetor = parte if vetor is None else vetor + parte
+    return vetor
+
+
+def _buscar_postgres(termos, consulta, queryset, limite):
+    from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+
+    query = SearchQuery(' & '.join(f'{termo}:*' for termo in termos), config='simple', search_type='raw')
+    resultados = list(
+        queryset.filter(busca_vetor=query)
+        .annotate(relevancia=SearchRank(F('busca_vetor'), query))
+        .order_by('-relevancia', '-data_evento')[:limite]
+    )
+    if resultados:
+        return resultados
+
+    # Nenhum termo casou: tenta similaridade de trigramas no título (erros de digitação)
+    return list(
+        queryset.filter(titulo__trigram_similar=consulta)
+        .annotate(relevancia=TrigramSimilarity('titulo', consulta))
+        .order_by('-relevancia', '-data_evento')[:limite]
+    )
+
+
+def _buscar_sqlite(termos, queryset, limite):
+    expressao = ' '.join(f'"{termo}"*' for termo in termos)
+    pesos = ', '.join(str(PESOS_FTS5[campo]) for campo in CAMPOS)
+    subquery, params = queryset.order_by().values('id').query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT evento_id FROM {TABELA_FTS} '
+            f'WHERE {TABELA_FTS} MATCH %s AND evento_id IN ({subquery}) '
+            f'ORDER BY bm25({TABELA_FTS}, 0.0, {pesos}) LIMIT %s',
+            [expressao, *params, limite],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+
+    eventos = queryset.in_bulk(ids)
+    return [eventos[pk] for pk in map(uuid.UUID, ids) if pk in eventos]
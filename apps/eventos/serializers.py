@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from apps.images import representar_variantes
 from .models import Evento
 
 class EventoSerializer(serializers.ModelSerializer):
@@ -12,6 +14,7 @@ class EventoSerializer(serializers.ModelSerializer):
 
     foto_capa = serializers.ImageField(use_url=True, required=False)
     qr_code_pix = serializers.ImageField(use_url=True, required=False)
+    foto_capa_variantes = serializers.SerializerMethodField()
     latitude = serializers.FloatField(required=False, allow_null=True)
     longitude = serializers.FloatField(required=False, allow_null=True)
 
@@ -30,6 +33,7 @@ class EventoSerializer(serializers.ModelSerializer):
             'permite_transferencia',
             'politica_cancelamento',
             'foto_capa',
+            'foto_capa_variantes',
             'qr_code_pix',
             'status',
             'created_at',
@@ -49,6 +53,11 @@ class EventoSerializer(serializers.ModelSerializer):
             'organizador_nome', 'organizador_username', 'organizador_score'
         ]
 
+    def get_foto_capa_variantes(self, obj):
+        return representar_variantes(
+            obj.variantes_imagem, 'foto_capa', obj.foto_capa.storage, self.context.get('request')
+        )
+
     def create(self, validated_data):
         evento = Evento.objects.create(**validated_data)
         return evento
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps import images
+from . import search
+from .models import Evento
+
+
+@receiver(post_save, sender=Evento)
+def atualizar_indice_busca(sender, instance, update_fields=None, **kwargs):
+    """Reindexa o evento quando algum campo pesquisável pode ter mudado."""
+    if update_fields is not None and not set(update_fields) & set(search.CAMPOS):
+        return
+    search.indexar_evento(instance)
+
+
+@receiver(post_save, sender=Evento)
+def gerar_variantes_capa(sender, instance, raw=False, **kwargs):
+    """Agenda as variantes da capa quando o arquivo enviado muda."""
+    if not raw and images.variantes_desatualizadas(instance, 'foto_capa'):
+        images.agendar_variantes(instance, 'foto_capa')
+
+
+@receiver(post_delete, sender=Evento)
+def remover_do_indice_busca(sender, instance, **kwargs):
+    search.remover_evento(instance.pk)
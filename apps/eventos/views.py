@@ -3,12 +3,36 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.exceptions import ValidationError
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
 
+from apps.pagination import KeysetPagination
+from . import geo, search
 from .models import Evento
 from .serializers import EventoSerializer
 
 
+def _parse_data_filtro(valor, nome):
+    """
+    Converte o filtro de data da query string em (datetime, somente_data).
+    Mantém a comparação direta em data_evento para que o índice seja usado.
+    """
+    data = parse_date(valor)
+    if data is not None:
+        data_hora, somente_data = datetime.combine(data, time.min), True
+    else:
+        data_hora, somente_data = parse_datetime(valor), False
+        if data_hora is None:
+            raise ValidationError({nome: 'Data inválida. Use AAAA-MM-DD ou ISO 8601.'})
+    if timezone.is_naive(data_hora):
+        data_hora = timezone.make_aware(data_hora)
+    return data_hora, somente_data
+
+
 class EventoCreateView(generics.CreateAPIView):
     queryset = Evento.objects.all()
     serializer_class = EventoSerializer
@@ -22,9 +46,138 @@ class EventoCreateView(generics.CreateAPIView):
 
 
 class EventoListView(generics.ListAPIView):
-    queryset = Evento.objects.filter(status='publicado')
+    """
+    Lista os eventos publicados.
+    Query params:
+    - categoria: filtra pela categoria
+    - data_inicio / data_fim: intervalo de data_evento (AAAA-MM-DD ou ISO 8601)
+    - cursor / page_size: ativam a paginação por cursor
+    """
     serializer_class = EventoSerializer
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-data_evento', '-id')
+
+    def get_queryset(self):
+        queryset = Evento.objects.filter(status='publicado').select_related('organizador')
+        params = self.request.query_params
+
+        categoria = params.get('categoria')
+        if categoria:
+            queryset = queryset.filter(categoria=categoria)
+
+        data_inicio = params.get('data_inicio')
+        if data_inicio:
+            inicio, _ = _parse_data_filtro(data_inicio, 'data_inicio')
+            queryset = queryset.filter(data_evento__gte=inicio)
+
+        data_fim = params.get('data_fim')
+        if data_fim:
+            fim, somente_data = _parse_data_filtro(data_fim, 'data_fim')
+            if somente_data:
+                # Data sem hora inclui o dia inteiro
+                queryset = queryset.filter(data_evento__lt=fim + timedelta(days=1))
+            else:
+                queryset = queryset.filter(data_evento__lte=fim)
+
+        return queryset
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def busca_eventos(request):
+    """
+    Busca textual nos eventos publicados, ordenada por relevância.
+    Query params:
+    - q: termos da busca (mínimo 2 caracteres; casa por prefixo e ignora acentos)
+    - categoria: filtra pela categoria
+    - limite: quantidade máxima de resultados (padrão 20, máximo 50)
+    """
+    consulta = request.query_params.get('q', '').strip()
+    if len(consulta) < 2:
+        return Response(
+            {'error': 'Informe ao menos 2 caracteres em q'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        limite = min(max(int(request.query_params.get('limite', 20)), 1), 50)
+    except ValueError:
+        limite = 20
+
+    queryset = Evento.objects.filter(status='publicado').select_related('organizador')
+    categoria = request.query_params.get('categoria')
+    if categoria:
+        queryset = queryset.filter(categoria=categoria)
+
+    eventos = search.buscar_eventos(consulta, queryset, limite=limite)
+    serializer = EventoSerializer(eventos, many=True, context={'request': request})
+    return Response(serializer.data)
+
+
+def _parse_float(valor, nome, minimo, maximo):
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        raise ValidationError({nome: 'Informe um número.'})
+    if not minimo <= numero <= maximo:
+        raise ValidationError({nome: f'Deve estar entre {minimo} e {maximo}.'})
+    return numero
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def eventos_perto_de_mim(request):
+    """
+    Eventos publicados dentro de um raio, do mais próximo ao mais distante.
+    Query params:
+    - lat / lng: ponto de referência
+    - raio: raio em km (padrão 10, máximo 500)
+    - categoria: filtra pela categoria
+    - limite: quantidade máxima de resultados (padrão 50, máximo 100)
+    """
+    params = request.query_params
+    lat = _parse_float(params.get('lat'), 'lat', -90, 90)
+    lng = _parse_float(params.get('lng'), 'lng', -180, 180)
+    raio = _parse_float(params.get('raio', 10), 'raio', 0.01, 500)
+    try:
+        limite = min(max(int(params.get('limite', 50)), 1), 100)
+    except ValueError:
+        limite = 50
+
+    # Poda pelo índice (status, geohash): um intervalo por célula vizinha
+    celulas = Q()
+    for prefixo in geo.prefixos_vizinhanca(lat, lng, raio):
+        celula = Q(geohash__gte=prefixo)
+        fim = geo.fim_prefixo(prefixo)
+        if fim is not None:
+            celula &= Q(geohash__lt=fim)
+        celulas |= celula
+
+    queryset = Evento.objects.filter(celulas, status='publicado').exclude(geohash='')
+    categoria = params.get('categoria')
+    if categoria:
+        queryset = queryset.filter(categoria=categoria)
+
+    candidatos = queryset.values_list('id', 'latitude', 'longitude')
+    distancias = {}
+    for evento_id, evento_lat, evento_lng in candidatos:
+        distancia = geo.distancia_km(lat, lng, evento_lat, evento_lng)
+        if distancia <= raio:
+            distancias[evento_id] = distancia
+
+    mais_proximos = sorted(distancias, key=distancias.get)[:limite]
+    eventos = Evento.objects.select_related('organizador').in_bulk(mais_proximos)
+
+    serializer = EventoSerializer(
+        [eventos[evento_id] for evento_id in mais_proximos],
+        many=True,
+        context={'request': request}
+    )
+    data = serializer.data
+    for item, evento_id in zip(data, mais_proximos):
+        item['distancia_km'] = round(distancias[evento_id], 2)
+    return Response(data)
 
 
 class EventoDetailView(generics.RetrieveAPIView):
@@ -100,10 +253,12 @@ def evento_resumo_inscricao(request, evento_id):
 class ManageEventosView(generics.ListAPIView):
     serializer_class = EventoSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         user = self.request.user
-        return Evento.objects.filter(organizador=user).order_by('-created_at')
+        return Evento.objects.filter(organizador=user).select_related('organizador').order_by('-created_at')
 
 
 class EventoRetrieveUpdateView(generics.RetrieveUpdateAPIView):
@@ -11,7 +11,7 @@ from apps.eventos.models import Evento
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def list_favorites(request):
-    favorites = Favorite.objects.filter(user=request.user)
+    favorites = Favorite.objects.filter(user=request.user).select_related('evento__organizador')
     serializer = FavoriteSerializer(favorites, many=True, context={'request': request})
     return Response(serializer.data)
 
@@ -0,0 +1,191 @@
+"""
+Variantes redimensionadas das imagens enviadas (capas de evento e fotos de
+perfil).
+
+Para cada imagem são geradas as larguras de VARIANTES em WebP e JPEG, com a
+orientação do EXIF aplicada e os metadados removidos. Os arquivos ficam ao
+lado do original (`capa.jpg` -> `capa__card.webp`) e o resultado é guardado
+no campo JSON `variantes_imagem` do modelo, indexado pelo nome do campo:
+
+    {'foto_capa': {'origem': 'eventos/capas/capa.jpg',
+                   'thumb': {'largura': 160, 'altura': 90,
+                             'webp': 'eventos/capas/capa__thumb.webp',
+                             'jpeg': 'eventos/capas/capa__thumb.jpg'}, ...}}
+
+A geração roda em segundo plano (ver apps/background.py), disparada pelos
+receivers de post_save quando o arquivo do campo muda.
+"""
+import logging
+import os
+from io import BytesIO
+
+from django.apps import apps as django_apps
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from apps import background
+
+logger = logging.getLogger(__name__)
+
+# Largura máxima de cada variante (nunca amplia a imagem original)
+VARIANTES = {
+    'thumb': 160,
+    'card': 480,
+    'hero': 1280,
+}
+
+QUALIDADE_WEBP = 80
+QUALIDADE_JPEG = 82
+
+
+def variantes_desatualizadas(instancia, campo):
+    """True quando o arquivo atual do campo ainda não tem variantes geradas."""
+    arquivo = getattr(instancia, campo)
+    atuais = (instancia.variantes_imagem or {}).get(campo)
+    if not arquivo:
+        return bool(atuais)
+    return not atuais or atuais.get('origem') != arquivo.name
+
+
+def agendar_variantes(instancia, campo):
+    """Agenda a geração das variantes de `campo` para depois do commit."""
+    background.executar_apos_commit(
+        processar_variantes, instancia._meta.label, instancia.pk, campo
+    )
+
+
+def processar_variantes(label_modelo, pk, campo, sobrescrever=False):
+    """Gera as variantes do arquivo atual de `campo` e grava no registro."""
+    modelo = django_apps.get_model(label_modelo)
+    instancia = modelo.objects.filter(pk=pk).only(campo, 'variantes_imagem').first()
+    if instancia is None:
+        return
+    if not sobrescrever and not variantes_desatualizadas(instancia, campo):
+        return
+
+    arquivo = getattr(instancia, campo)
+    variantes = dict(instancia.variantes_imagem or {})
+    if arquivo:
+        try:
+            variantes[campo] = gerar_variantes(arquivo, sobrescrever=sobrescrever)
+        except (OSError, Image.DecompressionBombError):
+            logger.warning('Não foi possível gerar variantes de %s', arquivo.name, exc_info=True)
+            return
+    else:
+        variantes.pop(campo, None)
+
+    # Grava só se o arquivo não mudou enquanto as variantes eram geradas
+    mesmo_arquivo = {campo: arquivo.name} if arquivo else {}
+    modelo.objects.filter(pk=pk, **mesmo_arquivo).update(variantes_imagem=variantes)
+
+
+def gerar_variantes(arquivo, sobrescrever=False):
+    """
+    Cria as variantes de um FieldFile no mesmo storage e retorna o dicionário
+    descrito no topo do módulo. Variantes já existentes são reaproveitadas,
+    a menos que `sobrescrever` seja True.
+    """
+    storage = arquivo.storage
+    base, _ = os.path.splitext(arquivo.name)
+    resultado = {'origem': arquivo.name}
+
+    imagem = None
+    try:
+        for nome, largura_maxima in VARIANTES.items():
+            caminhos = {
+                'webp': f'{base}__{nome}.webp',
+                'jpeg': f'{base}__{nome}.jpg',
+            }
+            existentes = not sobrescrever and all(storage.exists(c) for c in caminhos.values())
+            if imagem is None and not existentes:
+                imagem = _abrir(arquivo)
+
+            if imagem is not None:
+                redimensionada = _redimensionar(imagem, largura_maxima)
+                _salvar(storage, caminhos['webp'], redimensionada, 'WEBP')
+                _salvar(storage, caminhos['jpeg'], redimensionada, 'JPEG')
+                largura, altura = redimensionada.size
+            else:
+                with storage.open(caminhos['jpeg']) as existente:
+                    largura, altura = Image.open(existente).size
+
+            resultado[nome] = {'largura': largura, 'altura': altura, **caminhos}
+    finally:
+        if imagem is not None:
+            imagem.close()
+
+    return resultado
+
+
+def representar_variantes(variantes, campo, storage, request=None):
+    """
+    Formato exposto pelos serializers: URL de cada variante e um `srcset`
+    pronto por formato. Retorna None enquanto as variantes não existem.
+    """
+    dados = (variantes or {}).get(campo)
+    if not dados:
+        return None
+
+    def url(caminho):
+        endereco = storage.url(caminho)
+        return request.build_absolute_uri(endereco) if request else endereco
+
+    resultado = {}
+    srcset = {'webp': [], 'jpeg': []}
+    for nome in VARIANTES:
+        variante = dados.get(nome)
+        if not variante:
+            continue
+        resultado[nome] = {
+            'largura': variante['largura'],
+            'altura': variante['altura'],
+            'webp': url(variante['webp']),
+            'jpeg': url(variante['jpeg']),
+        }
+        for formato in srcset:
+            srcset[formato].append(f"{resultado[nome][formato]} {variante['largura']}w")
+
+    resultado['srcset'] = {formato: ', '.join(itens) for formato, itens in srcset.items()}
+    return resultado
+
+
+def _abrir(arquivo):
+    arquivo.open('rb')
+    try:
+        imagem = Image.open(arquivo)
+        imagem.load()
+    finally:
+        arquivo.close()
+    return ImageOps.exif_transpose(imagem)
+
+
+def _redimensionar(imagem, largura_maxima):
+    copia = imagem.copy()
+    if copia.width > largura_maxima:
+        altura = max(1, round(copia.height * largura_maxima / copia.width))
+        copia = copia.resize((largura_maxima, altura), Image.LANCZOS)
+    return copia
+
+
+def _salvar(storage, caminho, imagem, formato):
+    if formato == 'JPEG':
+        if imagem.mode in ('RGBA', 'LA', 'P'):
+            imagem = imagem.convert('RGBA')
+            fundo = Image.new('RGB', imagem.size, (255, 255, 255))
+            fundo.paste(imagem, mask=imagem.getchannel('A'))
+            imagem = fundo
+        elif imagem.mode != 'RGB':
+            imagem = imagem.convert('RGB')
+        opcoes = {'quality': QUALIDADE_JPEG, 'optimize': True, 'progressive': True}
+    else:
+        if imagem.mode not in ('RGB', 'RGBA'):
+            imagem = imagem.convert('RGBA' if 'A' in imagem.getbands() or imagem.mode == 'P' else 'RGB')
+        opcoes = {'quality': QUALIDADE_WEBP, 'method': 4}
+
+    # Sem o parâmetro exif o Pillow não copia os metadados da original
+    buffer = BytesIO()
+    imagem.save(buffer, formato, **opcoes)
+
+    if storage.exists(caminho):
+        storage.delete(caminho)
+    storage.save(caminho, ContentFile(buffer.getvalue()))
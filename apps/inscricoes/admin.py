@@ -3,7 +3,7 @@ from .models import Inscricao
 
 @admin.register(Inscricao)
 class InscricaoAdmin(admin.ModelAdmin):
-    list_display = ('nome_completo_inscricao', 'cpf_inscricao', 'evento', 'status', 'valor_final', 'metodo_pagamento', 'checkin_realizado', 'created_at')
+    list_display = ('nome_completo_inscricao', 'cpf_inscricao', 'evento', 'status', 'reserva_expira_em', 'valor_final', 'metodo_pagamento', 'checkin_realizado', 'created_at')
     list_filter = ('status', 'metodo_pagamento', 'status_pagamento', 'checkin_realizado', 'created_at')
     search_fields = ('nome_completo_inscricao', 'cpf_inscricao', 'telefone_inscricao', 'email_inscricao', 'evento__titulo')
     date_hierarchy = 'created_at'
@@ -6,3 +6,6 @@ class InscricoesConfig(AppConfig):
     name = 'apps.inscricoes'
     label = 'inscricoes'
 
+    def ready(self):
+        # Conecta os receivers que mantêm o contador de vagas do evento
+        from . import signals  # noqa: F401
@@ -0,0 +1,110 @@
+"""
+Renderização dos certificados de participação.
+
+Este módulo não importa Django: roda nos processos do pool de
+certificados.py, que recebem só dicionários com os textos já prontos. O
+modelo (página, fontes e a moldura fixa, montada como um Drawing do
+ReportLab) é construído uma vez por processo em `iniciar` e reaproveitado
+em todos os documentos; cada certificado só desenha os textos variáveis.
+
+    dados = {
+        'nome': 'Maria Silva', 'evento': 'Workshop de Django',
+        'data': '18/10/2026', 'local': 'Rua X, Sala 2',
+        'organizador': 'Backstage', 'codigo': '6f1c...',
+    }
+"""
+from io import BytesIO
+
+_modelo = None
+
+
+class Modelo:
+    AZUL = '#1E3A8A'
+    CINZA = '#4B5563'
+    DOURADO = '#D4A017'
+
+    def __init__(self):
+        from reportlab.graphics.shapes import Drawing, Line, Rect
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.pdfbase import pdfmetrics
+
+        self.tamanho = landscape(A4)
+        largura, altura = self.tamanho
+
+        # Métricas das fontes carregadas uma vez por processo
+        for fonte in ('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique'):
+            pdfmetrics.getFont(fonte)
+        self.largura_texto = pdfmetrics.stringWidth
+
+        azul = colors.HexColor(self.AZUL)
+        dourado = colors.HexColor(self.DOURADO)
+        self.moldura = Drawing(largura, altura)
+        self.moldura.add(Rect(20, 20, largura - 40, altura - 40, strokeColor=azul, strokeWidth=4, fillColor=None))
+        self.moldura.add(Rect(30, 30, largura - 60, altura - 60, strokeColor=dourado, strokeWidth=1.5, fillColor=None))
+        self.moldura.add(Line(largura / 2 - 120, altura - 150, largura / 2 + 120, altura - 150, strokeColor=dourado, strokeWidth=2))
+        self.moldura.add(Line(largura / 2 - 150, 135, largura / 2 + 150, 135, strokeColor=colors.HexColor(self.CINZA), strokeWidth=0.75))
+        self.cores = {'azul': azul, 'cinza': colors.HexColor(self.CINZA)}
+
+    def desenhar(self, canvas, dados):
+        from reportlab.graphics import renderPDF
+
+        largura, altura = self.tamanho
+        renderPDF.draw(self.moldura, canvas, 0, 0)
+
+        canvas.setFillColor(self.cores['azul'])
+        canvas.setFont('Helvetica-Bold', 34)
+        canvas.drawCentredString(largura / 2, altura - 130, 'CERTIFICADO DE PARTICIPAÇÃO')
+
+        canvas.setFillColor(self.cores['cinza'])
+        canvas.setFont('Helvetica', 16)
+        canvas.drawCentredString(largura / 2, altura - 210, 'Certificamos que')
+
+        canvas.setFillColor(self.cores['azul'])
+        canvas.setFont('Helvetica-Bold', self._tamanho_que_cabe(dados['nome'], 'Helvetica-Bold', 30, largura - 160))
+        canvas.drawCentredString(largura / 2, altura - 255, dados['nome'])
+
+        canvas.setFillColor(self.cores['cinza'])
+        canvas.setFont('Helvetica', 16)
+        canvas.drawCentredString(largura / 2, altura - 300, 'participou do evento')
+
+        canvas.setFillColor(self.cores['azul'])
+        canvas.setFont('Helvetica-Bold', self._tamanho_que_cabe(dados['evento'], 'Helvetica-Bold', 22, largura - 160))
+        canvas.drawCentredString(largura / 2, altura - 335, dados['evento'])
+
+        canvas.setFillColor(self.cores['cinza'])
+        canvas.setFont('Helvetica', 13)
+        local = f" em {dados['local']}" if dados.get('local') else ''
+        canvas.drawCentredString(largura / 2, altura - 365, f"realizado em {dados['data']}{local}.")
+
+        canvas.setFont('Helvetica', 12)
+        canvas.drawCentredString(largura / 2, 118, dados['organizador'])
+        canvas.setFont('Helvetica-Oblique', 9)
+        canvas.drawCentredString(largura / 2, 50, f"Código de verificação: {dados['codigo']}")
+
+    def _tamanho_que_cabe(self, texto, fonte, tamanho, largura_maxima):
+        while tamanho > 10 and self.largura_texto(texto, fonte, tamanho) > largura_maxima:
+            tamanho -= 1
+        return tamanho
+
+
+def iniciar():
+    """Monta o modelo do processo (initializer do pool)."""
+    global _modelo
+    if _modelo is None:
+        _modelo = Modelo()
+    return _modelo
+
+
+def renderizar(dados):
+    """Retorna os bytes do PDF do certificado."""
+    from reportlab.pdfgen.canvas import Canvas
+
+    modelo = iniciar()
+    buffer = BytesIO()
+    canvas = Canvas(buffer, pagesize=modelo.tamanho, pageCompression=1)
+    canvas.setTitle(f"Certificado - {dados['evento']}")
+    modelo.desenhar(canvas, dados)
+    canvas.showPage()
+    canvas.save()
+    return buffer.getvalue()
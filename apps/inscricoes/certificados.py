@@ -0,0 +1,196 @@
+"""
+Certificados de participação de quem fez check-in.
+
+O PDF é desenhado por certificado_pdf.py, que não depende de Django. Para
+um evento inteiro (`resposta_zip`), os certificados são renderizados num
+pool de processos e gravados num ZIP à medida que ficam prontos: cada
+arquivo é enviado ao cliente assim que entra no ZIP, e no máximo
+POR_PROCESSO documentos por processo ficam em andamento, então a memória
+não cresce com o número de participantes.
+
+Cada exportação ocupa um pool inteiro, então cada processo do servidor
+aceita no máximo settings.CERTIFICADOS_EXPORTACOES_SIMULTANEAS ao mesmo
+tempo; com todas as vagas ocupadas, `resposta_zip` retorna None e a view
+responde 503. A vaga é devolvida quando a resposta termina ou é fechada
+(cliente desconectado), e então os documentos ainda não iniciados são
+descartados.
+
+O certificado de uma inscrição (`renderizar`) é desenhado no próprio
+processo da requisição.
+"""
+import multiprocessing
+import os
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.text import slugify
+
+from . import certificado_pdf
+from .models import Inscricao
+
+# Documentos enviados ao pool por processo antes de esperar o mais antigo
+POR_PROCESSO = 4
+TAMANHO_LOTE = 500
+
+_exportacoes = threading.BoundedSemaphore(getattr(settings, 'CERTIFICADOS_EXPORTACOES_SIMULTANEAS', 1))
+
+
+def presentes(evento):
+    return Inscricao.objects.filter(evento=evento, checkin_realizado=True)
+
+
+def dados(inscricao, evento):
+    """Textos do certificado; `inscricao` é um dict de `values()`."""
+    organizador = evento.organizador
+    local = evento.endereco
+    if evento.local_especifico:
+        local = f'{local}, {evento.local_especifico}'
+    return {
+        'nome': inscricao['nome_completo_inscricao'],
+        'evento': evento.titulo,
+        'data': timezone.localtime(evento.data_evento).strftime('%d/%m/%Y'),
+        'local': local,
+        'organizador': organizador.get_full_name() or organizador.username,
+        'codigo': str(inscricao['id']),
+    }
+
+
+def nome_arquivo(dados_certificado):
+    return f"certificado_{slugify(dados_certificado['nome']) or 'participante'}_{dados_certificado['codigo'][:8]}.pdf"
+
+
+def renderizar(inscricao):
+    valores = {'id': inscricao.id, 'nome_completo_inscricao': inscricao.nome_completo_inscricao}
+    return certificado_pdf.renderizar(dados(valores, inscricao.evento))
+
+
+def renderizar_em_paralelo(itens, processos=None):
+    """
+    Renderiza os certificados de `itens` (dicts de `dados`) num pool de
+    processos e gera (dados, pdf) na mesma ordem.
+    """
+    processos = processos or getattr(settings, 'CERTIFICADOS_PROCESSOS', None) or os.cpu_count() or 1
+    # spawn: os processos não herdam conexões, threads nem locks do servidor
+    pool = ProcessPoolExecutor(
+        max_workers=processos,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=certificado_pdf.iniciar,
+    )
+    em_andamento = deque()
+    try:
+        for item in itens:
+            em_andamento.append((item, pool.submit(certificado_pdf.renderizar, item)))
+            if len(em_andamento) >= processos * POR_PROCESSO:
+                item, futuro = em_andamento.popleft()
+                yield item, futuro.result()
+        while em_andamento:
+            item, futuro = em_andamento.popleft()
+            yield item, futuro.result()
+    finally:
+        # Cliente desconectado ou erro: descarta o que ainda não começou
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def partes_zip(evento):
+    """Gera os bytes do ZIP com os certificados do evento, arquivo a arquivo."""
+    saida = _Saida()
+    inscricoes = (
+        presentes(evento)
+        .values('id', 'nome_completo_inscricao')
+        .order_by('nome_completo_inscricao', 'id')
+        .iterator(chunk_size=TAMANHO_LOTE)
+    )
+    itens = (dados(inscricao, evento) for inscricao in inscricoes)
+    # PDFs já são comprimidos: ZIP_STORED evita gastar CPU à toa
+    with zipfile.ZipFile(saida, 'w', zipfile.ZIP_STORED) as arquivo_zip:
+        # closing: o pool é desligado assim que este gerador é fechado
+        with closing(renderizar_em_paralelo(itens)) as renderizados:
+            for item, pdf in renderizados:
+                arquivo_zip.writestr(nome_arquivo(item), pdf)
+                yield saida.esvaziar()
+    yield saida.esvaziar()
+
+
+def resposta_zip(request, evento):
+    """Resposta com o ZIP do evento, ou None se não houver vaga para mais uma exportação."""
+    if not _exportacoes.acquire(blocking=False):
+        return None
+    partes = _Exportacao(partes_zip(evento))
+    if isinstance(request, ASGIRequest):
+        # Com um iterador síncrono o Django juntaria tudo antes de enviar
+        partes = _assincrono(partes)
+    resposta = StreamingHttpResponse(partes, content_type='application/zip')
+    resposta['Content-Disposition'] = f'attachment; filename="certificados_{slugify(evento.titulo) or evento.pk}.zip"'
+    return resposta
+
+
+async def _assincrono(partes):
+    fim = object()
+    try:
+        while True:
+            parte = await sync_to_async(next)(partes, fim)
+            if parte is fim:
+                break
+            yield parte
+    finally:
+        # Cliente desconectado: fecha o gerador na thread que o consome, o
+        # que desliga o pool e devolve a vaga
+        await sync_to_async(partes.close)()
+
+
+class _Exportacao:
+    """Partes do ZIP de uma exportação; devolve a vaga ao terminar ou ser fechado."""
+
+    def __init__(self, partes):
+        self.partes = partes
+        self.fechada = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self.partes)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if self.fechada:
+            return
+        self.fechada = True
+        try:
+            self.partes.close()
+        finally:
+            _exportacoes.release()
+
+    def __del__(self):
+        # Resposta descartada sem ser lida nem fechada
+        self.close()
+
+
+class _Saida:
+    """Destino do ZipFile sem seek: acumula o que foi escrito até ser enviado."""
+
+    def __init__(self):
+        self.partes = []
+
+    def write(self, dados):
+        self.partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def esvaziar(self):
+        dados = b''.join(self.partes)
+        self.partes.clear()
+        return dados
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.inscricoes import reservas
+
+
+class Command(BaseCommand):
+    help = "Release expired seat holds of pending payments and offer the seats to the waitlist."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="How many holds to release per transaction (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        liberadas, oferecidas = reservas.liberar_reservas_expiradas(tamanho_lote=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Holds released: {liberadas} | seats offered to the waitlist: {oferecidas}"
+        ))
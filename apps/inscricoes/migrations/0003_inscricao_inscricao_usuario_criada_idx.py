@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0004_evento_evento_status_data_idx_and_more'),
+        ('inscricoes', '0002_inscricao_comprovante_pagamento_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inscricao',
+            index=models.Index(fields=['usuario', '-created_at', '-id'], name='inscricao_usuario_criada_idx'),
+        ),
+    ]
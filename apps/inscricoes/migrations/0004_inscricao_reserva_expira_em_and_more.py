@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0008_evento_reservas_ativas'),
+        ('inscricoes', '0003_inscricao_inscricao_usuario_criada_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inscricao',
+            name='reserva_expira_em',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Reserva expira em'),
+        ),
+        migrations.AddIndex(
+            model_name='inscricao',
+            index=models.Index(fields=['status', 'reserva_expira_em'], name='inscricao_reserva_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inscricoes', '0004_inscricao_reserva_expira_em_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inscricao',
+            name='checkin_dispositivo',
+            field=models.CharField(blank=True, default='', max_length=100, verbose_name='Dispositivo do Check-in'),
+        ),
+    ]
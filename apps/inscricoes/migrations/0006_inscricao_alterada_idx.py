@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inscricoes', '0005_inscricao_checkin_dispositivo'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inscricao',
+            index=models.Index(fields=['updated_at'], name='inscricao_alterada_idx'),
+        ),
+    ]
@@ -1,8 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 import uuid
 
-class Inscricao(models.Model):
+from apps.tracking import RastreiaCampos
+
+
+class Inscricao(RastreiaCampos, models.Model):
     STATUS_CHOICES = [
         ('pendente', 'Pendente'),
         ('confirmada', 'Confirmada'),
@@ -11,6 +14,9 @@ class Inscricao(models.Model):
         ('lista_espera', 'Lista de Espera'),
     ]
 
+    # Valores guardados na leitura para detectar mudanças de vaga e de status
+    CAMPOS_RASTREADOS = ('status', 'evento_id', 'reserva_expira_em')
+
     METODO_PAGAMENTO_CHOICES = [
         ('cartao_credito', 'Cartão de Crédito'),
         ('cartao_debito', 'Cartão de Débito'),
@@ -50,6 +56,10 @@ class Inscricao(models.Model):
 
     metodo_pagamento = models.CharField(max_length=20, choices=METODO_PAGAMENTO_CHOICES)
     status_pagamento = models.CharField(max_length=20, choices=STATUS_PAGAMENTO_CHOICES, default='pendente')
+
+    # Enquanto preenchido (e a inscrição está pendente), a inscrição segura
+    # uma vaga do evento; o comando release_expired_holds libera as vencidas.
+    reserva_expira_em = models.DateTimeField(blank=True, null=True, verbose_name="Reserva expira em")
     
     # Campos para rastreamento de pagamento
     data_pagamento = models.DateTimeField(blank=True, null=True, verbose_name="Data do Pagamento")
@@ -59,6 +69,8 @@ class Inscricao(models.Model):
 
     checkin_realizado = models.BooleanField(default=False)
     data_checkin = models.DateTimeField(blank=True, null=True)
+    # Leitor que registrou o check-in na sincronização em lote (apps/checkin/sincronizacao.py)
+    checkin_dispositivo = models.CharField(max_length=100, blank=True, default='', verbose_name="Dispositivo do Check-in")
 
     qr_code = models.CharField(max_length=100, unique=True, blank=True, null=True)
 
@@ -71,16 +83,97 @@ class Inscricao(models.Model):
         unique_together = ['usuario', 'evento']
         ordering = ['-created_at']
         db_table = 'api_inscricao'
+        indexes = [
+            models.Index(fields=['usuario', '-created_at', '-id'], name='inscricao_usuario_criada_idx'),
+            models.Index(fields=['status', 'reserva_expira_em'], name='inscricao_reserva_idx'),
+            # Faixa de alterações lida a cada passada dos agregados de analytics
+            models.Index(fields=['updated_at'], name='inscricao_alterada_idx'),
+        ]
 
     def __str__(self):
         return f"{self.usuario.username} - {self.evento.titulo}"
 
+    @staticmethod
+    def ocupacao(status, reserva_expira_em):
+        """Como a inscrição ocupa o evento: 'confirmada', 'reserva' ou None."""
+        if status == 'confirmada':
+            return 'confirmada'
+        if status == 'pendente' and reserva_expira_em is not None:
+            return 'reserva'
+        return None
+
     def save(self, *args, **kwargs):
-        if not self.qr_code:
-            if not self.pk:
+        update_fields = kwargs.get('update_fields')
+
+        # A reserva só vale enquanto a inscrição está pendente
+        if self.status != 'pendente' and self.reserva_expira_em is not None:
+            self.reserva_expira_em = None
+            if update_fields is not None:
+                kwargs['update_fields'] = update_fields = {*update_fields, 'reserva_expira_em'}
+
+        campos_contador = {'status', 'evento', 'evento_id', 'reserva_expira_em'}
+        afeta_contador = update_fields is None or bool(campos_contador & set(update_fields))
+        # Lidos antes do save, que atualiza os valores rastreados
+        antes = self.ocupacao(self.valor_carregado('status'), self.valor_carregado('reserva_expira_em'))
+        evento_antes = self.valor_carregado('evento_id')
+        carregados = dict(self.__dict__.get('_valores_carregados', {}))
+
+        try:
+            with transaction.atomic():
+                if not self.qr_code:
+                    if not self.pk:
+                        super().save(*args, **kwargs)
+                    self.qr_code = f"BST-{str(self.id)[:8].upper()}-{uuid.uuid4().hex[:8].upper()}"
                 super().save(*args, **kwargs)
-            self.qr_code = f"BST-{str(self.id)[:8].upper()}-{uuid.uuid4().hex[:8].upper()}"
-        super().save(*args, **kwargs)
+                if afeta_contador:
+                    self._atualizar_contador_evento(antes, evento_antes)
+        except Exception:
+            # Nada foi gravado: a instância continua com os valores da leitura
+            self._valores_carregados = carregados
+            raise
+
+    def _atualizar_contador_evento(self, antes, evento_antes):
+        """
+        Mantém Evento.inscritos_confirmados e Evento.reservas_ativas quando a
+        inscrição passa a ocupar, muda ou deixa de ocupar uma vaga (ver
+        ocupacao()), inclusive ao trocar de evento. `antes` e `evento_antes`
+        são a ocupação e o evento da última leitura.
+
+        Ocupar uma vaga nova passa por Evento.reservar_vaga; se o evento
+        estiver lotado, EventoLotado desfaz o save inteiro. Uma reserva que
+        vira confirmada não disputa vaga: ela já era da inscrição.
+        """
+        from apps.eventos.models import Evento
+
+        depois = self.ocupacao(self.status, self.reserva_expira_em)
+        mesmo_evento = evento_antes == self.evento_id
+
+        if antes == depois and mesmo_evento:
+            return
+
+        if antes == 'reserva' and depois == 'confirmada' and mesmo_evento:
+            Evento.confirmar_reserva(self.evento_id)
+            self._ajustar_evento_em_memoria(self.evento_id, 'reservas_ativas', -1)
+            self._ajustar_evento_em_memoria(self.evento_id, 'inscritos_confirmados', 1)
+            return
+
+        if antes == 'confirmada':
+            Evento.ajustar_inscritos_confirmados(evento_antes, -1)
+            self._ajustar_evento_em_memoria(evento_antes, 'inscritos_confirmados', -1)
+        elif antes == 'reserva':
+            Evento.ajustar_reservas_ativas(evento_antes, -1)
+            self._ajustar_evento_em_memoria(evento_antes, 'reservas_ativas', -1)
+
+        if depois is not None:
+            Evento.reservar_vaga(self.evento_id, reserva=depois == 'reserva')
+            campo = 'reservas_ativas' if depois == 'reserva' else 'inscritos_confirmados'
+            self._ajustar_evento_em_memoria(self.evento_id, campo, 1)
+
+    def _ajustar_evento_em_memoria(self, evento_id, campo, delta):
+        # Mantém coerente a instância de Evento já carregada nesta requisição
+        evento = self._state.fields_cache.get('evento')
+        if evento is not None and evento.pk == evento_id:
+            setattr(evento, campo, getattr(evento, campo) + delta)
 
     def calcular_reembolso_estimado(self):
         return self.valor_final
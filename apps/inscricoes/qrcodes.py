@@ -0,0 +1,54 @@
+"""
+QR codes de check-in das inscrições.
+
+O SVG de cada código é renderizado uma única vez e guardado no storage de
+mídia (o conteúdo depende só do código), de onde a view `inscricao_qrcode`
+o serve com ETag fixo e cache imutável. Os serializers expõem apenas a URL.
+"""
+import hashlib
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+# Incrementar quando a renderização mudar, para invalidar SVGs e ETags antigos
+VERSAO_RENDERIZACAO = 1
+PASTA = 'inscricoes/qrcodes'
+
+
+def etag(codigo):
+    digest = hashlib.sha256(f'{VERSAO_RENDERIZACAO}:{codigo}'.encode('utf-8')).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def caminho(codigo):
+    # O código vem da URL: usa o hash no nome do arquivo em vez do texto cru
+    digest = hashlib.sha256(codigo.encode('utf-8')).hexdigest()
+    return f'{PASTA}/v{VERSAO_RENDERIZACAO}/{digest[:2]}/{digest}.svg'
+
+
+def renderizar_svg(codigo):
+    import qrcode
+    from qrcode.image.svg import SvgPathImage
+
+    qr = qrcode.QRCode(border=4, image_factory=SvgPathImage)
+    qr.add_data(codigo)
+    qr.make(fit=True)
+
+    buffer = BytesIO()
+    qr.make_image().save(buffer)
+    return buffer.getvalue()
+
+
+def obter_svg(codigo):
+    """Retorna o SVG do código, renderizando e guardando na primeira vez."""
+    nome = caminho(codigo)
+    if default_storage.exists(nome):
+        with default_storage.open(nome, 'rb') as arquivo:
+            return arquivo.read()
+
+    conteudo = renderizar_svg(codigo)
+    # Outra requisição pode ter gravado no meio do caminho; o conteúdo é o mesmo
+    if not default_storage.exists(nome):
+        default_storage.save(nome, ContentFile(conteudo))
+    return conteudo
@@ -0,0 +1,159 @@
+"""
+Reservas de vaga com prazo para inscrições pendentes de pagamento.
+
+Uma inscrição pendente com `reserva_expira_em` preenchido segura uma vaga
+(Evento.reservas_ativas). `liberar_reservas_expiradas` cancela em lotes as
+reservas vencidas com UPDATEs por conjunto e, na mesma passada, oferece as
+vagas liberadas para a lista de espera do evento, criando novas reservas
+para os primeiros da fila.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from apps.eventos.models import Evento
+from apps.notificacoes.models import Notificacao
+from apps.tracking import emitir_transicoes
+from apps.waitlist.models import WaitlistEntry
+from .models import Inscricao
+
+
+def prazo_reserva(agora=None):
+    return (agora or timezone.now()) + timedelta(minutes=settings.RESERVA_VAGA_MINUTOS)
+
+
+def prazo_aprovacao(agora=None):
+    return (agora or timezone.now()) + timedelta(hours=settings.RESERVA_VAGA_APROVACAO_HORAS)
+
+
+def prazo_lista_espera(agora=None):
+    return (agora or timezone.now()) + timedelta(hours=settings.RESERVA_VAGA_LISTA_ESPERA_HORAS)
+
+
+def liberar_reservas_expiradas(tamanho_lote=1000, agora=None):
+    """
+    Cancela as reservas vencidas e repassa as vagas para a lista de espera.
+    Retorna (reservas liberadas, vagas oferecidas à lista de espera).
+    """
+    agora = agora or timezone.now()
+    liberadas = 0
+    eventos_afetados = set()
+
+    while True:
+        with transaction.atomic():
+            # skip_locked: reservas sendo aprovadas agora ficam para a próxima passada
+            lote = list(
+                Inscricao.objects.select_for_update(skip_locked=True)
+                .filter(status='pendente', reserva_expira_em__lte=agora)
+                .order_by('reserva_expira_em')
+                .values_list('id', 'evento_id', 'usuario_id')[:tamanho_lote]
+            )
+            if not lote:
+                break
+
+            ids = [inscricao_id for inscricao_id, _, _ in lote]
+            Inscricao.objects.filter(pk__in=ids).update(
+                status='cancelada',
+                reserva_expira_em=None,
+                updated_at=agora,
+            )
+            WaitlistEntry.objects.filter(inscricao_id__in=ids, status='notificado').update(status='expirado')
+
+            por_evento = Counter(evento_id for _, evento_id, _ in lote)
+            Evento.objects.filter(pk__in=por_evento).update(
+                reservas_ativas=F('reservas_ativas') - Case(
+                    *[When(pk=evento_id, then=Value(total)) for evento_id, total in por_evento.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            )
+            emitir_transicoes(Inscricao, [
+                Inscricao(id=inscricao_id, evento_id=evento_id, usuario_id=usuario_id, status='cancelada')
+                for inscricao_id, evento_id, usuario_id in lote
+            ], 'pendente', 'cancelada')
+
+        liberadas += len(lote)
+        eventos_afetados.update(por_evento)
+
+    oferecidas = sum(oferecer_vagas_lista_espera(evento_id, agora) for evento_id in eventos_afetados)
+    return liberadas, oferecidas
+
+
+def oferecer_vagas_lista_espera(evento_id, agora=None):
+    """
+    Reserva as vagas livres do evento para os primeiros da lista de espera
+    e os notifica. Retorna quantas vagas foram oferecidas.
+    """
+    agora = agora or timezone.now()
+
+    with transaction.atomic():
+        evento = Evento.objects.select_for_update().filter(pk=evento_id).first()
+        if evento is None or evento.status != 'publicado' or evento.vagas_disponiveis <= 0:
+            return 0
+
+        entradas = list(
+            WaitlistEntry.objects.filter(evento_id=evento_id, status='fila')
+            .select_related('usuario')
+            .order_by('created_at')[:evento.vagas_disponiveis]
+        )
+        inscricoes = {
+            inscricao.usuario_id: inscricao
+            for inscricao in Inscricao.objects.filter(
+                evento_id=evento_id,
+                status='lista_espera',
+                usuario_id__in=[entrada.usuario_id for entrada in entradas],
+            )
+        }
+
+        expira_em = prazo_lista_espera(agora)
+        promovidas, ofertas = [], []
+        for entrada in entradas:
+            inscricao = inscricoes.get(entrada.usuario_id)
+            if inscricao is None:
+                continue
+
+            valor_com_desconto = evento.calcular_valor_com_desconto(entrada.usuario)
+            inscricao.status = 'pendente'
+            inscricao.status_pagamento = 'pendente'
+            inscricao.reserva_expira_em = expira_em
+            inscricao.valor_original = evento.valor_deposito
+            inscricao.valor_final = valor_com_desconto
+            inscricao.desconto_aplicado = evento.valor_deposito - valor_com_desconto
+            inscricao.updated_at = agora
+            promovidas.append(inscricao)
+
+            entrada.status = 'notificado'
+            entrada.notified_at = agora
+            entrada.expires_at = expira_em
+            entrada.inscricao = inscricao
+            ofertas.append(entrada)
+
+        if not promovidas:
+            return 0
+
+        Inscricao.objects.bulk_update(promovidas, [
+            'status', 'status_pagamento', 'reserva_expira_em', 'valor_original',
+            'valor_final', 'desconto_aplicado', 'updated_at',
+        ])
+        WaitlistEntry.objects.bulk_update(ofertas, ['status', 'notified_at', 'expires_at', 'inscricao'])
+        Evento.ajustar_reservas_ativas(evento_id, len(promovidas))
+        emitir_transicoes(Inscricao, promovidas, 'lista_espera', 'pendente')
+        Notificacao.objects.bulk_create([
+            Notificacao(
+                usuario_id=entrada.usuario_id,
+                tipo='vaga_lista_espera',
+                titulo='Vaga liberada na lista de espera!',
+                mensagem=(
+                    f'Uma vaga foi liberada para o evento "{evento.titulo}" e está reservada '
+                    f'para você até {timezone.localtime(expira_em):%d/%m/%Y %H:%M}. Conclua o pagamento para garanti-la.'
+                ),
+                link=f'/evento/{evento.id}',
+            )
+            for entrada in ofertas
+        ])
+
+    return len(promovidas)
@@ -1,7 +1,7 @@
 from rest_framework import serializers
+from django.urls import reverse
+from apps.images import representar_variantes
 from .models import Inscricao
-from io import BytesIO
-import base64
 
 class InscricaoCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -71,6 +71,7 @@ class InscricaoSerializer(serializers.ModelSerializer):
     evento_endereco = serializers.CharField(source='evento.endereco', read_only=True)
     evento_local_especifico = serializers.CharField(source='evento.local_especifico', read_only=True)
     evento_foto_capa = serializers.SerializerMethodField()
+    evento_foto_capa_variantes = serializers.SerializerMethodField()
 
     organizador_nome = serializers.CharField(source='evento.organizador.get_full_name', read_only=True)
     organizador_telefone = serializers.CharField(source='evento.organizador.telefone', read_only=True)
@@ -109,6 +110,7 @@ class InscricaoSerializer(serializers.ModelSerializer):
             'evento_endereco',
             'evento_local_especifico',
             'evento_foto_capa',
+            'evento_foto_capa_variantes',
             'organizador_nome',
             'organizador_telefone',
             'usuario_nome',
@@ -127,27 +129,19 @@ class InscricaoSerializer(serializers.ModelSerializer):
             return obj.evento.foto_capa.url
         return None
 
+    def get_evento_foto_capa_variantes(self, obj):
+        if obj.evento:
+            return representar_variantes(obj.evento.variantes_imagem, 'foto_capa', obj.evento.foto_capa.storage)
+        return None
+
     def get_reembolso_estimado(self, obj):
         return obj.calcular_reembolso_estimado()
 
     def get_qr_code_image(self, obj):
-        try:
-            try:
-                import qrcode
-            except Exception:
-                return None
-
-            qr_text = obj.qr_code or str(obj.id)
-            qr = qrcode.QRCode(version=1, box_size=10, border=4)
-            qr.add_data(qr_text)
-            qr.make(fit=True)
-            img = qr.make_image(fill_color="black", back_color="white")
-
-            buffered = BytesIO()
-            img.save(buffered, format="PNG")
-            img_bytes = buffered.getvalue()
-            b64 = base64.b64encode(img_bytes).decode('utf-8')
-            return f"data:image/png;base64,{b64}"
-        except Exception:
+        # Apenas a URL: o SVG é renderizado uma vez e servido com cache (ver qrcodes.py)
+        if not obj.qr_code:
             return None
+        url = reverse('inscricao-qrcode', args=[obj.qr_code])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
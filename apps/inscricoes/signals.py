@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from apps.eventos.models import Evento
+from .models import Inscricao
+
+
+@receiver(post_delete, sender=Inscricao)
+def liberar_vaga_ao_excluir(sender, instance, **kwargs):
+    """
+    Devolve a vaga ao evento quando uma inscrição confirmada (ou com vaga
+    reservada) é excluída, inclusive em exclusões via QuerySet e em cascata.
+    """
+    ocupacao = Inscricao.ocupacao(
+        instance.valor_carregado('status'),
+        instance.valor_carregado('reserva_expira_em'),
+    )
+    evento_id = instance.valor_carregado('evento_id')
+    if ocupacao == 'confirmada':
+        Evento.ajustar_inscritos_confirmados(evento_id, -1)
+    elif ocupacao == 'reserva':
+        Evento.ajustar_reservas_ativas(evento_id, -1)
@@ -0,0 +1,103 @@
+"""
+Teste manual de concorrência das inscrições.
+
+Dispara centenas de inscrições simultâneas (pelo endpoint real) contra um
+evento de 50 vagas e confere que exatamente 50 foram aceitas e que o
+contador de vagas bate com as inscrições confirmadas.
+
+Uso:
+    python manage.py shell < apps/inscricoes/test_concorrencia.py
+
+Os usuários e o evento criados são removidos no final.
+"""
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import close_old_connections
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.users.models import CustomUser
+from apps.eventos.models import Evento
+from apps.inscricoes.models import Inscricao
+
+VAGAS = 50
+TENTATIVAS = 300
+THREADS = 32
+
+print("=" * 60)
+print("TESTE DE CONCORRÊNCIA DAS INSCRIÇÕES")
+print("=" * 60)
+
+sufixo = uuid.uuid4().hex[:8]
+organizador = CustomUser.objects.create_user(
+    f'org_concorrencia_{sufixo}', f'org_{sufixo}@teste.local', 'Senha@123456'
+)
+evento = Evento.objects.create(
+    titulo=f'Teste de concorrência {sufixo}',
+    descricao='Evento temporário criado pelo teste de concorrência',
+    categoria='Workshop',
+    organizador=organizador,
+    data_evento=timezone.now() + timedelta(days=7),
+    endereco='Rua do Teste, 1',
+    capacidade_maxima=VAGAS,
+    valor_deposito=Decimal('0'),
+    status='publicado',
+)
+usuarios = CustomUser.objects.bulk_create([
+    CustomUser(username=f'conc_{sufixo}_{i}', email=f'conc_{sufixo}_{i}@teste.local')
+    for i in range(TENTATIVAS)
+])
+print(f"Evento: {evento.titulo} ({VAGAS} vagas), {TENTATIVAS} inscrições simultâneas em {THREADS} threads")
+
+
+def inscrever(usuario):
+    cliente = APIClient()
+    cliente.force_authenticate(usuario)
+    try:
+        resposta = cliente.post('/api/inscricoes/', {
+            'evento': str(evento.id),
+            'nome_completo_inscricao': usuario.username,
+            'cpf_inscricao': '12345678901',
+            'telefone_inscricao': '11999999999',
+            'email_inscricao': usuario.email,
+            'metodo_pagamento': 'pix',
+            'aceita_termos': True,
+        }, format='json')
+        return resposta.status_code
+    finally:
+        close_old_connections()
+
+
+inicio = time.perf_counter()
+with ThreadPoolExecutor(max_workers=THREADS) as executor:
+    codigos = list(executor.map(inscrever, usuarios))
+duracao = time.perf_counter() - inicio
+
+aceitas = codigos.count(201)
+lotado = codigos.count(400)
+outros = len(codigos) - aceitas - lotado
+
+evento.refresh_from_db()
+confirmadas = Inscricao.objects.filter(evento=evento, status='confirmada').count()
+
+print("RESUMO")
+print(f"Aceitas (201): {aceitas}")
+print(f"Recusadas por lotação (400): {lotado}")
+print(f"Outras respostas: {outros}")
+print(f"Confirmadas no banco: {confirmadas} | contador do evento: {evento.inscritos_confirmados}")
+print(f"Tempo total: {duracao:.2f}s ({len(codigos) / duracao:.0f} inscrições/s)")
+
+ok = aceitas == VAGAS and confirmadas == VAGAS and evento.inscritos_confirmados == VAGAS and outros == 0
+
+evento.delete()
+CustomUser.objects.filter(pk__in=[u.pk for u in usuarios] + [organizador.pk]).delete()
+
+if not ok:
+    print("FALHOU: o número de vencedores não bate com as vagas")
+    sys.exit(1)
+print(f"Teste concluído: exatamente {VAGAS} vagas ocupadas")
@@ -7,6 +7,8 @@ from .views import (
     confirmar_pagamento_inscricao,
     aprovar_pagamento_inscricao,
     listar_pagamentos_pendentes,
+    inscricao_certificado,
+    certificados_evento,
 )
 
 urlpatterns = [
@@ -22,5 +24,9 @@ urlpatterns = [
     # Rotas de pagamento - organizador
     path('<uuid:inscricao_id>/aprovar-pagamento/', aprovar_pagamento_inscricao, name='aprovar-pagamento'),
     path('evento/<uuid:evento_id>/pagamentos-pendentes/', listar_pagamentos_pendentes, name='pagamentos-pendentes'),
+
+    # Certificados de participação
+    path('<uuid:inscricao_id>/certificado/', inscricao_certificado, name='inscricao-certificado'),
+    path('evento/<uuid:evento_id>/certificados/', certificados_evento, name='certificados-evento'),
 ]
 
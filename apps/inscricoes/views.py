@@ -2,12 +2,18 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
+from django.db import transaction
+from django.http import Http404, HttpResponse, HttpResponseNotModified
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.views.decorators.http import require_GET
 
+from apps.pagination import KeysetPagination
+from . import certificados, qrcodes, reservas
 from .models import Inscricao
 from .serializers import InscricaoCreateSerializer, InscricaoSerializer
-from apps.eventos.models import Evento
+from apps.eventos.models import Evento, EventoLotado
+from apps.waitlist.models import WaitlistEntry
 
 
 class InscricaoCreateView(generics.CreateAPIView):
@@ -25,6 +31,9 @@ class InscricaoCreateView(generics.CreateAPIView):
         serializer.is_valid(raise_exception=True)
         try:
             inscricao = serializer.save()
+        except EventoLotado as e:
+            # Outra inscrição ocupou a última vaga depois da validação
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({'error': 'Erro ao criar inscrição', 'details': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -38,9 +47,15 @@ class InscricaoCreateView(generics.CreateAPIView):
 class MinhasInscricoesView(generics.ListAPIView):
     serializer_class = InscricaoSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
-        return Inscricao.objects.filter(usuario=self.request.user).order_by('-created_at')
+        return (
+            Inscricao.objects.filter(usuario=self.request.user)
+            .select_related('usuario', 'evento__organizador')
+            .order_by('-created_at')
+        )
 
 
 @api_view(['GET'])
@@ -60,7 +75,10 @@ def inscricao_detalhes(request, inscricao_id):
 @permission_classes([IsAuthenticated])
 def iniciar_inscricao_pagamento(request):
     """
-    Cria a inscrição com status pendente e retorna o QR Code PIX do evento
+    Cria a inscrição com status pendente, segurando uma vaga por
+    RESERVA_VAGA_MINUTOS, e retorna o QR Code PIX do evento. Se o usuário
+    já tinha uma inscrição cancelada no evento (ex.: a reserva expirou
+    antes do pagamento), ela volta a ser pendente com uma nova reserva
     """
     evento_id = request.data.get('evento_id')
     
@@ -73,46 +91,52 @@ def iniciar_inscricao_pagamento(request):
     # Buscar evento
     evento = get_object_or_404(Evento, id=evento_id)
     
-    # Verificar se já tem inscrição
-    inscricao_existente = Inscricao.objects.filter(
-        usuario=request.user,
-        evento=evento
-    ).first()
-    
-    if inscricao_existente:
-        return Response(
-            {'error': 'Você já está inscrito neste evento'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    # Verificar vagas
-    if evento.esta_lotado:
-        return Response(
-            {'error': 'Evento lotado'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
     # Calcular valores
     valor_original = evento.valor_deposito
     valor_com_desconto = evento.calcular_valor_com_desconto(request.user)
     desconto_aplicado = valor_original - valor_com_desconto
     
-    # Criar inscrição com status pendente
-    inscricao = Inscricao.objects.create(
-        usuario=request.user,
-        evento=evento,
-        nome_completo_inscricao=request.data.get('nome_completo_inscricao', request.user.get_full_name()),
-        cpf_inscricao=request.data.get('cpf_inscricao', ''),
-        telefone_inscricao=request.data.get('telefone_inscricao', ''),
-        email_inscricao=request.data.get('email_inscricao', request.user.email),
-        metodo_pagamento='pix',  # Sempre PIX
-        aceita_termos=request.data.get('aceita_termos', True),
-        valor_original=valor_original,
-        desconto_aplicado=desconto_aplicado,
-        valor_final=valor_com_desconto,
-        status='pendente',  # Status pendente até confirmar pagamento
-        status_pagamento='pendente'
-    )
+    # Inscrição com status pendente e vaga reservada até o prazo. Uma
+    # inscrição cancelada (ex.: reserva expirada antes do pagamento) é
+    # reaproveitada, já que a linha é única por usuário e evento. O save()
+    # segura a vaga com o UPDATE condicional de Evento.reservar_vaga, que
+    # levanta EventoLotado se não houver mais vaga
+    try:
+        with transaction.atomic():
+            inscricao = Inscricao.objects.select_for_update().filter(
+                usuario=request.user,
+                evento=evento
+            ).first()
+
+            if inscricao is not None and inscricao.status != 'cancelada':
+                return Response(
+                    {'error': 'Você já está inscrito neste evento'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if inscricao is None:
+                inscricao = Inscricao(usuario=request.user, evento=evento)
+
+            inscricao.nome_completo_inscricao = request.data.get('nome_completo_inscricao', request.user.get_full_name())
+            inscricao.cpf_inscricao = request.data.get('cpf_inscricao', '')
+            inscricao.telefone_inscricao = request.data.get('telefone_inscricao', '')
+            inscricao.email_inscricao = request.data.get('email_inscricao', request.user.email)
+            inscricao.metodo_pagamento = 'pix'  # Sempre PIX
+            inscricao.aceita_termos = request.data.get('aceita_termos', True)
+            inscricao.valor_original = valor_original
+            inscricao.desconto_aplicado = desconto_aplicado
+            inscricao.valor_final = valor_com_desconto
+            inscricao.status = 'pendente'  # Status pendente até confirmar pagamento
+            inscricao.status_pagamento = 'pendente'
+            inscricao.data_pagamento = None
+            inscricao.comprovante_pagamento = None
+            inscricao.observacoes_pagamento = None
+            inscricao.reserva_expira_em = reservas.prazo_reserva()
+            inscricao.save()
+    except EventoLotado:
+        return Response(
+            {'error': 'Evento lotado'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
     # Retornar dados da inscrição com QR Code
     qr_code_url = None
@@ -135,6 +159,7 @@ def iniciar_inscricao_pagamento(request):
             'status_pagamento': inscricao.status_pagamento,
         },
         'status': inscricao.status,
+        'reserva_expira_em': inscricao.reserva_expira_em,
     }, status=status.HTTP_201_CREATED)
 
 
@@ -151,6 +176,12 @@ def confirmar_pagamento_inscricao(request, inscricao_id):
             usuario=request.user
         )
 
+        if inscricao.status != 'pendente':
+            return Response(
+                {'erro': 'Esta inscrição não está aguardando pagamento. Se a reserva expirou, inicie a inscrição novamente.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         # Upload do comprovante (opcional)
         comprovante = request.FILES.get('comprovante')
         if comprovante:
@@ -165,6 +196,9 @@ def confirmar_pagamento_inscricao(request, inscricao_id):
         # O organizador precisará aprovar manualmente
         inscricao.status = 'pendente'
         inscricao.data_pagamento = timezone.now()
+        # A vaga continua reservada enquanto o organizador analisa o pagamento
+        if inscricao.reserva_expira_em:
+            inscricao.reserva_expira_em = reservas.prazo_aprovacao(inscricao.data_pagamento)
         inscricao.save()
 
         return Response({
@@ -188,47 +222,60 @@ def aprovar_pagamento_inscricao(request, inscricao_id):
     Endpoint para o organizador aprovar ou rejeitar o pagamento da inscrição
     """
     try:
-        inscricao = get_object_or_404(Inscricao, id=inscricao_id)
+        with transaction.atomic():
+            # Lock na inscrição: a liberação de reservas vencidas pula linhas
+            # travadas, então não cancela uma reserva no meio da aprovação
+            inscricao = get_object_or_404(Inscricao.objects.select_for_update(), id=inscricao_id)
         
-        # Verificar se o usuário é o organizador do evento
-        if inscricao.evento.organizador != request.user:
-            return Response(
-                {'erro': 'Apenas o organizador do evento pode aprovar pagamentos'},
-                status=status.HTTP_403_FORBIDDEN
-            )
+            # Verificar se o usuário é o organizador do evento
+            if inscricao.evento.organizador != request.user:
+                return Response(
+                    {'erro': 'Apenas o organizador do evento pode aprovar pagamentos'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
         
-        acao = request.data.get('acao')  # 'aprovar' ou 'rejeitar'
-        observacoes = request.data.get('observacoes_admin', '')
+            acao = request.data.get('acao')  # 'aprovar' ou 'rejeitar'
+            observacoes = request.data.get('observacoes_admin', '')
         
-        if acao == 'aprovar':
-            inscricao.status = 'confirmada'
-            inscricao.status_pagamento = 'aprovado'
-            mensagem = 'Pagamento aprovado com sucesso!'
-        elif acao == 'rejeitar':
-            inscricao.status = 'cancelada'
-            inscricao.status_pagamento = 'rejeitado'
-            mensagem = 'Pagamento rejeitado'
-        else:
-            return Response(
-                {'erro': 'Ação inválida. Use "aprovar" ou "rejeitar"'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Adicionar observações do admin se houver
-        if observacoes:
-            if inscricao.observacoes_pagamento:
-                inscricao.observacoes_pagamento += f'\n\nAdmin: {observacoes}'
+            if acao == 'aprovar':
+                inscricao.status = 'confirmada'
+                inscricao.status_pagamento = 'aprovado'
+                mensagem = 'Pagamento aprovado com sucesso!'
+            elif acao == 'rejeitar':
+                inscricao.status = 'cancelada'
+                inscricao.status_pagamento = 'rejeitado'
+                mensagem = 'Pagamento rejeitado'
             else:
-                inscricao.observacoes_pagamento = f'Admin: {observacoes}'
+                return Response(
+                    {'erro': 'Ação inválida. Use "aprovar" ou "rejeitar"'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
         
-        inscricao.save()
+            # Adicionar observações do admin se houver
+            if observacoes:
+                if inscricao.observacoes_pagamento:
+                    inscricao.observacoes_pagamento += f'\n\nAdmin: {observacoes}'
+                else:
+                    inscricao.observacoes_pagamento = f'Admin: {observacoes}'
         
-        return Response({
-            'mensagem': mensagem,
-            'inscricao_id': str(inscricao.id),
-            'status': inscricao.status,
-            'status_pagamento': inscricao.status_pagamento
-        }, status=status.HTTP_200_OK)
+            try:
+                inscricao.save()
+            except EventoLotado:
+                return Response(
+                    {'erro': 'Evento lotado: não há vaga para confirmar esta inscrição'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            if acao == 'aprovar':
+                # Vaga oferecida pela lista de espera foi aproveitada
+                WaitlistEntry.objects.filter(inscricao=inscricao, status='notificado').update(status='aceitou')
+        
+            return Response({
+                'mensagem': mensagem,
+                'inscricao_id': str(inscricao.id),
+                'status': inscricao.status,
+                'status_pagamento': inscricao.status_pagamento
+            }, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response(
@@ -276,3 +323,74 @@ def listar_pagamentos_pendentes(request, evento_id):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def inscricao_certificado(request, inscricao_id):
+    """
+    PDF do certificado de participação do próprio usuário, disponível
+    depois do check-in.
+    """
+    inscricao = get_object_or_404(
+        Inscricao.objects.select_related('evento__organizador'),
+        id=inscricao_id,
+        usuario=request.user
+    )
+    if not inscricao.checkin_realizado:
+        return Response(
+            {'erro': 'O certificado fica disponível depois do check-in no evento'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    resposta = HttpResponse(certificados.renderizar(inscricao), content_type='application/pdf')
+    nome = certificados.nome_arquivo({'nome': inscricao.nome_completo_inscricao, 'codigo': str(inscricao.id)})
+    resposta['Content-Disposition'] = f'attachment; filename="{nome}"'
+    return resposta
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def certificados_evento(request, evento_id):
+    """
+    ZIP com os certificados de todos os participantes que fizeram check-in,
+    gerado e enviado aos poucos (ver certificados.py).
+    """
+    evento = get_object_or_404(Evento.objects.select_related('organizador'), id=evento_id)
+    if evento.organizador != request.user:
+        return Response(
+            {'erro': 'Apenas o organizador pode baixar os certificados do evento'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    if not certificados.presentes(evento).exists():
+        return Response(
+            {'erro': 'Nenhum participante fez check-in neste evento'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    resposta = certificados.resposta_zip(request._request, evento)
+    if resposta is None:
+        return Response(
+            {'erro': 'Muitas exportações de certificados em andamento. Tente novamente em instantes.'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={'Retry-After': '30'}
+        )
+    return resposta
+
+
+@require_GET
+def inscricao_qrcode(request, codigo):
+    """
+    SVG do QR code de check-in. View Django simples (sem autenticação nem
+    throttle) para poder ser usada direto em <img src>; o conteúdo de um
+    código nunca muda, então a resposta é cacheável para sempre.
+    """
+    etag = qrcodes.etag(codigo)
+    if etag in request.headers.get('If-None-Match', ''):
+        resposta = HttpResponseNotModified()
+    else:
+        if not Inscricao.objects.filter(qr_code=codigo).exists():
+            raise Http404
+        resposta = HttpResponse(qrcodes.obter_svg(codigo), content_type='image/svg+xml')
+
+    resposta['ETag'] = etag
+    resposta['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return resposta
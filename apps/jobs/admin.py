@@ -0,0 +1,37 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'tarefa', 'fila', 'status', 'tentativas', 'executar_em', 'created_at']
+    list_filter = ['status', 'fila', 'created_at']
+    search_fields = ['tarefa', 'ultimo_erro']
+    readonly_fields = ['created_at', 'concluido_em', 'reservado_ate', 'token', 'resultado', 'ultimo_erro']
+    list_per_page = 50
+    actions = ['reenfileirar']
+
+    fieldsets = (
+        ('Tarefa', {
+            'fields': ('fila', 'tarefa', 'ao_falhar', 'args', 'kwargs')
+        }),
+        ('Execução', {
+            'fields': ('status', 'tentativas', 'max_tentativas', 'executar_em', 'reservado_ate', 'token')
+        }),
+        ('Resultado', {
+            'fields': ('resultado', 'ultimo_erro', 'created_at', 'concluido_em')
+        }),
+    )
+
+    @admin.action(description='Reenfileirar jobs que falharam')
+    def reenfileirar(self, request, queryset):
+        total = queryset.filter(status=Job.FALHOU).update(
+            status=Job.PENDENTE,
+            # Sem a chave, não esbarra num pendente que já tenha a mesma
+            chave=None,
+            tentativas=0,
+            executar_em=timezone.now(),
+        )
+        self.message_user(request, f'{total} job(s) reenfileirado(s).')
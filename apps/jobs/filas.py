@@ -0,0 +1,138 @@
+"""
+Fila de jobs persistida no banco, para tirar do ciclo da requisição o que
+depende de serviços externos (e-mail, verificação de documentos, PDFs,
+fan-out de notificações).
+
+    from apps.jobs.filas import enfileirar
+    enfileirar(lotes.notificar_cancelamento, [evento.pk])
+    enfileirar(enviar_email, [destinatario], fila='emails', atraso=60)
+
+`enfileirar` grava um Job na transação atual: se ela for desfeita, o job
+some junto. Quem executa os jobs (ver trabalhador.py):
+
+- `python manage.py run_workers`, um ou mais processos dedicados;
+- com JOBS_TRABALHADOR_NO_PROCESSO (padrão), também uma thread do próprio
+  processo web, avisada depois do commit de cada job enfileirado;
+- com JOBS_SINCRONO, a própria thread, logo depois do commit (útil em
+  scripts e testes manuais).
+
+Cada fila é configurada em settings.JOBS_FILAS:
+
+    JOBS_FILAS = {'emails': {'concorrencia': 2, 'visibilidade': 60, 'max_tentativas': 8}}
+
+- concorrencia: jobs da fila executados ao mesmo tempo por processo;
+- visibilidade: segundos que o job fica reservado ao trabalhador que o
+  pegou, renovados enquanto ele roda; se a reserva não for renovada nesse
+  prazo (processo morto ou travado), o job volta a ficar disponível e
+  conta como uma tentativa;
+- max_tentativas: falhas (exceções) antes de o job ficar como 'falhou'.
+  Entre tentativas o intervalo cresce exponencialmente, com jitter.
+
+Com `ao_falhar`, a função indicada é chamada com os mesmos argumentos
+quando o job falha de vez, para desfazer estados intermediários (ex.: um
+documento que ficaria 'verificando' para sempre).
+"""
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Least
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+FILA_PADRAO = 'padrao'
+
+CONFIG_PADRAO = {
+    'concorrencia': 2,
+    'visibilidade': 300,
+    'max_tentativas': 5,
+}
+
+# Espera antes da n-ésima nova tentativa: BACKOFF_BASE * 2**(n-1), até BACKOFF_MAXIMO
+BACKOFF_BASE = 10
+BACKOFF_MAXIMO = 3600
+
+
+def filas():
+    """Nomes das filas configuradas (a padrão sempre existe)."""
+    return [FILA_PADRAO, *(nome for nome in getattr(settings, 'JOBS_FILAS', {}) if nome != FILA_PADRAO)]
+
+
+def config_fila(nome):
+    if nome not in filas():
+        raise ValueError(f'Fila de jobs desconhecida: {nome!r} (ver settings.JOBS_FILAS)')
+    return {**CONFIG_PADRAO, **getattr(settings, 'JOBS_FILAS', {}).get(nome, {})}
+
+
+def backoff(tentativas):
+    """Segundos até a próxima tentativa, com jitter para espalhar as repetições."""
+    atraso = min(BACKOFF_MAXIMO, BACKOFF_BASE * 2 ** (tentativas - 1))
+    return atraso * random.uniform(0.5, 1.0)
+
+
+def caminho_tarefa(funcao):
+    """Caminho importável da função; só funções de nível de módulo podem virar job."""
+    caminho = f'{funcao.__module__}.{funcao.__qualname__}'
+    try:
+        importada = import_string(caminho)
+    except ImportError:
+        importada = None
+    if importada is not funcao:
+        raise ValueError(f'{caminho} não é uma função importável de nível de módulo')
+    return caminho
+
+
+def enfileirar(funcao, args=(), kwargs=None, fila=FILA_PADRAO, atraso=0, max_tentativas=None, chave=None,
+               ao_falhar=None):
+    """
+    Enfileira `funcao(*args, **kwargs)`. Argumentos e resultado passam por
+    JSON: use ids, não instâncias de modelo. Retorna o Job criado.
+
+    Com `chave`, se já houver um job pendente com a mesma chave nenhum outro
+    é criado, o existente só é antecipado se for o caso, e o retorno é
+    None. Serve para tarefas que processam tudo o que estiver pendente
+    (ex.: envio de e-mails), que não precisam de um job por item.
+
+    `ao_falhar` é uma função de nível de módulo chamada com os mesmos
+    argumentos se o job esgotar as tentativas.
+    """
+    config = config_fila(fila)
+    executar_em = timezone.now() + timedelta(seconds=atraso)
+    job = Job(
+        fila=fila,
+        tarefa=caminho_tarefa(funcao),
+        chave=chave,
+        ao_falhar=caminho_tarefa(ao_falhar) if ao_falhar else '',
+        args=list(args),
+        kwargs=kwargs or {},
+        max_tentativas=max_tentativas or config['max_tentativas'],
+        executar_em=executar_em,
+    )
+    if chave is None:
+        job.save()
+    else:
+        antecipados = Job.objects.filter(chave=chave, status=Job.PENDENTE).update(
+            executar_em=Least('executar_em', Value(executar_em)),
+        )
+        if not antecipados:
+            # Outro processo pode ter criado o pendente entre o UPDATE e aqui
+            Job.objects.bulk_create([job], ignore_conflicts=True)
+        job = None
+    transaction.on_commit(lambda: _despachar(chave, job))
+    return job
+
+
+def _despachar(chave, job):
+    from . import trabalhador
+
+    if getattr(settings, 'JOBS_SINCRONO', False):
+        if job is None:
+            job = Job.objects.filter(chave=chave, status=Job.PENDENTE).first()
+        if job is not None:
+            trabalhador.executar_agora(job.pk)
+    elif getattr(settings, 'JOBS_TRABALHADOR_NO_PROCESSO', True):
+        trabalhador.no_processo().avisar()
@@ -0,0 +1,57 @@
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.jobs.filas import config_fila, filas
+from apps.jobs.trabalhador import INTERVALO, Trabalhador
+
+
+class Command(BaseCommand):
+    help = (
+        "Run jobs from the database-backed queue (apps.jobs) with a thread pool per queue. "
+        "SIGINT/SIGTERM stop claiming new jobs and wait for the running ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="filas",
+            help="Only run this queue (repeatable; default: every queue in JOBS_FILAS)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is available or running instead of polling forever",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=INTERVALO,
+            help=f"Seconds between polls when the queues are empty (default: {INTERVALO})",
+        )
+
+    def handle(self, *args, **options):
+        nomes = options["filas"] or filas()
+        try:
+            configs = {nome: config_fila(nome) for nome in nomes}
+        except ValueError as erro:
+            raise CommandError(str(erro))
+
+        trabalhador = Trabalhador(nomes, intervalo=options["interval"])
+
+        def parar(signum, frame):
+            self.stdout.write("Stopping: waiting for running jobs...")
+            trabalhador.parar(esperar=False)
+
+        signal.signal(signal.SIGINT, parar)
+        signal.signal(signal.SIGTERM, parar)
+
+        for nome, config in configs.items():
+            self.stdout.write(
+                f" - {nome}: concurrency {config['concorrencia']}, "
+                f"visibility {config['visibilidade']}s, max attempts {config['max_tentativas']}"
+            )
+        trabalhador.executar_ate_parar(ate_esvaziar=options["once"])
+        trabalhador.parar(esperar=True)
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
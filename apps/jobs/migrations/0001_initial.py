@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:59
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fila', models.CharField(default='padrao', max_length=50, verbose_name='Fila')),
+                ('tarefa', models.CharField(help_text='Caminho da função, ex.: apps.notificacoes.lotes.notificar_cancelamento', max_length=200, verbose_name='Tarefa')),
+                ('args', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Argumentos')),
+                ('kwargs', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Argumentos nomeados')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('executando', 'Executando'), ('concluido', 'Concluído'), ('falhou', 'Falhou')], default='pendente', max_length=20, verbose_name='Status')),
+                ('tentativas', models.PositiveIntegerField(default=0, verbose_name='Tentativas')),
+                ('max_tentativas', models.PositiveIntegerField(default=5, verbose_name='Máximo de tentativas')),
+                ('executar_em', models.DateTimeField(verbose_name='Executar em')),
+                ('reservado_ate', models.DateTimeField(blank=True, null=True, verbose_name='Reservado até')),
+                ('token', models.UUIDField(blank=True, db_index=True, null=True, verbose_name='Token da reserva')),
+                ('resultado', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='Resultado')),
+                ('ultimo_erro', models.TextField(blank=True, verbose_name='Último erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('concluido_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluído em')),
+            ],
+            options={
+                'verbose_name': 'Job',
+                'verbose_name_plural': 'Jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['fila', 'status', 'executar_em'], name='job_disponivel_idx'), models.Index(fields=['status', 'concluido_em'], name='job_concluido_idx')],
+            },
+        ),
+    ]
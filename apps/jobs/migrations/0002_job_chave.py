@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='chave',
+            field=models.CharField(blank=True, max_length=100, null=True, verbose_name='Chave'),
+        ),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pendente')), fields=('chave',), name='job_pendente_unico_por_chave'),
+        ),
+    ]
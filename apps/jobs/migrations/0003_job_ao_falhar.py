@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_chave'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='ao_falhar',
+            field=models.CharField(blank=True, max_length=200, verbose_name='Ao falhar'),
+        ),
+    ]
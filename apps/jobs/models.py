@@ -0,0 +1,142 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+
+
+class JobQuerySet(models.QuerySet):
+    def disponiveis(self, fila, agora):
+        """
+        Jobs que um trabalhador pode pegar: pendentes já vencidos ou em
+        execução com a reserva expirada (o trabalhador morreu ou travou).
+        """
+        return self.filter(fila=fila).filter(
+            Q(status=Job.PENDENTE, executar_em__lte=agora)
+            | Q(status=Job.EXECUTANDO, reservado_ate__lte=agora)
+        )
+
+
+class Job(models.Model):
+    """
+    Chamada de função enfileirada para rodar fora da requisição (ver
+    apps/jobs/filas.py). A linha é gravada na mesma transação de quem
+    enfileira, então o job existe se e somente se os dados que ele usa
+    foram confirmados.
+    """
+
+    PENDENTE = 'pendente'
+    EXECUTANDO = 'executando'
+    CONCLUIDO = 'concluido'
+    FALHOU = 'falhou'
+
+    STATUS_CHOICES = [
+        (PENDENTE, 'Pendente'),
+        (EXECUTANDO, 'Executando'),
+        (CONCLUIDO, 'Concluído'),
+        (FALHOU, 'Falhou'),
+    ]
+
+    fila = models.CharField(
+        max_length=50,
+        default='padrao',
+        verbose_name='Fila'
+    )
+    tarefa = models.CharField(
+        max_length=200,
+        help_text='Caminho da função, ex.: apps.notificacoes.lotes.notificar_cancelamento',
+        verbose_name='Tarefa'
+    )
+    # Jobs com a mesma chave não se acumulam: enquanto um está pendente,
+    # enfileirar outro só antecipa o existente (ver filas.enfileirar)
+    chave = models.CharField(
+        max_length=100,
+        blank=True,
+        null=True,
+        verbose_name='Chave'
+    )
+    # Função chamada com os mesmos argumentos quando o job falha de vez
+    # (esgotou as tentativas), para a tarefa não deixar dados pela metade
+    ao_falhar = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name='Ao falhar'
+    )
+    args = models.JSONField(
+        default=list,
+        encoder=DjangoJSONEncoder,
+        verbose_name='Argumentos'
+    )
+    kwargs = models.JSONField(
+        default=dict,
+        encoder=DjangoJSONEncoder,
+        verbose_name='Argumentos nomeados'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=PENDENTE,
+        verbose_name='Status'
+    )
+    tentativas = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Tentativas'
+    )
+    max_tentativas = models.PositiveIntegerField(
+        default=5,
+        verbose_name='Máximo de tentativas'
+    )
+    executar_em = models.DateTimeField(
+        verbose_name='Executar em'
+    )
+    # Reserva do trabalhador que pegou o job: vencida, o job volta a ficar
+    # disponível; o token impede que o dono antigo grave o resultado
+    reservado_ate = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Reservado até'
+    )
+    token = models.UUIDField(
+        blank=True,
+        null=True,
+        db_index=True,
+        verbose_name='Token da reserva'
+    )
+    resultado = models.JSONField(
+        blank=True,
+        null=True,
+        encoder=DjangoJSONEncoder,
+        verbose_name='Resultado'
+    )
+    ultimo_erro = models.TextField(
+        blank=True,
+        verbose_name='Último erro'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Criado em'
+    )
+    concluido_em = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Concluído em'
+    )
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Job'
+        verbose_name_plural = 'Jobs'
+        indexes = [
+            models.Index(fields=['fila', 'status', 'executar_em'], name='job_disponivel_idx'),
+            models.Index(fields=['status', 'concluido_em'], name='job_concluido_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['chave'],
+                condition=Q(status='pendente'),
+                name='job_pendente_unico_por_chave',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.tarefa} [{self.fila}] - {self.get_status_display()}"
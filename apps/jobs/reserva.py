@@ -0,0 +1,33 @@
+"""
+Reserva de linhas por vários trabalhadores ao mesmo tempo (jobs, e-mails).
+
+No PostgreSQL a leitura usa SELECT ... FOR UPDATE SKIP LOCKED, de modo que
+trabalhadores concorrentes nunca esperam nem disputam as mesmas linhas.
+Onde não há SKIP LOCKED (SQLite), o UPDATE repete a condição de
+disponibilidade e só fica com a linha quem a marcou primeiro; as escritas
+no SQLite já são serializadas. Em ambos os casos as linhas reservadas são
+as que ficaram com o token de quem reservou.
+"""
+from django.db import connections, transaction
+
+
+def reservar(disponiveis, limite, token, **campos):
+    """
+    Marca com `token` e `campos` até `limite` linhas de `disponiveis` (um
+    queryset ordenado e filtrado pela condição de disponibilidade) e
+    retorna as linhas reservadas, na mesma ordem.
+    """
+    # Leitura barata antes de abrir uma transação de escrita (no SQLite ela
+    # trava o banco inteiro)
+    if not disponiveis.exists():
+        return []
+
+    with transaction.atomic(using=disponiveis.db):
+        candidatos = disponiveis
+        if connections[disponiveis.db].features.has_select_for_update_skip_locked:
+            candidatos = candidatos.select_for_update(skip_locked=True)
+        ids = list(candidatos.values_list('pk', flat=True)[:limite])
+        if not ids:
+            return []
+        disponiveis.filter(pk__in=ids).update(token=token, **campos)
+    return list(disponiveis.model.objects.filter(token=token).order_by(*disponiveis.query.order_by))
@@ -0,0 +1,328 @@
+"""
+Execução dos jobs enfileirados (ver filas.py).
+
+Para pegar jobs, o trabalhador os reserva (ver reserva.py): marca-os como
+'executando', com um token próprio e `reservado_ate` = agora + visibilidade
+da fila. Enquanto o job roda, uma thread do trabalhador renova essa
+reserva periodicamente, de modo que ela só vence se o processo morrer ou
+travar. O resultado só é gravado se o token ainda for o da reserva: um
+trabalhador cuja reserva venceu e foi retomada por outro não sobrescreve
+nada.
+
+Cada fila tem um pool de threads com `concorrencia` threads; cada uma
+executa um job por vez e, ao terminar, tenta pegar o próximo.
+"""
+import logging
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Least
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import reserva
+from .filas import backoff, config_fila, filas
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Segundos entre consultas às filas. No processo web o trabalhador também é
+# acordado a cada job enfileirado, então a consulta só cobre agendamentos e
+# novas tentativas
+INTERVALO = 2
+INTERVALO_NO_PROCESSO = 10
+# Jobs concluídos há mais que isso são apagados pelo trabalhador
+RETENCAO_CONCLUIDOS = timedelta(days=7)
+INTERVALO_LIMPEZA = timedelta(hours=1)
+# Intervalo entre as verificações dos jobs recorrentes (settings.JOBS_RECORRENTES)
+INTERVALO_RECORRENTES = timedelta(minutes=5)
+
+
+def reservar(fila, limite, visibilidade):
+    """Reserva até `limite` jobs disponíveis da fila. Retorna os jobs reservados."""
+    agora = timezone.now()
+    return reserva.reservar(
+        Job.objects.disponiveis(fila, agora).order_by('executar_em', 'id'),
+        limite,
+        token=uuid.uuid4(),
+        status=Job.EXECUTANDO,
+        reservado_ate=agora + timedelta(seconds=visibilidade),
+        tentativas=F('tentativas') + 1,
+    )
+
+
+def executar(job):
+    """Executa um job reservado e grava o resultado, a falha ou a nova tentativa."""
+    if job.tentativas > job.max_tentativas:
+        # Só acontece quando reservas vencem seguidas (o job derruba ou trava
+        # o processo, e a reserva deixa de ser renovada)
+        _falhar(job, job.ultimo_erro or 'Reserva expirou em todas as tentativas')
+        return
+
+    try:
+        resultado = import_string(job.tarefa)(*job.args, **job.kwargs)
+    except Exception:
+        logger.exception('Falha no job %s (%s), tentativa %s', job.pk, job.tarefa, job.tentativas)
+        erro = traceback.format_exc()
+        if job.tentativas >= job.max_tentativas:
+            _falhar(job, erro)
+        else:
+            _repetir(job, erro, timezone.now() + timedelta(seconds=backoff(job.tentativas)))
+        return
+
+    _finalizar(job, status=Job.CONCLUIDO, resultado=_serializavel(resultado), concluido_em=timezone.now())
+
+
+def executar_agora(job_id):
+    """Reserva e executa um job específico na thread atual (JOBS_SINCRONO)."""
+    job = Job.objects.filter(pk=job_id).first()
+    if job is None:
+        return
+    token = uuid.uuid4()
+    reservado = Job.objects.disponiveis(job.fila, timezone.now()).filter(pk=job_id).update(
+        status=Job.EXECUTANDO,
+        token=token,
+        reservado_ate=timezone.now() + timedelta(seconds=config_fila(job.fila)['visibilidade']),
+        tentativas=F('tentativas') + 1,
+    )
+    if reservado:
+        executar(Job.objects.get(pk=job_id))
+
+
+def limpar_concluidos(retencao=RETENCAO_CONCLUIDOS):
+    """Apaga os jobs concluídos há mais que `retencao`. Os que falharam ficam para inspeção."""
+    apagados, _ = Job.objects.filter(
+        status=Job.CONCLUIDO,
+        concluido_em__lt=timezone.now() - retencao,
+    ).delete()
+    return apagados
+
+
+def renovar_reservas(tokens, visibilidade):
+    """Estende por `visibilidade` segundos a reserva dos jobs {token: [ids]} ainda em execução."""
+    reservado_ate = timezone.now() + timedelta(seconds=visibilidade)
+    for token, ids in tokens.items():
+        Job.objects.filter(pk__in=ids, token=token, status=Job.EXECUTANDO).update(reservado_ate=reservado_ate)
+
+
+def garantir_recorrentes():
+    """
+    Chama o agendamento de cada job recorrente (settings.JOBS_RECORRENTES,
+    caminhos de funções sem argumentos). Os agendamentos usam chave, então
+    chamar de novo só confirma que o próximo job existe.
+    """
+    for caminho in getattr(settings, 'JOBS_RECORRENTES', []):
+        try:
+            import_string(caminho)()
+        except Exception:
+            logger.exception('Falha ao agendar o job recorrente %s', caminho)
+
+
+def _repetir(job, erro, executar_em):
+    """
+    Devolve o job à fila para nova tentativa em `executar_em`. Um job com
+    chave não pode voltar a 'pendente' se outro com a mesma chave já estiver
+    pendente (job_pendente_unico_por_chave): nesse caso a tentativa passa
+    para o pendente, antecipado se for o caso, e este job é encerrado.
+    """
+    try:
+        with transaction.atomic():
+            _finalizar(job, status=Job.PENDENTE, ultimo_erro=erro, executar_em=executar_em)
+        return
+    except IntegrityError:
+        if job.chave is None:
+            raise
+
+    with transaction.atomic():
+        pendente = Job.objects.select_for_update().filter(chave=job.chave, status=Job.PENDENTE).first()
+        if pendente is None:
+            # O pendente começou a rodar entre as duas consultas
+            _finalizar(job, status=Job.PENDENTE, ultimo_erro=erro, executar_em=executar_em)
+            return
+        Job.objects.filter(pk=pendente.pk).update(executar_em=Least('executar_em', Value(executar_em)))
+        _finalizar(job, status=Job.FALHOU, ultimo_erro=erro, resultado={'repetido_no_job': pendente.pk})
+
+
+def _falhar(job, erro):
+    """Encerra o job como 'falhou' e chama o `ao_falhar` dele, se houver."""
+    if not _finalizar(job, status=Job.FALHOU, ultimo_erro=erro) or not job.ao_falhar:
+        return
+    try:
+        import_string(job.ao_falhar)(*job.args, **job.kwargs)
+    except Exception:
+        logger.exception('Falha no ao_falhar do job %s (%s)', job.pk, job.ao_falhar)
+
+
+def _finalizar(job, **campos):
+    """Grava o resultado se a reserva ainda for de `job`. Retorna se gravou."""
+    campos.setdefault('reservado_ate', None)
+    campos.setdefault('token', None)
+    if not Job.objects.filter(pk=job.pk, token=job.token).update(**campos):
+        logger.warning('Reserva do job %s expirou antes do fim; resultado descartado', job.pk)
+        return False
+    return True
+
+
+def _serializavel(resultado):
+    try:
+        DjangoJSONEncoder().encode(resultado)
+    except (TypeError, ValueError):
+        return repr(resultado)
+    return resultado
+
+
+class Trabalhador:
+    """
+    Executa jobs das filas com um pool de threads por fila. `acordar` pega
+    jobs para as vagas livres; `executar_ate_parar` consulta as filas
+    periodicamente, ou assim que `avisar()` é chamado, até `parar()`.
+    """
+
+    def __init__(self, nomes_filas=None, intervalo=INTERVALO):
+        self.filas = {nome: config_fila(nome) for nome in (nomes_filas or filas())}
+        self.intervalo = intervalo
+        self.executores = {
+            nome: ThreadPoolExecutor(max_workers=config['concorrencia'], thread_name_prefix=f'jobs-{nome}')
+            for nome, config in self.filas.items()
+        }
+        self.ocupadas = {nome: 0 for nome in self.filas}
+        # Jobs em execução por fila, {id: token}, cujas reservas a thread de
+        # renovação estende; ela renova com folga, três vezes por prazo
+        self.em_execucao = {nome: {} for nome in self.filas}
+        self.intervalo_renovacao = min(config['visibilidade'] for config in self.filas.values()) / 3
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+        self._aviso = threading.Event()
+        self._thread = None
+        self._renovacao = None
+
+    def avisar(self):
+        """Antecipa a próxima consulta às filas (ex.: um job acabou de ser enfileirado)."""
+        self._aviso.set()
+
+    def acordar(self, fila=None):
+        """Reserva jobs para as vagas livres (de `fila` ou de todas). Retorna quantos pegou."""
+        pegos = 0
+        for nome in [fila] if fila else list(self.filas):
+            if nome not in self.filas or self._parar.is_set():
+                continue
+            with self._trava:
+                livres = self.filas[nome]['concorrencia'] - self.ocupadas[nome]
+                if livres <= 0:
+                    continue
+                # Vagas separadas antes da consulta: acordar() roda em várias threads
+                self.ocupadas[nome] += livres
+            try:
+                jobs = reservar(nome, livres, self.filas[nome]['visibilidade'])
+            except Exception:
+                jobs = []
+                logger.exception('Falha ao reservar jobs da fila %s', nome)
+            finally:
+                close_old_connections()
+            with self._trava:
+                self.ocupadas[nome] -= livres - len(jobs)
+                for job in jobs:
+                    self.em_execucao[nome][job.pk] = job.token
+                if jobs and self._renovacao is None:
+                    self._renovacao = threading.Thread(
+                        target=self._renovar_reservas, name='jobs-renovacao', daemon=True,
+                    )
+                    self._renovacao.start()
+            for job in jobs:
+                self.executores[nome].submit(self._rodar, nome, job)
+            pegos += len(jobs)
+        return pegos
+
+    def _rodar(self, fila, job):
+        close_old_connections()
+        try:
+            executar(job)
+        except Exception:
+            logger.exception('Falha ao registrar o resultado do job %s', job.pk)
+        finally:
+            close_old_connections()
+            with self._trava:
+                self.ocupadas[fila] -= 1
+                self.em_execucao[fila].pop(job.pk, None)
+        # Continua esvaziando a fila sem esperar a próxima consulta
+        self.acordar(fila)
+
+    def _renovar_reservas(self):
+        """
+        Thread daemon: estende a reserva dos jobs em execução, inclusive
+        depois de `parar()` enquanto os últimos terminam.
+        """
+        while True:
+            time.sleep(self.intervalo_renovacao)
+            for nome, config in self.filas.items():
+                tokens = {}
+                with self._trava:
+                    for job_id, token in self.em_execucao[nome].items():
+                        tokens.setdefault(token, []).append(job_id)
+                if not tokens:
+                    continue
+                try:
+                    renovar_reservas(tokens, config['visibilidade'])
+                except Exception:
+                    logger.exception('Falha ao renovar as reservas da fila %s', nome)
+            close_old_connections()
+
+    def executar_ate_parar(self, ate_esvaziar=False):
+        """
+        Consulta as filas até `parar()`; com `ate_esvaziar`, termina quando
+        não houver mais jobs disponíveis nem em execução.
+        """
+        proxima_limpeza = proxima_recorrentes = timezone.now()
+        while not self._parar.is_set():
+            if timezone.now() >= proxima_limpeza:
+                try:
+                    limpar_concluidos()
+                except Exception:
+                    logger.exception('Falha ao limpar jobs concluídos')
+                proxima_limpeza = timezone.now() + INTERVALO_LIMPEZA
+            if timezone.now() >= proxima_recorrentes:
+                garantir_recorrentes()
+                proxima_recorrentes = timezone.now() + INTERVALO_RECORRENTES
+
+            pegos = self.acordar()
+            if ate_esvaziar and not pegos:
+                with self._trava:
+                    ocupadas = sum(self.ocupadas.values())
+                if not ocupadas:
+                    break
+            self._aviso.wait(self.intervalo)
+            self._aviso.clear()
+
+    def iniciar(self):
+        """Roda executar_ate_parar numa thread daemon (trabalhador dentro do processo web)."""
+        self._thread = threading.Thread(target=self.executar_ate_parar, name='jobs', daemon=True)
+        self._thread.start()
+
+    def parar(self, esperar=True):
+        """Para de pegar jobs e, com `esperar`, aguarda os que estão em execução."""
+        self._parar.set()
+        self._aviso.set()
+        for executor in self.executores.values():
+            executor.shutdown(wait=esperar)
+
+
+_no_processo = None
+_trava_no_processo = threading.Lock()
+
+
+def no_processo():
+    """Trabalhador do próprio processo (JOBS_TRABALHADOR_NO_PROCESSO), iniciado no primeiro uso."""
+    global _no_processo
+    with _trava_no_processo:
+        if _no_processo is None:
+            _no_processo = Trabalhador(intervalo=INTERVALO_NO_PROCESSO)
+            _no_processo.iniciar()
+    return _no_processo
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notificacao
+from .models import Comunicado, Notificacao
 
 
 @admin.register(Notificacao)
@@ -24,3 +24,22 @@ class NotificacaoAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('usuario')
+
+
+@admin.register(Comunicado)
+class ComunicadoAdmin(admin.ModelAdmin):
+    """Publicar aqui entrega o aviso a todos os usuários (ver comunicados.py)."""
+    list_display = ['id', 'titulo', 'created_at']
+    list_filter = ['created_at']
+    search_fields = ['titulo', 'mensagem']
+    readonly_fields = ['created_at']
+    list_per_page = 50
+
+    fieldsets = (
+        ('Informações Básicas', {
+            'fields': ('titulo', 'mensagem', 'link')
+        }),
+        ('Metadata', {
+            'fields': ('created_at',)
+        }),
+    )
@@ -7,7 +7,4 @@ class NotificacoesConfig(AppConfig):
     verbose_name = 'Notificações'
 
     def ready(self):
-        # Importa sinais para conectar receivers
-        # Usa importlib para evitar problemas de import relativo durante o boot
-        import importlib
-        importlib.import_module('apps.notificacoes.signals')
+        from . import signals  # noqa: F401
@@ -0,0 +1,91 @@
+"""
+Comunicados para todos os usuários com fan-out na leitura.
+
+Publicar um comunicado grava uma única linha (Comunicado), independente de
+quantos usuários existem. Cada usuário enxerga os comunicados publicados a
+partir do seu cadastro junto com as notificações pessoais (ver
+ListNotificacoesView); o estado individual só é gravado quando ele age:
+
+- ler ou excluir um comunicado cria a LeituraComunicado do par;
+- "marcar todas como lidas" só avança ContadorNotificacoes.comunicados_lidos_ate.
+
+Um comunicado está lido para o usuário se tem leitura com `lida_em` ou se
+foi publicado até `comunicados_lidos_ate`.
+"""
+from django.db.models import BooleanField, Case, Exists, OuterRef, Q, Value, When
+from django.utils import timezone
+
+from .models import Comunicado, ContadorNotificacoes, LeituraComunicado
+
+PREFIXO_ID = 'comunicado-'
+
+
+def id_publico(comunicado_id):
+    """Id exposto na API, distinto dos ids das notificações pessoais."""
+    return f'{PREFIXO_ID}{comunicado_id}'
+
+
+def publicar(titulo, mensagem, link=''):
+    """Publica um comunicado para todos os usuários (entrega: ver signals.py)."""
+    return Comunicado.objects.create(titulo=titulo, mensagem=mensagem, link=link or '')
+
+
+def lidos_ate(usuario):
+    return (
+        ContadorNotificacoes.objects.filter(pk=usuario.pk)
+        .values_list('comunicados_lidos_ate', flat=True)
+        .first()
+    )
+
+
+def visiveis(usuario, lidos_ate=None):
+    """Comunicados do usuário (menos os que ele excluiu), anotados com `lida`."""
+    leituras = LeituraComunicado.objects.filter(comunicado=OuterRef('pk'), usuario=usuario)
+    lida = Q(Exists(leituras.filter(lida_em__isnull=False)))
+    if lidos_ate is not None:
+        lida |= Q(created_at__lte=lidos_ate)
+    return (
+        Comunicado.objects.filter(created_at__gte=usuario.date_joined)
+        .filter(~Exists(leituras.filter(excluida=True)))
+        .annotate(lida=Case(When(lida, then=Value(True)), default=Value(False), output_field=BooleanField()))
+    )
+
+
+def nao_lidos(usuario, lidos_ate=None):
+    return visiveis(usuario, lidos_ate).filter(lida=False).count()
+
+
+def total_nao_lidas(usuario):
+    """Notificações pessoais não lidas (contador) mais comunicados não lidos."""
+    contador = (
+        ContadorNotificacoes.objects.filter(pk=usuario.pk)
+        .values_list('nao_lidas', 'comunicados_lidos_ate')
+        .first()
+    )
+    pessoais, ate = contador or (0, None)
+    return pessoais + nao_lidos(usuario, ate)
+
+
+def marcar_lido(usuario, comunicado_id):
+    """Marca o comunicado como lido para o usuário. Retorna o comunicado (anotado) ou None."""
+    comunicado = visiveis(usuario).filter(pk=comunicado_id).first()
+    if comunicado is None:
+        return None
+    leitura, _ = LeituraComunicado.objects.get_or_create(usuario=usuario, comunicado=comunicado)
+    # Condicional para manter a data da primeira leitura
+    LeituraComunicado.objects.filter(pk=leitura.pk, lida_em__isnull=True).update(lida_em=timezone.now())
+    comunicado.lida = True
+    return comunicado
+
+
+def excluir(usuario, comunicado_id):
+    """Esconde o comunicado das notificações do usuário. Retorna False se não existe."""
+    if not visiveis(usuario).filter(pk=comunicado_id).exists():
+        return False
+    LeituraComunicado.objects.update_or_create(
+        usuario=usuario,
+        comunicado_id=comunicado_id,
+        defaults={'excluida': True},
+    )
+    return True
+
@@ -0,0 +1,48 @@
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from . import comunicados, tempo_real
+
+# Fechamento sem usuário autenticado (token ausente, inválido ou expirado)
+CODIGO_NAO_AUTENTICADO = 4401
+
+
+class NotificacaoConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Canal de notificações do usuário autenticado (ver tempo_real.py).
+    Ao conectar recebe o total de não lidas; depois, cada notificação nova
+    (ou comunicado) junto com o incremento do total, e o total recalculado
+    quando ele diminui.
+    """
+
+    async def connect(self):
+        usuario = self.scope.get('user')
+        if usuario is None or not usuario.is_authenticated:
+            await self.close(code=CODIGO_NAO_AUTENTICADO)
+            return
+
+        self.grupo = tempo_real.grupo(usuario.pk)
+        await self.channel_layer.group_add(self.grupo, self.channel_name)
+        await self.channel_layer.group_add(tempo_real.GRUPO_TODOS, self.channel_name)
+        await self.accept()
+
+        nao_lidas = await database_sync_to_async(comunicados.total_nao_lidas)(usuario)
+        await self.send_json({'type': 'contador', 'nao_lidas': nao_lidas})
+
+    async def disconnect(self, close_code):
+        if hasattr(self, 'grupo'):
+            await self.channel_layer.group_discard(self.grupo, self.channel_name)
+            await self.channel_layer.group_discard(tempo_real.GRUPO_TODOS, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # O canal é só de saída; o cliente pode mandar 'ping' para manter a conexão
+        if content.get('type') == 'ping':
+            await self.send_json({'type': 'pong'})
+
+    async def notificacoes_atualizadas(self, event):
+        for notificacao in event['notificacoes']:
+            await self.send_json({'type': 'notificacao', 'notificacao': notificacao})
+        if 'nao_lidas' in event:
+            await self.send_json({'type': 'contador', 'nao_lidas': event['nao_lidas']})
+        elif event.get('incremento'):
+            await self.send_json({'type': 'contador', 'incremento': event['incremento']})
@@ -0,0 +1,120 @@
+"""
+Notificações em lote para os inscritos confirmados de um evento.
+
+`notificar_inscritos` lê só os inscritos que ainda não têm a notificação
+(NOT EXISTS) e a insere com bulk_create em lotes, cada lote na sua própria
+transação. Cada lote trava os contadores de não lidas dos destinatários e
+relê quem já foi notificado antes de inserir, então execuções simultâneas
+não duplicam nem desalinham os contadores; a restrição única (usuario,
+tipo, evento, data_referencia) garante o resto. Se o processo cair no meio,
+rodar de novo completa o que faltou.
+"""
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from apps.eventos.models import Evento
+from apps.inscricoes.models import Inscricao
+from .models import ContadorNotificacoes, Notificacao
+
+TAMANHO_LOTE = 5000
+
+
+def pendentes(evento_id, tipo, data_referencia):
+    """Inscrições confirmadas no evento cujo usuário ainda não recebeu a notificação."""
+    ja_notificado = Notificacao.objects.filter(
+        usuario_id=OuterRef('usuario_id'),
+        tipo=tipo,
+        evento_id=evento_id,
+        data_referencia=data_referencia,
+    )
+    return (
+        Inscricao.objects.filter(evento_id=evento_id, status='confirmada')
+        .filter(~Exists(ja_notificado))
+        .order_by('id')
+    )
+
+
+def notificar_inscritos(evento_id, tipo, titulo, mensagem, data_referencia, link=None,
+                        tamanho_lote=TAMANHO_LOTE, progresso=None):
+    """
+    Notifica os inscritos confirmados que faltam. `progresso(n)` é chamado
+    a cada lote completo. Retorna quantas notificações foram criadas.
+    """
+    link = link if link is not None else f'/evento/{evento_id}'
+
+    lidos = 0
+    criadas = 0
+    ultimo_id = None
+    while True:
+        # Paginação por id em vez de iterator(): cada leitura termina antes
+        # da escrita do lote, sem cursor aberto segurando o banco (no SQLite
+        # um leitor pendente impede o commit de outra execução)
+        inscricoes = pendentes(evento_id, tipo, data_referencia)
+        if ultimo_id is not None:
+            inscricoes = inscricoes.filter(id__gt=ultimo_id)
+        lote = list(inscricoes.values_list('id', 'usuario_id')[:tamanho_lote])
+        if not lote:
+            break
+        ultimo_id = lote[-1][0]
+
+        criadas += _inserir([
+            Notificacao(
+                usuario_id=usuario_id,
+                tipo=tipo,
+                titulo=titulo,
+                mensagem=mensagem,
+                link=link,
+                lida=False,
+                evento_id=evento_id,
+                data_referencia=data_referencia,
+            )
+            for _, usuario_id in lote
+        ])
+        lidos += len(lote)
+        if progresso and len(lote) == tamanho_lote:
+            progresso(lidos)
+
+    return criadas
+
+
+def _inserir(lote):
+    """Insere as notificações do lote que ainda não existem. Retorna quantas."""
+    modelo = lote[0]
+    usuario_ids = [notificacao.usuario_id for notificacao in lote]
+    with transaction.atomic():
+        # Uma execução concorrente para os mesmos usuários espera aqui e, na
+        # releitura abaixo, já enxerga as notificações deste lote
+        ContadorNotificacoes.travar(usuario_ids)
+        ja_notificados = set(
+            Notificacao.objects.filter(
+                usuario_id__in=usuario_ids,
+                tipo=modelo.tipo,
+                evento_id=modelo.evento_id,
+                data_referencia=modelo.data_referencia,
+            ).values_list('usuario_id', flat=True)
+        )
+        novas = [notificacao for notificacao in lote if notificacao.usuario_id not in ja_notificados]
+        Notificacao.objects.bulk_create(novas)
+    return len(novas)
+
+
+def notificar_cancelamento(evento_id, tamanho_lote=TAMANHO_LOTE):
+    """
+    Avisa os inscritos confirmados de que o evento foi cancelado. A chave
+    de deduplicação é a data do evento: um aviso por inscrito, a menos que
+    o evento seja remarcado e cancelado de novo.
+    """
+    evento = Evento.objects.filter(pk=evento_id, status='cancelado').only('id', 'titulo', 'data_evento').first()
+    if evento is None:
+        # Reaberto antes de a tarefa rodar
+        return 0
+
+    return notificar_inscritos(
+        evento.pk,
+        tipo='evento_cancelado',
+        titulo='Evento cancelado',
+        mensagem=f'Infelizmente o evento "{evento.titulo}" foi cancelado.',
+        data_referencia=timezone.localdate(evento.data_evento),
+        tamanho_lote=tamanho_lote,
+    )
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from apps.notificacoes.models import ContadorNotificacoes, Notificacao
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount unread notifications and fix drift in ContadorNotificacoes.nao_lidas "
+        "(including users with unread notifications but no counter). Meant to run periodically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report users whose counter drifted, without fixing them",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ContadorNotificacoes.LOTE,
+            help=f"Counters recounted per transaction (default: {ContadorNotificacoes.LOTE})",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options.get("dry_run", False)
+        tamanho_lote = options["batch_size"]
+
+        reais = (
+            Notificacao.objects.filter(usuario=OuterRef("pk"), lida=False)
+            .order_by()
+            .values("usuario")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        divergentes = (
+            ContadorNotificacoes.objects.annotate(
+                reais=Coalesce(Subquery(reais, output_field=IntegerField()), Value(0))
+            )
+            .filter(~Q(nao_lidas=F("reais")))
+            .values_list("usuario_id", "nao_lidas", "reais")
+        )
+        sem_contador = (
+            Notificacao.objects.filter(lida=False, usuario__contador_notificacoes__isnull=True)
+            .order_by("usuario_id")
+            .values_list("usuario_id", flat=True)
+            .distinct()
+        )
+
+        usuario_ids = []
+        for usuario_id, armazenado, real in divergentes.iterator():
+            self.stdout.write(f" - user {usuario_id}: stored {armazenado}, actual {real}")
+            usuario_ids.append(usuario_id)
+        for usuario_id in sem_contador.iterator():
+            self.stdout.write(f" - user {usuario_id}: missing counter")
+            usuario_ids.append(usuario_id)
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"\nDry-run complete. {len(usuario_ids)} counter(s) would change."))
+            return
+
+        # A recontagem de cada lote é feita de novo sob lock (ver
+        # ContadorNotificacoes.recontar), então o que mudou desde a
+        # leitura acima não é sobrescrito.
+        corrigidos = 0
+        for inicio in range(0, len(usuario_ids), tamanho_lote):
+            corrigidos += ContadorNotificacoes.recontar(usuario_ids[inicio:inicio + tamanho_lote])
+
+        self.stdout.write(self.style.SUCCESS(f"\nDone. Counters fixed: {corrigidos}"))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.eventos.models import Evento
+from apps.notificacoes import lotes
+
+
+class Command(BaseCommand):
+    help = (
+        "Notify confirmed attendees of cancelled upcoming events who were not notified yet. "
+        "Cancellations are normally fanned out in the background; this resumes interrupted runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            dest="evento_id",
+            help="Only process this event id",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=lotes.TAMANHO_LOTE,
+            help=f"Notifications inserted per batch (default: {lotes.TAMANHO_LOTE})",
+        )
+
+    def handle(self, *args, **options):
+        eventos = Evento.objects.filter(status="cancelado")
+        if options["evento_id"]:
+            eventos = eventos.filter(pk=options["evento_id"])
+        else:
+            eventos = eventos.filter(data_evento__gte=timezone.now())
+
+        total_created = 0
+        for evento_id, titulo in eventos.values_list("id", "titulo"):
+            created = lotes.notificar_cancelamento(evento_id, tamanho_lote=options["chunk_size"])
+            if created:
+                self.stdout.write(f" - {titulo}: created {created} notifications")
+            total_created += created
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Total notifications created: {total_created}"))
@@ -1,10 +1,11 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from datetime import datetime, date, time as dtime, timedelta
+from datetime import datetime, time as dtime, timedelta
 
 from apps.eventos.models import Evento
-from apps.inscricoes.models import Inscricao
-from apps.notificacoes.models import Notificacao
+from apps.notificacoes import lotes
+
+TIPO = "evento_proximo"
 
 
 class Command(BaseCommand):
@@ -23,64 +24,58 @@ class Command(BaseCommand):
             action="store_true",
             help="Do not create notifications, only print what would happen",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Registrations read and notifications inserted per batch (default: 5000)",
+        )
 
     def handle(self, *args, **options):
-        days_list = sorted(set(options["--days"])) if "--days" in options else options["days"]
+        days_list = sorted(set(options["days"]))
         dry_run = options.get("dry_run", False)
+        chunk_size = options["chunk_size"]
 
         now = timezone.now()
         tz = timezone.get_current_timezone()
+        hoje = timezone.localdate(now)
 
         total_created = 0
         for days in days_list:
-            target_local_date = timezone.localdate(now) + timedelta(days=days)
+            target_local_date = hoje + timedelta(days=days)
             start_dt = timezone.make_aware(datetime.combine(target_local_date, dtime.min), tz)
             end_dt = timezone.make_aware(datetime.combine(target_local_date, dtime.max), tz)
 
-            eventos = Evento.objects.filter(
-                data_evento__range=(start_dt, end_dt),
-                status__in=["publicado", "em_andamento"],
+            eventos = list(
+                Evento.objects.filter(
+                    data_evento__range=(start_dt, end_dt),
+                    status__in=["publicado", "em_andamento"],
+                ).values_list("id", "titulo")
             )
 
             self.stdout.write(self.style.MIGRATE_HEADING(f"\n[Reminders] {days} day(s) before: {target_local_date.isoformat()}"))
-            self.stdout.write(f"Found {eventos.count()} event(s)")
-
-            for evento in eventos:
-                # confirmed attendees
-                inscricoes = Inscricao.objects.filter(evento=evento, status="confirmada").select_related("usuario")
-                self.stdout.write(f" - {evento.titulo}: {inscricoes.count()} confirmed")
-
-                bulk = []
-                for insc in inscricoes:
-                    usuario = insc.usuario
-                    # Avoid duplicates: one reminder per user/event/day per run-day
-                    exists = Notificacao.objects.filter(
-                        usuario=usuario,
-                        tipo="evento_proximo",
-                        link=f"/evento/{evento.id}",
-                        created_at__date=timezone.localdate(now),
-                    ).exists()
-                    if exists:
-                        continue
+            self.stdout.write(f"Found {len(eventos)} event(s)")
 
-                    msg = self._mensagem(evento, days)
-                    notif = Notificacao(
-                        usuario=usuario,
-                        tipo="evento_proximo",
-                        titulo="Evento próximo",
-                        mensagem=msg,
-                        link=f"/evento/{evento.id}",
-                        lida=False,
-                    )
-                    bulk.append(notif)
+            for evento_id, titulo in eventos:
+                if dry_run:
+                    pendentes = lotes.pendentes(evento_id, TIPO, hoje).count()
+                    self.stdout.write(self.style.WARNING(f" - {titulo}: would create {pendentes} notifications"))
+                    continue
 
-                if bulk:
-                    if dry_run:
-                        self.stdout.write(self.style.WARNING(f"   Would create {len(bulk)} notifications"))
-                    else:
-                        Notificacao.objects.bulk_create(bulk)
-                        total_created += len(bulk)
-                        self.stdout.write(self.style.SUCCESS(f"   Created {len(bulk)} notifications"))
+                self.stdout.write(f" - {titulo}")
+                # Um lembrete por usuário/evento por dia de execução; rodar de
+                # novo (ou em paralelo) não duplica
+                created = lotes.notificar_inscritos(
+                    evento_id,
+                    tipo=TIPO,
+                    titulo="Evento próximo",
+                    mensagem=self._mensagem(titulo, days),
+                    data_referencia=hoje,
+                    tamanho_lote=chunk_size,
+                    progresso=lambda lidos: self.stdout.write(f"   ... {lidos} processed"),
+                )
+                total_created += created
+                self.stdout.write(self.style.SUCCESS(f"   Created {created} notifications"))
 
         if dry_run:
             self.stdout.write(self.style.WARNING("\nDry-run complete. No notifications were created."))
@@ -88,9 +83,9 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f"\nDone. Total notifications created: {total_created}"))
 
     @staticmethod
-    def _mensagem(evento: Evento, days: int) -> str:
+    def _mensagem(titulo: str, days: int) -> str:
         if days <= 0:
-            return f'O evento "{evento.titulo}" é hoje!'
+            return f'O evento "{titulo}" é hoje!'
         if days == 1:
-            return f'O evento "{evento.titulo}" é amanhã! Não se esqueça.'
-        return f'O evento "{evento.titulo}" acontece em {days} dias.'
+            return f'O evento "{titulo}" é amanhã! Não se esqueça.'
+        return f'O evento "{titulo}" acontece em {days} dias.'
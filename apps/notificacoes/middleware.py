@@ -0,0 +1,35 @@
+"""
+Autenticação JWT para conexões WebSocket.
+
+O navegador não envia cabeçalhos customizados no handshake do WebSocket,
+então o mesmo token de acesso usado na API REST vai na query string
+(`?token=<access>`). Um token válido define `scope['user']`; sem token,
+vale o usuário da sessão definido pelo AuthMiddlewareStack.
+"""
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+
+@database_sync_to_async
+def _usuario_do_token(token):
+    autenticacao = JWTAuthentication()
+    try:
+        usuario = autenticacao.get_user(autenticacao.get_validated_token(token))
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return AnonymousUser()
+    return usuario if usuario.is_active else AnonymousUser()
+
+
+class JWTAuthMiddleware:
+    def __init__(self, inner):
+        self.inner = inner
+
+    async def __call__(self, scope, receive, send):
+        token = parse_qs(scope.get('query_string', b'').decode()).get('token')
+        if token:
+            scope = dict(scope, user=await _usuario_do_token(token[0]))
+        return await self.inner(scope, receive, send)
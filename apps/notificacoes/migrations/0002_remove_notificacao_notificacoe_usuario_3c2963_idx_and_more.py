@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificacoes', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notificacao',
+            name='notificacoe_usuario_3c2963_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notificacao',
+            index=models.Index(fields=['usuario', '-created_at', '-id'], name='notificacao_usuario_criada_idx'),
+        ),
+    ]
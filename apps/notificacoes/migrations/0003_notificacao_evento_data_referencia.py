@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:35
+
+import uuid
+from datetime import datetime, time
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def chavear_lembretes_de_hoje(apps, schema_editor):
+    """
+    Preenche evento/data_referencia nos lembretes criados hoje, para que
+    rodar send_event_reminders de novo no dia da atualização não duplique.
+    """
+    Notificacao = apps.get_model('notificacoes', 'Notificacao')
+    Evento = apps.get_model('eventos', 'Evento')
+
+    hoje = timezone.localdate()
+    inicio = timezone.make_aware(datetime.combine(hoje, time.min))
+    lembretes = (
+        Notificacao.objects.filter(tipo='evento_proximo', created_at__gte=inicio, link__startswith='/evento/')
+        .order_by('id')
+        .values_list('id', 'usuario_id', 'link')
+    )
+
+    por_evento = {}
+    for notificacao_id, usuario_id, link in lembretes.iterator(chunk_size=2000):
+        try:
+            evento_id = uuid.UUID(link.rstrip('/').rsplit('/', 1)[-1])
+        except ValueError:
+            continue
+        # Só a primeira de cada usuário/evento recebe a chave
+        por_evento.setdefault(evento_id, {}).setdefault(usuario_id, notificacao_id)
+
+    existentes = set(Evento.objects.filter(pk__in=list(por_evento)).values_list('pk', flat=True))
+    for evento_id, notificacoes in por_evento.items():
+        if evento_id in existentes:
+            Notificacao.objects.filter(pk__in=list(notificacoes.values())).update(
+                evento_id=evento_id, data_referencia=hoje
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0008_evento_reservas_ativas'),
+        ('notificacoes', '0002_remove_notificacao_notificacoe_usuario_3c2963_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificacao',
+            name='data_referencia',
+            field=models.DateField(blank=True, help_text='Dia a que a notificação se refere; com usuário, tipo e evento evita duplicatas', null=True, verbose_name='Data de referência'),
+        ),
+        migrations.AddField(
+            model_name='notificacao',
+            name='evento',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notificacoes', to='eventos.evento', verbose_name='Evento'),
+        ),
+        migrations.RunPython(chavear_lembretes_de_hoje, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notificacao',
+            constraint=models.UniqueConstraint(condition=models.Q(('data_referencia__isnull', False)), fields=('usuario', 'tipo', 'evento', 'data_referencia'), name='notificacao_unica_por_dia'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificacoes', '0003_notificacao_evento_data_referencia'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notificacao',
+            name='tipo',
+            field=models.CharField(choices=[('vaga_lista_espera', 'Vaga na Lista de Espera'), ('evento_proximo', 'Evento Próximo'), ('transferencia_aprovada', 'Transferência Aprovada'), ('transferencia_recusada', 'Transferência Recusada'), ('transferencia_recebida', 'Solicitação de Transferência Recebida'), ('inscricao_confirmada', 'Inscrição Confirmada'), ('evento_cancelado', 'Evento Cancelado'), ('checkin_lembrete', 'Lembrete de Check-in'), ('avaliacao_pendente', 'Avaliação Pendente'), ('documento_aprovado', 'Documento Aprovado'), ('documento_rejeitado', 'Documento Rejeitado'), ('sistema', 'Notificação do Sistema')], max_length=50, verbose_name='Tipo'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def preencher_contadores(apps, schema_editor):
+    """Cria os contadores de quem já tem notificações não lidas."""
+    Notificacao = apps.get_model('notificacoes', 'Notificacao')
+    ContadorNotificacoes = apps.get_model('notificacoes', 'ContadorNotificacoes')
+
+    totais = (
+        Notificacao.objects.filter(lida=False)
+        .values_list('usuario_id')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    lote = []
+    for usuario_id, total in totais.iterator(chunk_size=5000):
+        lote.append(ContadorNotificacoes(usuario_id=usuario_id, nao_lidas=total))
+        if len(lote) >= 5000:
+            ContadorNotificacoes.objects.bulk_create(lote)
+            lote = []
+    ContadorNotificacoes.objects.bulk_create(lote)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificacoes', '0004_notificacao_tipo_evento_cancelado'),
+        ('users', '0002_customuser_variantes_imagem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorNotificacoes',
+            fields=[
+                ('usuario', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='contador_notificacoes', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+                ('nao_lidas', models.IntegerField(default=0, verbose_name='Não lidas')),
+            ],
+            options={
+                'verbose_name': 'Contador de notificações',
+                'verbose_name_plural': 'Contadores de notificações',
+            },
+        ),
+        migrations.RunPython(preencher_contadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificacoes', '0005_contadornotificacoes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Comunicado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('titulo', models.CharField(max_length=200, verbose_name='Título')),
+                ('mensagem', models.TextField(verbose_name='Mensagem')),
+                ('link', models.CharField(blank=True, help_text='Link para redirecionar quando o comunicado for clicado', max_length=500, verbose_name='Link')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Publicado em')),
+            ],
+            options={
+                'verbose_name': 'Comunicado',
+                'verbose_name_plural': 'Comunicados',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='contadornotificacoes',
+            name='comunicados_lidos_ate',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Comunicados lidos até'),
+        ),
+        migrations.CreateModel(
+            name='LeituraComunicado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lida_em', models.DateTimeField(blank=True, null=True, verbose_name='Lida em')),
+                ('excluida', models.BooleanField(default=False, verbose_name='Excluída')),
+                ('comunicado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leituras', to='notificacoes.comunicado', verbose_name='Comunicado')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leituras_comunicados', to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+            ],
+            options={
+                'verbose_name': 'Leitura de comunicado',
+                'verbose_name_plural': 'Leituras de comunicados',
+                'constraints': [models.UniqueConstraint(fields=('usuario', 'comunicado'), name='leitura_comunicado_unica')],
+            },
+        ),
+    ]
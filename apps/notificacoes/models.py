@@ -1,10 +1,61 @@
-from django.db import models
+from collections import Counter, defaultdict
+
+from django.db import models, transaction
+from django.db.models import Count, F
 from django.contrib.auth import get_user_model
 
+from apps.tracking import RastreiaCampos
+
 User = get_user_model()
 
 
-class Notificacao(models.Model):
+class NotificacaoQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, tempo_real=True, **kwargs):
+        """
+        bulk_create não passa pelo save(): o contador de não lidas e o envio
+        em tempo real são feitos aqui. Com ignore_conflicts não dá para saber
+        quais linhas entraram; trave os contadores e filtre antes (ver lotes.py).
+        Com tempo_real=False (ou acima de tempo_real.MAX_LOTE) nada é enviado
+        pelo WebSocket; os destinatários veem as notificações pelo polling.
+        """
+        from . import tempo_real as envio
+
+        with transaction.atomic():
+            criadas = super().bulk_create(objs, *args, **kwargs)
+            ContadorNotificacoes.ajustar(Counter(n.usuario_id for n in criadas if not n.lida))
+        if tempo_real:
+            envio.enviar(criadas)
+        return criadas
+
+    def nao_lidas_por_usuario(self):
+        """{usuario_id: não lidas} das notificações do queryset, num único GROUP BY."""
+        return dict(
+            self.filter(lida=False)
+            .values_list('usuario_id')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+
+    def delete(self):
+        """
+        Exclusão em massa: desconta do contador as não lidas de cada usuário,
+        contadas com um GROUP BY antes do DELETE. Sem receivers de exclusão
+        em Notificacao, o Django apaga em massa também nas cascatas; as de
+        Evento são descontadas em signals.py e as de usuário levam o
+        contador junto.
+        """
+        with transaction.atomic():
+            deltas = {usuario_id: -total for usuario_id, total in self.nao_lidas_por_usuario().items()}
+            resultado = self._excluir()
+            ContadorNotificacoes.ajustar(deltas)
+        return resultado
+
+    def _excluir(self):
+        # DELETE sem ajuste do contador (quem chama ajusta)
+        return super().delete()
+
+
+class Notificacao(RastreiaCampos, models.Model):
     """
     Modelo para armazenar notificações do sistema.
     Suporta diferentes tipos de alertas para engajamento do usuário.
@@ -17,6 +68,7 @@ class Notificacao(models.Model):
         ('transferencia_recusada', 'Transferência Recusada'),
         ('transferencia_recebida', 'Solicitação de Transferência Recebida'),
         ('inscricao_confirmada', 'Inscrição Confirmada'),
+        ('evento_cancelado', 'Evento Cancelado'),
         ('checkin_lembrete', 'Lembrete de Check-in'),
         ('avaliacao_pendente', 'Avaliação Pendente'),
         ('documento_aprovado', 'Documento Aprovado'),
@@ -52,19 +104,48 @@ class Notificacao(models.Model):
         help_text='Link para redirecionar quando a notificação for clicada',
         verbose_name='Link'
     )
+    evento = models.ForeignKey(
+        'eventos.Evento',
+        on_delete=models.CASCADE,
+        related_name='notificacoes',
+        blank=True,
+        null=True,
+        verbose_name='Evento'
+    )
+    data_referencia = models.DateField(
+        blank=True,
+        null=True,
+        help_text='Dia a que a notificação se refere; com usuário, tipo e evento evita duplicatas',
+        verbose_name='Data de referência'
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Criada em'
     )
+
+    objects = NotificacaoQuerySet.as_manager()
+
+    # Mudanças de `lida` ajustam ContadorNotificacoes (ver signals.py)
+    CAMPOS_RASTREADOS = ('lida',)
+    CAMPO_TRANSICAO = 'lida'
     
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Notificação'
         verbose_name_plural = 'Notificações'
         indexes = [
-            models.Index(fields=['usuario', '-created_at']),
+            models.Index(fields=['usuario', '-created_at', '-id'], name='notificacao_usuario_criada_idx'),
             models.Index(fields=['usuario', 'lida']),
         ]
+        constraints = [
+            # Notificações geradas em lote (ex.: lembretes) são idempotentes:
+            # no máximo uma por usuário/tipo/evento/dia
+            models.UniqueConstraint(
+                fields=['usuario', 'tipo', 'evento', 'data_referencia'],
+                condition=models.Q(data_referencia__isnull=False),
+                name='notificacao_unica_por_dia',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.get_tipo_display()} - {self.usuario.username} - {self.created_at.strftime('%d/%m/%Y %H:%M')}"
@@ -82,7 +163,195 @@ class Notificacao(models.Model):
             link=link
         )
     
+    def save(self, *args, **kwargs):
+        # A notificação e o ajuste do contador entram juntos ou nenhum entra
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """
+        Exclui a notificação. O DELETE condicional (lida = false) decide se
+        o contador é descontado: se ela foi marcada como lida no meio, o
+        desconto já foi feito por marcar_como_lida e não se repete.
+        """
+        with transaction.atomic():
+            excluidas, por_modelo = type(self).objects.filter(pk=self.pk, lida=False)._excluir()
+            if excluidas:
+                ContadorNotificacoes.ajustar({self.usuario_id: -1})
+            else:
+                excluidas, por_modelo = type(self).objects.filter(pk=self.pk)._excluir()
+        self.pk = None
+        return excluidas, por_modelo
+
     def marcar_como_lida(self):
-        """Marca a notificação como lida."""
+        """Marca a notificação como lida (só desconta do contador se ainda não estava)."""
+        with transaction.atomic():
+            marcada = type(self).objects.filter(pk=self.pk, lida=False).update(lida=True)
+            if marcada:
+                ContadorNotificacoes.ajustar({self.usuario_id: -1})
         self.lida = True
-        self.save(update_fields=['lida'])
+        self._registrar_valores_carregados(['lida'])
+
+
+class ContadorNotificacoes(models.Model):
+    """
+    Total de notificações não lidas de cada usuário, mantido a cada
+    criação, leitura e exclusão para que o contador do sino seja uma
+    leitura por chave primária. O comando reconcile_notification_counters
+    corrige eventuais desvios.
+    """
+
+    LOTE = 5000
+
+    usuario = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='contador_notificacoes',
+        verbose_name='Usuário'
+    )
+    nao_lidas = models.IntegerField(
+        default=0,
+        verbose_name='Não lidas'
+    )
+    # "Marcar todas como lidas" também vale para os comunicados publicados até aqui
+    comunicados_lidos_ate = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Comunicados lidos até'
+    )
+
+    class Meta:
+        verbose_name = 'Contador de notificações'
+        verbose_name_plural = 'Contadores de notificações'
+
+    def __str__(self):
+        return f"{self.usuario_id}: {self.nao_lidas}"
+
+    @classmethod
+    def nao_lidas_de(cls, usuario_id):
+        return cls.objects.filter(pk=usuario_id).values_list('nao_lidas', flat=True).first() or 0
+
+    @classmethod
+    def ajustar(cls, deltas):
+        """
+        Soma {usuario_id: delta} aos contadores com UPDATEs atômicos, um por
+        valor de delta. Se faltar o contador de algum usuário (ainda não
+        recebeu notificação), o lote é recontado (ver recontar).
+        """
+        por_delta = defaultdict(list)
+        for usuario_id, delta in deltas.items():
+            if delta:
+                por_delta[delta].append(usuario_id)
+
+        for delta, usuario_ids in por_delta.items():
+            for inicio in range(0, len(usuario_ids), cls.LOTE):
+                lote = usuario_ids[inicio:inicio + cls.LOTE]
+                atualizados = cls.objects.filter(pk__in=lote).update(nao_lidas=F('nao_lidas') + delta)
+                if atualizados < len(lote) and delta > 0:
+                    cls.recontar(lote)
+
+    @classmethod
+    def travar(cls, usuario_ids):
+        """
+        Cria os contadores que faltam e trava (select_for_update, em ordem
+        de usuário) os de `usuario_ids` até o fim da transação.
+        """
+        cls.objects.bulk_create([cls(usuario_id=usuario_id) for usuario_id in usuario_ids], ignore_conflicts=True)
+        list(cls.objects.select_for_update().filter(pk__in=usuario_ids).order_by('pk').values_list('pk', flat=True))
+
+    @classmethod
+    def recontar(cls, usuario_ids):
+        """
+        Recalcula os contadores a partir das notificações, sob lock: quem
+        cria notificações para esses usuários espera o commit e aplica seu
+        incremento sobre o valor corrigido. Retorna quantos mudaram.
+        """
+        with transaction.atomic():
+            cls.travar(usuario_ids)
+            reais = dict(
+                Notificacao.objects.filter(usuario_id__in=usuario_ids, lida=False)
+                .values_list('usuario_id')
+                .annotate(total=Count('id'))
+                .order_by()
+            )
+            divergentes = defaultdict(list)
+            for usuario_id, nao_lidas in cls.objects.filter(pk__in=usuario_ids).values_list('pk', 'nao_lidas'):
+                if nao_lidas != reais.get(usuario_id, 0):
+                    divergentes[reais.get(usuario_id, 0)].append(usuario_id)
+            for total, ids in divergentes.items():
+                cls.objects.filter(pk__in=ids).update(nao_lidas=total)
+        return sum(len(ids) for ids in divergentes.values())
+
+
+
+class Comunicado(models.Model):
+    """
+    Aviso do sistema para todos os usuários, gravado uma única vez. Cada
+    usuário vê, junto com as notificações pessoais, os comunicados
+    publicados depois do seu cadastro; ler ou excluir um comunicado cria
+    a LeituraComunicado daquele usuário sob demanda (ver comunicados.py).
+    """
+
+    titulo = models.CharField(
+        max_length=200,
+        verbose_name='Título'
+    )
+    mensagem = models.TextField(
+        verbose_name='Mensagem'
+    )
+    link = models.CharField(
+        max_length=500,
+        blank=True,
+        help_text='Link para redirecionar quando o comunicado for clicado',
+        verbose_name='Link'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name='Publicado em'
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Comunicado'
+        verbose_name_plural = 'Comunicados'
+
+    def __str__(self):
+        return f"{self.titulo} - {self.created_at.strftime('%d/%m/%Y %H:%M')}"
+
+
+class LeituraComunicado(models.Model):
+    """Leitura ou exclusão de um comunicado por um usuário."""
+
+    comunicado = models.ForeignKey(
+        Comunicado,
+        on_delete=models.CASCADE,
+        related_name='leituras',
+        verbose_name='Comunicado'
+    )
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='leituras_comunicados',
+        verbose_name='Usuário'
+    )
+    lida_em = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Lida em'
+    )
+    excluida = models.BooleanField(
+        default=False,
+        verbose_name='Excluída'
+    )
+
+    class Meta:
+        verbose_name = 'Leitura de comunicado'
+        verbose_name_plural = 'Leituras de comunicados'
+        constraints = [
+            models.UniqueConstraint(fields=['usuario', 'comunicado'], name='leitura_comunicado_unica'),
+        ]
+
+    def __str__(self):
+        return f"{self.usuario_id} - {self.comunicado_id}"
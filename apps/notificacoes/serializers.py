@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Notificacao
+from . import comunicados
+from .models import Comunicado, Notificacao
 
 
 class NotificacaoSerializer(serializers.ModelSerializer):
@@ -42,3 +43,31 @@ class NotificacaoSerializer(serializers.ModelSerializer):
             return f'Há {dias} dia{"s" if dias > 1 else ""}'
         else:
             return obj.created_at.strftime('%d/%m/%Y')
+
+
+class ComunicadoSerializer(serializers.ModelSerializer):
+    """
+    Comunicado no mesmo formato de NotificacaoSerializer, para a listagem
+    misturar os dois. Espera a anotação `lida` de comunicados.visiveis().
+    """
+    id = serializers.SerializerMethodField()
+    tipo = serializers.SerializerMethodField()
+    tipo_display = serializers.SerializerMethodField()
+    lida = serializers.BooleanField(read_only=True)
+    tempo_decorrido = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Comunicado
+        fields = NotificacaoSerializer.Meta.fields
+        read_only_fields = fields
+
+    def get_id(self, obj):
+        return comunicados.id_publico(obj.pk)
+
+    def get_tipo(self, obj):
+        return 'sistema'
+
+    def get_tipo_display(self, obj):
+        return dict(Notificacao.TIPO_CHOICES)['sistema']
+
+    get_tempo_decorrido = NotificacaoSerializer.get_tempo_decorrido
@@ -1,75 +1,74 @@
-from django.db.models.signals import pre_save, post_save
+from collections import Counter
+
+from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
 
-# Usaremos utils para criar notificações
-from .utils import (
-    criar_notificacao_inscricao_confirmada,
-    criar_notificacao_evento_cancelado,
-)
+from apps.background import executar_apos_commit
+from apps.eventos.models import Evento
+from apps.inscricoes.models import Inscricao
+from apps.tracking import transicao_status
+from . import lotes, tempo_real
+from .models import Comunicado, ContadorNotificacoes, Notificacao
+from .utils import criar_notificacoes_inscricao_confirmada
+
 
+@receiver(transicao_status, sender=Inscricao)
+def notificar_inscricoes_confirmadas(sender, instancias, novo, **kwargs):
+    """Inscrições que passaram a confirmada (inclusive criadas já confirmadas)."""
+    if novo == 'confirmada':
+        criar_notificacoes_inscricao_confirmada(instancias)
 
-@receiver(pre_save, sender=None)
-def marcar_transicoes(sender, instance, **kwargs):
+
+@receiver(transicao_status, sender=Evento)
+def notificar_evento_cancelado(sender, instancias, novo, criado, **kwargs):
     """
-    Marca flags em instances antes de salvar para detectar transições de estado
-    nas models Inscricao e Evento sem criar acoplamento forte via imports no topo.
+    Evento cancelado -> notificar todos os inscritos confirmados, fora da
+    requisição e em lotes (ver lotes.notificar_cancelamento).
     """
-    # Importes locais para evitar import circular
-    try:
-        from apps.inscricoes.models import Inscricao
-    except Exception:
-        Inscricao = None
-    try:
-        from apps.eventos.models import Evento
-    except Exception:
-        Evento = None
+    if novo != 'cancelado' or criado:
+        return
+    for evento in instancias:
+        executar_apos_commit(lotes.notificar_cancelamento, evento.pk)
+
 
-    # Transição de Inscricao -> status confirmada
-    if Inscricao and isinstance(instance, Inscricao) and instance.pk:
-        try:
-            antigo = Inscricao.objects.get(pk=instance.pk)
-            if antigo.status != 'confirmada' and instance.status == 'confirmada':
-                setattr(instance, '_notify_confirmed', True)
-        except Inscricao.DoesNotExist:
-            pass
+@receiver(post_save, sender=Notificacao)
+def enviar_em_tempo_real(sender, instance, created, raw=False, **kwargs):
+    """Notificação criada -> WebSocket do destinatário (bulk_create: ver NotificacaoQuerySet)."""
+    if created and not raw:
+        tempo_real.enviar([instance])
 
-    # Transição de Evento -> status cancelado
-    if Evento and isinstance(instance, Evento) and instance.pk:
-        try:
-            antigo = Evento.objects.get(pk=instance.pk)
-            if antigo.status != 'cancelado' and instance.status == 'cancelado':
-                setattr(instance, '_notify_cancelled', True)
-        except Evento.DoesNotExist:
-            pass
 
+@receiver(post_save, sender=Comunicado)
+def enviar_comunicado_em_tempo_real(sender, instance, created, raw=False, **kwargs):
+    """Comunicado publicado (inclusive pelo admin) -> uma mensagem para todos os conectados."""
+    if created and not raw:
+        tempo_real.enviar_comunicado(instance)
 
-@receiver(post_save, sender=None)
-def acionar_notificacoes(sender, instance, created, **kwargs):
+
+@receiver(transicao_status, sender=Notificacao)
+def ajustar_contador_nao_lidas(sender, instancias, anterior, novo, **kwargs):
     """
-    Após salvar, cria notificações com base nas flags marcadas em pre_save.
+    O campo rastreado de Notificacao é `lida`: criada não lida (None ->
+    False) ou desmarcada soma um; marcada como lida desconta um.
     """
-    # Importes locais para evitar import circular
-    try:
-        from apps.inscricoes.models import Inscricao
-    except Exception:
-        Inscricao = None
-    try:
-        from apps.eventos.models import Evento
-    except Exception:
-        Evento = None
+    if novo is False:
+        delta = 1
+    elif anterior is False:
+        delta = -1
+    else:
+        return
+    deltas = Counter()
+    for instancia in instancias:
+        deltas[instancia.usuario_id] += delta
+    ContadorNotificacoes.ajustar(deltas)
 
-    # Inscricao confirmada
-    if Inscricao and isinstance(instance, Inscricao):
-        if created and instance.status == 'confirmada':
-            # Criada já confirmada
-            criar_notificacao_inscricao_confirmada(instance.usuario, instance.evento)
-        elif getattr(instance, '_notify_confirmed', False):
-            criar_notificacao_inscricao_confirmada(instance.usuario, instance.evento)
 
-    # Evento cancelado -> notificar todos os inscritos confirmados
-    if Evento and isinstance(instance, Evento):
-        if getattr(instance, '_notify_cancelled', False):
-            from apps.inscricoes.models import Inscricao as InscricaoModel
-            qs = InscricaoModel.objects.filter(evento=instance, status='confirmada').select_related('usuario')
-            for insc in qs:
-                criar_notificacao_evento_cancelado(insc.usuario, instance)
+@receiver(pre_delete, sender=Evento)
+def descontar_notificacoes_do_evento(sender, instance, **kwargs):
+    """
+    As notificações do evento são apagadas em massa na cascata, sem passar
+    por NotificacaoQuerySet.delete: as não lidas são descontadas aqui, com
+    um GROUP BY, na mesma transação do DELETE.
+    """
+    deltas = Notificacao.objects.filter(evento=instance).nao_lidas_por_usuario()
+    ContadorNotificacoes.ajustar({usuario_id: -total for usuario_id, total in deltas.items()})
@@ -0,0 +1,85 @@
+"""
+Entrega das notificações em tempo real pelo WebSocket (ver consumers.py).
+
+Cada usuário conectado entra no grupo `grupo(usuario_id)` e no grupo
+`GRUPO_TODOS`. Quando notificações são criadas, `enviar` agenda, para
+depois do commit, uma mensagem por usuário com as notificações novas e
+quanto somar ao total de não lidas; um comunicado publicado vai numa única
+mensagem para `GRUPO_TODOS`. Depois de ações que reduzem o total (marcar
+como lida, excluir), `enviar_contador` manda o total recalculado. Falhas no
+channel layer (ex.: Redis fora do ar) só são registradas no log: o sino
+ainda consulta o contador por polling como alternativa.
+
+Lotes com mais de MAX_LOTE notificações (fan-outs de lembretes e
+cancelamentos) não são enviados: serializar tudo e mandar uma mensagem por
+destinatário viraria um laço longo depois de cada commit, e o polling
+entrega as mesmas notificações.
+"""
+import logging
+from collections import defaultdict
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+GRUPO_TODOS = 'notificacoes_todos'
+MAX_LOTE = 200
+
+
+def grupo(usuario_id):
+    return f'notificacoes_{usuario_id}'
+
+
+def enviar(notificacoes):
+    """Agenda o envio de `notificacoes` (já gravadas) aos seus destinatários."""
+    from .serializers import NotificacaoSerializer
+
+    notificacoes = list(notificacoes)
+    if len(notificacoes) > MAX_LOTE:
+        logger.debug('Lote de %s notificações sem envio em tempo real', len(notificacoes))
+        return
+    mensagens = defaultdict(lambda: {'notificacoes': [], 'incremento': 0})
+    # many=True serializa tudo com uma única instância do serializer (num lote
+    # grande, criar um serializer por item domina o custo)
+    for notificacao, dados in zip(notificacoes, NotificacaoSerializer(notificacoes, many=True).data):
+        mensagem = mensagens[grupo(notificacao.usuario_id)]
+        mensagem['notificacoes'].append(dados)
+        mensagem['incremento'] += not notificacao.lida
+    if mensagens:
+        transaction.on_commit(lambda: _enviar(mensagens))
+
+
+def enviar_comunicado(comunicado):
+    """Agenda o envio de um comunicado recém-publicado a todos os conectados."""
+    from .serializers import ComunicadoSerializer
+
+    comunicado.lida = False
+    mensagem = {'notificacoes': [ComunicadoSerializer(comunicado).data], 'incremento': 1}
+    transaction.on_commit(lambda: _enviar({GRUPO_TODOS: mensagem}))
+
+
+def enviar_contador(usuario):
+    """Agenda o envio do total de não lidas recalculado (ex.: após marcar como lidas)."""
+    transaction.on_commit(lambda: _enviar({grupo(usuario.pk): {'notificacoes': []}}, contar=usuario))
+
+
+def _enviar(mensagens, contar=None):
+    from .comunicados import total_nao_lidas
+
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        if contar is not None:
+            mensagens[grupo(contar.pk)]['nao_lidas'] = total_nao_lidas(contar)
+        async_to_sync(_enviar_aos_grupos)(channel_layer, mensagens)
+    except Exception:
+        logger.exception('Falha ao enviar notificações em tempo real')
+
+
+async def _enviar_aos_grupos(channel_layer, mensagens):
+    # Um único loop de eventos para todos os grupos, em vez de um async_to_sync por usuário
+    for nome, mensagem in mensagens.items():
+        await channel_layer.group_send(nome, {'type': 'notificacoes.atualizadas', **mensagem})
@@ -16,4 +16,8 @@ urlpatterns = [
     
     # Deletar notificação
     path('<int:notificacao_id>/deletar/', views.deletar_notificacao, name='notificacao-deletar'),
+    
+    # Comunicados para todos: mesmas ações, com o id 'comunicado-<id>' da listagem
+    path('comunicado-<int:comunicado_id>/marcar-lida/', views.marcar_comunicado_lido, name='comunicado-marcar-lido'),
+    path('comunicado-<int:comunicado_id>/deletar/', views.deletar_comunicado, name='comunicado-deletar'),
 ]
@@ -1,8 +1,8 @@
 """
 Utilitários para criar notificações programaticamente
 """
+from apps.notificacoes import comunicados
 from apps.notificacoes.models import Notificacao
-from apps.users.models import CustomUser
 
 
 def criar_notificacao_vaga_lista_espera(usuario, evento):
@@ -47,7 +47,8 @@ def criar_notificacao_evento_proximo(usuario, evento, dias_faltando):
         tipo='evento_proximo',
         titulo='Evento próximo',
         mensagem=mensagem,
-        link=f'/evento/{evento.id}'
+        link=f'/evento/{evento.id}',
+        evento=evento
     )
 
 
@@ -82,6 +83,33 @@ def criar_notificacao_inscricao_confirmada(usuario, evento):
     )
 
 
+def criar_notificacoes_inscricao_confirmada(inscricoes):
+    """
+    Versão em lote de criar_notificacao_inscricao_confirmada: um único
+    INSERT para todas as inscrições, reaproveitando o evento já carregado
+    em cada uma quando houver
+    """
+    from apps.eventos.models import Evento
+    from apps.inscricoes.models import Inscricao
+
+    eventos = {i.evento_id: i.evento for i in inscricoes if Inscricao.evento.is_cached(i)}
+    faltando = {i.evento_id for i in inscricoes} - set(eventos)
+    if faltando:
+        eventos.update(Evento.objects.only('id', 'titulo').in_bulk(faltando))
+
+    Notificacao.objects.bulk_create([
+        Notificacao(
+            usuario_id=inscricao.usuario_id,
+            tipo='inscricao_confirmada',
+            titulo='Inscrição confirmada!',
+            mensagem=f'Sua inscrição para "{eventos[inscricao.evento_id].titulo}" foi confirmada com sucesso.',
+            link=f'/evento/{inscricao.evento_id}'
+        )
+        for inscricao in inscricoes
+        if inscricao.evento_id in eventos
+    ])
+
+
 def criar_notificacao_evento_cancelado(usuario, evento):
     """
     Notifica quando um evento é cancelado
@@ -132,6 +160,32 @@ def notificar_usuarios_favorito(organizador, evento):
         )
 
 
+def criar_notificacao_documento_aprovado(usuario):
+    """
+    Notifica quando o documento enviado pelo usuário é aprovado
+    """
+    Notificacao.objects.create(
+        usuario=usuario,
+        tipo='documento_aprovado',
+        titulo='Documento verificado',
+        mensagem='Seu documento foi aprovado. Você já pode criar eventos.',
+        link='/verificar-documento'
+    )
+
+
+def criar_notificacao_documento_rejeitado(usuario, motivo=''):
+    """
+    Notifica quando o documento enviado pelo usuário é rejeitado
+    """
+    Notificacao.objects.create(
+        usuario=usuario,
+        tipo='documento_rejeitado',
+        titulo='Documento rejeitado',
+        mensagem=motivo or 'Não foi possível verificar seu documento. Confira os dados e envie novamente.',
+        link='/verificar-documento'
+    )
+
+
 def criar_notificacao_sistema(usuario, titulo, mensagem, link=None):
     """
     Cria uma notificação genérica do sistema
@@ -147,21 +201,8 @@ def criar_notificacao_sistema(usuario, titulo, mensagem, link=None):
 
 def notificar_todos_usuarios(titulo, mensagem, link=None):
     """
-    Envia uma notificação para TODOS os usuários ativos
-    (útil para avisos importantes do sistema)
+    Envia um aviso a TODOS os usuários (útil para avisos importantes do
+    sistema). Grava um único Comunicado, que aparece junto com as
+    notificações de cada usuário (ver comunicados.py).
     """
-    usuarios_ativos = CustomUser.objects.filter(is_active=True)
-    
-    notificacoes = [
-        Notificacao(
-            usuario=usuario,
-            tipo='sistema',
-            titulo=titulo,
-            mensagem=mensagem,
-            link=link
-        )
-        for usuario in usuarios_ativos
-    ]
-    
-    # Bulk create para performance
-    Notificacao.objects.bulk_create(notificacoes)
+    return comunicados.publicar(titulo, mensagem, link)
@@ -2,20 +2,28 @@ from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.db import transaction
 from django.db.models import Q
-from .models import Notificacao
-from .serializers import NotificacaoSerializer
+from django.utils import timezone
+from apps.pagination import KeysetPagination
+from . import comunicados, tempo_real
+from .models import Comunicado, ContadorNotificacoes, Notificacao
+from .serializers import ComunicadoSerializer, NotificacaoSerializer
 
 
 class ListNotificacoesView(generics.ListAPIView):
     """
-    Lista todas as notificações do usuário autenticado.
+    Lista todas as notificações do usuário autenticado, incluindo os
+    comunicados para todos (tipo 'sistema', id 'comunicado-<id>').
     Query params:
     - lida: true/false para filtrar por lidas/não lidas
     - tipo: filtrar por tipo específico
+    - cursor / page_size: ativam a paginação por cursor
     """
     serializer_class = NotificacaoSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
     
     def get_queryset(self):
         queryset = Notificacao.objects.filter(usuario=self.request.user)
@@ -24,6 +32,9 @@ class ListNotificacoesView(generics.ListAPIView):
         lida = self.request.query_params.get('lida', None)
         if lida is not None:
             lida_bool = lida.lower() == 'true'
+            if not lida_bool and not ContadorNotificacoes.nao_lidas_de(self.request.user.pk):
+                # Nada não lido: o contador evita varrer as notificações
+                return queryset.none()
             queryset = queryset.filter(lida=lida_bool)
         
         # Filtro por tipo
@@ -33,6 +44,43 @@ class ListNotificacoesView(generics.ListAPIView):
         
         return queryset
 
+    def get_comunicados(self):
+        tipo = self.request.query_params.get('tipo', None)
+        if tipo and tipo != 'sistema':
+            return Comunicado.objects.none()
+        queryset = comunicados.visiveis(self.request.user, comunicados.lidos_ate(self.request.user))
+        lida = self.request.query_params.get('lida', None)
+        if lida is not None:
+            queryset = queryset.filter(lida=lida.lower() == 'true')
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        extras = self.get_comunicados()
+
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(self._mesclar(queryset, extras))
+
+        # Os comunicados entram na página cujo intervalo de datas os contém
+        janela = self.paginator.janela()
+        if janela is None:
+            extras = extras.none()
+        else:
+            menor, maior = janela
+            if menor is not None:
+                extras = extras.filter(created_at__gte=menor)
+            if maior is not None:
+                extras = extras.filter(created_at__lt=maior)
+        return self.get_paginated_response(self._mesclar(page, extras))
+
+    def _mesclar(self, notificacoes, extras):
+        notificacoes, extras = list(notificacoes), list(extras)
+        itens = list(zip(notificacoes, self.get_serializer(notificacoes, many=True).data))
+        itens += zip(extras, ComunicadoSerializer(extras, many=True).data)
+        itens.sort(key=lambda item: item[0].created_at, reverse=True)
+        return [dados for _, dados in itens]
+
 
 @api_view(['PATCH'])
 @permission_classes([IsAuthenticated])
@@ -44,6 +92,8 @@ def marcar_notificacao_lida(request, notificacao_id):
             usuario=request.user
         )
         notificacao.marcar_como_lida()
+        # Mantém o contador das outras abas abertas em sincronia
+        tempo_real.enviar_contador(request.user)
         
         serializer = NotificacaoSerializer(notificacao)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -54,14 +104,39 @@ def marcar_notificacao_lida(request, notificacao_id):
         )
 
 
+@api_view(['PATCH'])
+@permission_classes([IsAuthenticated])
+def marcar_comunicado_lido(request, comunicado_id):
+    """Marca um comunicado como lido para o usuário."""
+    comunicado = comunicados.marcar_lido(request.user, comunicado_id)
+    if comunicado is None:
+        return Response(
+            {'error': 'Notificação não encontrada'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    tempo_real.enviar_contador(request.user)
+    return Response(ComunicadoSerializer(comunicado).data, status=status.HTTP_200_OK)
+
+
 @api_view(['PATCH'])
 @permission_classes([IsAuthenticated])
 def marcar_todas_lidas(request):
-    """Marca todas as notificações do usuário como lidas."""
-    count = Notificacao.objects.filter(
-        usuario=request.user, 
-        lida=False
-    ).update(lida=True)
+    """Marca todas as notificações do usuário (e os comunicados) como lidas."""
+    with transaction.atomic():
+        # Com o contador travado, notificações criadas no meio esperam e
+        # contam a partir do zero
+        ContadorNotificacoes.travar([request.user.pk])
+        agora = timezone.now()
+        count = Notificacao.objects.filter(
+            usuario=request.user, 
+            lida=False
+        ).update(lida=True)
+        count += comunicados.nao_lidos(request.user, comunicados.lidos_ate(request.user))
+        ContadorNotificacoes.objects.filter(pk=request.user.pk).update(
+            nao_lidas=0,
+            comunicados_lidos_ate=agora,
+        )
+    tempo_real.enviar_contador(request.user)
     
     return Response(
         {'message': f'{count} notificações marcadas como lidas'},
@@ -72,11 +147,11 @@ def marcar_todas_lidas(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def contador_nao_lidas(request):
-    """Retorna o número de notificações não lidas do usuário."""
-    count = Notificacao.objects.filter(
-        usuario=request.user,
-        lida=False
-    ).count()
+    """
+    Retorna o número de notificações não lidas do usuário: o
+    ContadorNotificacoes mais os comunicados ainda não lidos.
+    """
+    count = comunicados.total_nao_lidas(request.user)
     
     return Response({'count': count}, status=status.HTTP_200_OK)
 
@@ -91,6 +166,7 @@ def deletar_notificacao(request, notificacao_id):
             usuario=request.user
         )
         notificacao.delete()
+        tempo_real.enviar_contador(request.user)
         return Response(
             {'message': 'Notificação deletada com sucesso'},
             status=status.HTTP_204_NO_CONTENT
@@ -100,3 +176,19 @@ def deletar_notificacao(request, notificacao_id):
             {'error': 'Notificação não encontrada'},
             status=status.HTTP_404_NOT_FOUND
         )
+
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def deletar_comunicado(request, comunicado_id):
+    """Remove um comunicado das notificações do usuário."""
+    if not comunicados.excluir(request.user, comunicado_id):
+        return Response(
+            {'error': 'Notificação não encontrada'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    tempo_real.enviar_contador(request.user)
+    return Response(
+        {'message': 'Notificação deletada com sucesso'},
+        status=status.HTTP_204_NO_CONTENT
+    )
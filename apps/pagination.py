@@ -0,0 +1,181 @@
+"""
+Paginação por cursor (keyset) compartilhada pelas listagens da API.
+
+A paginação é opcional: só é aplicada quando a requisição envia `cursor`
+ou `page_size`. Sem esses parâmetros a view continua respondendo a lista
+completa, como os clientes atuais esperam.
+
+A ordenação usada vem de `keyset_ordering` na view (ou de `ordering` na
+classe). O último campo precisa ser único (normalmente o `id`) e nenhum
+deles pode ser nulo, para que a posição do cursor seja sempre exata.
+"""
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 20
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = tuple(getattr(view, 'keyset_ordering', self.ordering))
+        self.model = queryset.model
+
+        posicao, reverso = self.decode_cursor(request)
+
+        ordem = [self._inverter(campo) for campo in self.ordering] if reverso else list(self.ordering)
+        queryset = queryset.order_by(*ordem)
+        if posicao is not None:
+            queryset = queryset.filter(self._filtro_apos(posicao, ordem))
+
+        resultados = list(queryset[:self.page_size + 1])
+        ha_mais = len(resultados) > self.page_size
+        self.alem_da_pagina = resultados[self.page_size] if ha_mais else None
+        resultados = resultados[:self.page_size]
+
+        if reverso:
+            resultados.reverse()
+            self.has_next = True
+            self.has_previous = ha_mais
+        else:
+            self.has_next = ha_mais
+            self.has_previous = posicao is not None
+
+        self.posicao = posicao
+        self.reverso = reverso
+        self.resultados = resultados
+        return resultados
+
+    def janela(self):
+        """
+        Intervalo [menor, maior) do primeiro campo da ordenação (decrescente,
+        como '-created_at') que a página atual cobre; None = sem limite.
+        Cada página vai do seu último item (inclusive) até o último item da
+        página anterior (exclusive), então páginas consecutivas, nas duas
+        direções, cobrem intervalos contíguos e disjuntos. Isso permite
+        intercalar itens de outra fonte (ver ListNotificacoesView) sem
+        repetir nem pular nenhum. Retorna None se a página não cobre nada.
+        """
+        nome = self.ordering[0].lstrip('-')
+        if not self.reverso:
+            maior = self.posicao[0] if self.posicao is not None else None
+            menor = getattr(self.resultados[-1], nome) if self.has_next else None
+            return menor, maior
+        if not self.resultados:
+            return None
+        maior = getattr(self.alem_da_pagina, nome) if self.alem_da_pagina is not None else None
+        return getattr(self.resultados[-1], nome), maior
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            tamanho = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if tamanho <= 0:
+            return self.page_size
+        return min(tamanho, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next or not self.resultados:
+            return None
+        return self._link(self.resultados[-1], reverso=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.resultados:
+            return None
+        return self._link(self.resultados[0], reverso=True)
+
+    def decode_cursor(self, request):
+        """Retorna (posição, reverso) a partir do cursor opaco da query string."""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+
+        try:
+            dados = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+            valores = dados['p']
+            reverso = bool(dados.get('r', False))
+            if len(valores) != len(self.ordering):
+                raise ValueError
+            posicao = [
+                self._campo(nome).to_python(valor)
+                for nome, valor in zip(self.ordering, valores)
+            ]
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return posicao, reverso
+
+    def encode_cursor(self, instancia, reverso):
+        valores = [
+            self._campo(nome).value_to_string(instancia)
+            for nome in self.ordering
+        ]
+        dados = {'p': valores}
+        if reverso:
+            dados['r'] = 1
+        return base64.urlsafe_b64encode(json.dumps(dados, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+    def _link(self, instancia, reverso):
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(instancia, reverso))
+
+    def _campo(self, nome):
+        return self.model._meta.get_field(nome.lstrip('-'))
+
+    @staticmethod
+    def _inverter(campo):
+        return campo[1:] if campo.startswith('-') else f'-{campo}'
+
+    @staticmethod
+    def _filtro_apos(posicao, ordem):
+        """
+        Monta (a > x) OR (a = x AND b > y) ... respeitando a direção de cada
+        campo, o que permite ao banco usar o índice composto da ordenação.
+        """
+        filtro = Q()
+        for i, campo in enumerate(ordem):
+            nome = campo.lstrip('-')
+            lookup = 'lt' if campo.startswith('-') else 'gt'
+            condicao = Q(**{f'{nome}__{lookup}': posicao[i]})
+            for anterior, valor in zip(ordem[:i], posicao[:i]):
+                condicao &= Q(**{anterior.lstrip('-'): valor})
+            filtro |= condicao
+        return filtro
@@ -0,0 +1,90 @@
+"""
+Rastreamento em memória dos valores carregados do banco.
+
+Modelos com `RastreiaCampos` guardam os valores de CAMPOS_RASTREADOS quando
+são lidos (from_db) e depois de cada save(), então dá para saber o que
+mudou sem reler a linha. Quando o status muda, o save() envia o sinal
+`transicao_status` apenas para aquele modelo.
+
+update(), bulk_create e bulk_update não passam por save(). Quem altera
+status por esses caminhos deve chamar `emitir_transicoes` depois de
+gravar.
+"""
+from django.dispatch import Signal
+
+# Argumentos: sender (classe do modelo), instancias, anterior, novo, criado.
+# `anterior` é None para instâncias criadas. Vindas de update(), as
+# instâncias podem ser parciais: apenas pk, chaves estrangeiras e status.
+transicao_status = Signal()
+
+
+def emitir_transicoes(modelo, instancias, anterior, novo, criado=False):
+    """Avisa os receivers de que `instancias` passaram de `anterior` para `novo`."""
+    instancias = list(instancias)
+    if instancias and anterior != novo:
+        transicao_status.send(
+            sender=modelo,
+            instancias=instancias,
+            anterior=anterior,
+            novo=novo,
+            criado=criado,
+        )
+
+
+class RastreiaCampos:
+    """
+    Mixin de modelo. Deve vir antes de models.Model nas bases.
+
+    CAMPOS_RASTREADOS usa nomes de atributo (ex.: 'evento_id'). O primeiro
+    save() de uma instância nova é a transição None -> status.
+    """
+
+    CAMPOS_RASTREADOS = ('status',)
+    CAMPO_TRANSICAO = 'status'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._registrar_valores_carregados()
+        return instance
+
+    def _registrar_valores_carregados(self, campos=None):
+        # Usa __dict__ para não disparar consultas em campos adiados
+        valores = self.__dict__.setdefault('_valores_carregados', {})
+        for campo in campos if campos is not None else self.CAMPOS_RASTREADOS:
+            if campo in self.__dict__:
+                valores[campo] = self.__dict__[campo]
+
+    def _campos_gravados(self, update_fields):
+        if update_fields is None:
+            return self.CAMPOS_RASTREADOS
+        gravados = {self._meta.get_field(nome).attname for nome in update_fields}
+        return [campo for campo in self.CAMPOS_RASTREADOS if campo in gravados]
+
+    def valor_carregado(self, campo):
+        """Valor de `campo` na última leitura ou gravação; None se a instância é nova."""
+        if self._state.adding:
+            return None
+        return self.__dict__.get('_valores_carregados', {}).get(campo)
+
+    def campo_alterado(self, campo):
+        return self._state.adding or self.valor_carregado(campo) != self.__dict__.get(campo)
+
+    def save(self, *args, **kwargs):
+        campo = self.CAMPO_TRANSICAO
+        criado = self._state.adding
+        # Com o status adiado na leitura não há valor anterior confiável
+        conhecido = criado or campo in self.__dict__.get('_valores_carregados', {})
+        anterior = self.valor_carregado(campo)
+        super().save(*args, **kwargs)
+
+        campos = self._campos_gravados(kwargs.get('update_fields'))
+        self._registrar_valores_carregados(campos)
+        if conhecido and campo in campos and campo in self.__dict__:
+            emitir_transicoes(type(self), [self], anterior, self.__dict__[campo], criado=criado)
+
+    def refresh_from_db(self, using=None, fields=None, *args, **kwargs):
+        super().refresh_from_db(using, fields, *args, **kwargs)
+        self._registrar_valores_carregados(
+            None if fields is None else self._campos_gravados(fields)
+        )
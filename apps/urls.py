@@ -6,10 +6,14 @@ from apps.eventos.views import (
     evento_resumo_inscricao,
     ManageEventosView,
     EventoRetrieveUpdateView,
+    busca_eventos,
+    eventos_perto_de_mim,
 )
 
 urlpatterns = [
     path('eventos/', EventoListView.as_view(), name='evento-list'),
+    path('eventos/busca/', busca_eventos, name='evento-busca'),
+    path('eventos/perto-de-mim/', eventos_perto_de_mim, name='evento-perto-de-mim'),
     path('eventos/<uuid:id>/', EventoDetailView.as_view(), name='evento-detail'),
     path('eventos/criar/', EventoCreateView.as_view(), name='criar-evento'),
     path('eventos/<uuid:evento_id>/resumo-inscricao/', evento_resumo_inscricao, name='evento-resumo-inscricao'),
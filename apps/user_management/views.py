@@ -4,11 +4,13 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from collections import defaultdict
 
 from apps.users.serializers import UserSerializer
 from apps.eventos.models import Evento
+from apps.tracking import emitir_transicoes
 
 User = get_user_model()
 
@@ -82,7 +84,17 @@ def revert_organizer_status(request, pk):
     from django.utils import timezone
     now = timezone.now()
     futuros = Evento.objects.filter(organizador=user, data_evento__gte=now)
-    futuros.update(status='cancelado')
+    with transaction.atomic():
+        a_cancelar = list(futuros.select_for_update().exclude(status='cancelado').only('id', 'titulo', 'status'))
+        futuros.update(status='cancelado', updated_at=now)
+
+        # update() skips save(), so status transitions are emitted explicitly
+        por_status = defaultdict(list)
+        for evento in a_cancelar:
+            por_status[evento.status].append(evento)
+            evento.status = 'cancelado'
+        for anterior, eventos in por_status.items():
+            emitir_transicoes(Evento, eventos, anterior, 'cancelado')
 
     # Optionally deactivate account to prevent re-creating events - admin decision
     user.is_active = False
@@ -6,3 +6,7 @@ class UsersConfig(AppConfig):
     name = 'apps.users'
     label = 'users'
 
+
+    def ready(self):
+        # Conecta o receiver que gera as variantes da foto de perfil
+        from . import signals  # noqa: F401
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='variantes_imagem',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -31,6 +31,8 @@ class CustomUser(AbstractUser):
     data_nascimento = models.DateField(blank=True, null=True)
     score = models.FloatField(default=5)
     profile_photo = models.ImageField(upload_to="profile_photos/", blank=True, null=True, default="profile_photos/user.jpg")
+    # Versões redimensionadas da foto de perfil, geradas em segundo plano (ver apps/images.py)
+    variantes_imagem = models.JSONField(default=dict, blank=True, editable=False)
     sexo = models.CharField(
         max_length=10,
         choices=[("M", "Masculino"), ("F", "Feminino"), ("O", "Outro")],
@@ -52,11 +52,8 @@ def password_reset_confirm(request):
                 user.set_password(new_password)
                 user.save()
 
-                # Enviar email de confirmação
-                try:
-                    send_password_changed_confirmation_email(user)
-                except Exception as e:
-                    print(f"⚠️ Erro ao enviar email de confirmação: {str(e)}")
+                # Só grava na caixa de saída; o envio é feito pelo worker
+                send_password_changed_confirmation_email(user)
 
                 return Response(
                     {'message': 'Senha redefinida com sucesso! Você já pode fazer login.'},
@@ -2,11 +2,13 @@ from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate, get_user_model
 from .validators import validate_password_strength
+from apps.images import representar_variantes
 
 User = get_user_model()
 
 class UserSerializer(serializers.ModelSerializer):
     profile_photo = serializers.SerializerMethodField()
+    profile_photo_variantes = serializers.SerializerMethodField()
 
     class Meta:
         model = User
@@ -25,6 +27,7 @@ class UserSerializer(serializers.ModelSerializer):
             "password",
             "score",
             "profile_photo",
+            "profile_photo_variantes",
             "tipo_documento",
             "numero_documento",
             "documento_foto",
@@ -44,6 +47,10 @@ class UserSerializer(serializers.ModelSerializer):
             # Retorna apenas o caminho relativo, sem o domínio
             return obj.profile_photo.url
         return None
+
+    def get_profile_photo_variantes(self, obj):
+        # Caminhos relativos, como em profile_photo
+        return representar_variantes(obj.variantes_imagem, 'profile_photo', obj.profile_photo.storage)
       
     def validate_password(self, value):
         errors = validate_password_strength(value)
@@ -104,16 +111,23 @@ class DocumentoVerificacaoSerializer(serializers.ModelSerializer):
 
         return value
 
+    def validate(self, attrs):
+        # A verificação em segundo plano precisa de um arquivo para conferir
+        if not attrs.get('documento_foto') and not getattr(self.instance, 'documento_foto', None):
+            raise serializers.ValidationError({'documento_foto': "Envie a foto ou o scan do documento."})
+        return attrs
+
 
 class CustomUserDetailsSerializer(serializers.ModelSerializer):
     """
     Serializador para os detalhes do usuário retornados após autenticação social
     """
     profile_photo = serializers.SerializerMethodField()
+    profile_photo_variantes = serializers.SerializerMethodField()
     
     class Meta:
         model = User
-        fields = ('id', 'username', 'email', 'first_name', 'last_name', 'profile_photo', 
+        fields = ('id', 'username', 'email', 'first_name', 'last_name', 'profile_photo', 'profile_photo_variantes',
                  'telefone', 'cpf', 'cnpj', 'data_nascimento', 'sexo', 'score')
         read_only_fields = ('email',)
     
@@ -122,3 +136,5 @@ class CustomUserDetailsSerializer(serializers.ModelSerializer):
             return obj.profile_photo.url
         return None
 
+    def get_profile_photo_variantes(self, obj):
+        return representar_variantes(obj.variantes_imagem, 'profile_photo', obj.profile_photo.storage)
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps import images
+from .models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+def gerar_variantes_foto_perfil(sender, instance, raw=False, **kwargs):
+    """Agenda as variantes da foto de perfil quando o arquivo enviado muda."""
+    if not raw and images.variantes_desatualizadas(instance, 'profile_photo'):
+        images.agendar_variantes(instance, 'profile_photo')
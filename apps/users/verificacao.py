@@ -0,0 +1,136 @@
+"""
+Verificação de documentos em segundo plano.
+
+O upload (views.verificar_documento) grava o documento com status
+'verificando', enfileira `verificar_documento` na fila 'documentos' (ver
+apps/jobs) e responde 202 na hora. O job consulta o verificador
+configurado e grava 'aprovado' ou 'rejeitado' só se o documento ainda for
+o mesmo que foi enviado (um reenvio no meio invalida o resultado antigo).
+O usuário é avisado por notificação, que também chega pelo WebSocket;
+/api/status-documento/ responde com o status sem consultar o banco.
+
+O verificador vem de settings.VERIFICADOR_DOCUMENTO:
+
+    VERIFICADOR_DOCUMENTO = {
+        'BACKEND': 'apps.users.verificacao.VerificadorLocal',
+        'OPCOES': {'atraso': 0},
+    }
+
+Um backend é uma classe com `verificar(documento) -> Resultado`. Se o
+serviço falhar, basta deixar a exceção subir: o job é repetido com backoff.
+Se as tentativas acabarem, `verificacao_falhou` rejeita o envio e pede ao
+usuário que envie de novo, em vez de deixá-lo 'verificando' para sempre.
+"""
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.module_loading import import_string
+
+from apps.jobs.filas import enfileirar
+
+FILA = 'documentos'
+
+VERIFICADOR_PADRAO = {
+    'BACKEND': 'apps.users.verificacao.VerificadorLocal',
+    'OPCOES': {},
+}
+
+
+@dataclass(frozen=True)
+class Documento:
+    tipo: str
+    numero: str
+    arquivo: str
+
+
+@dataclass(frozen=True)
+class Resultado:
+    aprovado: bool
+    motivo: str = ''
+
+
+class VerificadorLocal:
+    """
+    Verificador de desenvolvimento: aprova todo documento depois de
+    `atraso` segundos, sem serviço externo. Com `rejeitar` preenchido,
+    rejeita os números listados (útil em testes manuais).
+    """
+
+    def __init__(self, atraso=0, rejeitar=()):
+        self.atraso = atraso
+        self.rejeitar = set(rejeitar)
+
+    def verificar(self, documento):
+        if self.atraso:
+            time.sleep(self.atraso)
+        if documento.numero in self.rejeitar:
+            return Resultado(aprovado=False, motivo='Os dados não conferem com o documento enviado.')
+        return Resultado(aprovado=True)
+
+
+def obter_verificador():
+    config = getattr(settings, 'VERIFICADOR_DOCUMENTO', VERIFICADOR_PADRAO)
+    return import_string(config['BACKEND'])(**config.get('OPCOES', {}))
+
+
+def agendar(usuario):
+    """Enfileira a verificação do documento atual do usuário. Retorna o Job."""
+    return enfileirar(
+        verificar_documento,
+        [usuario.pk, usuario.numero_documento, usuario.documento_foto.name],
+        fila=FILA,
+        ao_falhar=verificacao_falhou,
+    )
+
+
+def verificar_documento(usuario_id, numero_documento, arquivo):
+    """Job: verifica o documento enviado e avisa o usuário. Retorna o novo status."""
+    from apps.notificacoes.utils import (
+        criar_notificacao_documento_aprovado,
+        criar_notificacao_documento_rejeitado,
+    )
+
+    mesmo_envio = _mesmo_envio(usuario_id, numero_documento, arquivo)
+    usuario = mesmo_envio.only('id', 'tipo_documento').first()
+    if usuario is None:
+        # Documento reenviado (outro job cuida dele) ou usuário removido
+        return None
+
+    resultado = obter_verificador().verificar(
+        Documento(tipo=usuario.tipo_documento, numero=numero_documento, arquivo=arquivo)
+    )
+    novo_status = 'aprovado' if resultado.aprovado else 'rejeitado'
+    if not mesmo_envio.update(documento_verificado=novo_status):
+        return None
+
+    if resultado.aprovado:
+        criar_notificacao_documento_aprovado(usuario)
+    else:
+        criar_notificacao_documento_rejeitado(usuario, resultado.motivo)
+    return novo_status
+
+
+def verificacao_falhou(usuario_id, numero_documento, arquivo):
+    """ao_falhar do job: o verificador falhou em todas as tentativas."""
+    from apps.notificacoes.utils import criar_notificacao_documento_rejeitado
+
+    mesmo_envio = _mesmo_envio(usuario_id, numero_documento, arquivo)
+    usuario = mesmo_envio.only('id').first()
+    if usuario is None or not mesmo_envio.update(documento_verificado='rejeitado'):
+        return
+    criar_notificacao_documento_rejeitado(
+        usuario,
+        'Não conseguimos verificar seu documento no momento. Envie-o novamente em alguns minutos.',
+    )
+
+
+def _mesmo_envio(usuario_id, numero_documento, arquivo):
+    """O usuário, se ainda estiver 'verificando' exatamente este envio."""
+    return get_user_model().objects.filter(
+        pk=usuario_id,
+        documento_verificado='verificando',
+        numero_documento=numero_documento,
+        documento_foto=arquivo,
+    )
@@ -4,12 +4,13 @@ from rest_framework.response import Response
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.decorators import api_view, permission_classes
-import time
 import requests
 import os
 import secrets
+from django.db import transaction
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from . import verificacao
 from .serializers import CustomTokenSerializer, UserSerializer, DocumentoVerificacaoSerializer
 
 User = get_user_model()
@@ -120,11 +121,19 @@ def verificar_documento(request):
 
     serializer = DocumentoVerificacaoSerializer(user, data=request.data, partial=True)
     if serializer.is_valid():
-        serializer.save(documento_verificado='verificando')
-        time.sleep(7)
-        user.documento_verificado = 'aprovado'
-        user.save()
-        return Response({'status': 'aprovado', 'mensagem': 'Documento verificado com sucesso! Voc j pode criar eventos.'})
+        # A verificação roda em segundo plano (ver verificacao.py); o resultado
+        # chega por notificação e por /api/status-documento/
+        with transaction.atomic():
+            serializer.save(documento_verificado='verificando')
+            job = verificacao.agendar(user)
+        return Response(
+            {
+                'status': 'verificando',
+                'job_id': job.pk,
+                'mensagem': 'Documento recebido! Avisaremos assim que a verificação terminar.',
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -132,6 +141,7 @@ def verificar_documento(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def status_documento(request):
+    # Lido do usuário já carregado pela autenticação: barato para consultas periódicas
     user = request.user
     return Response({
         'tipo_documento': user.tipo_documento,
@@ -7,21 +7,17 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 django_asgi_app = get_asgi_application()
 
-from apps.checkin.routing import websocket_urlpatterns
+from apps.checkin.routing import websocket_urlpatterns as checkin_websocket_urlpatterns
+from apps.notificacoes.middleware import JWTAuthMiddleware
+from apps.notificacoes.routing import websocket_urlpatterns as notificacoes_websocket_urlpatterns
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
     "websocket": AuthMiddlewareStack(
-        URLRouter(
-            websocket_urlpatterns
+        JWTAuthMiddleware(
+            URLRouter(
+                checkin_websocket_urlpatterns + notificacoes_websocket_urlpatterns
+            )
         )
     ),
 })
-import os
-
-from django.core.wsgi import get_wsgi_application
-
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
-
-application = get_wsgi_application()
-
@@ -36,6 +36,7 @@ REST_FRAMEWORK = {
     'DEFAULT_THROTTLE_RATES': {
         'user': '1000/day',
         'anon': '10/minute',
+        'visualizacoes': '60/minute',
     }
 }
 
@@ -55,6 +56,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     "rest_framework",
     "apps.users",
     "apps.eventos",
@@ -68,6 +70,8 @@ INSTALLED_APPS = [
     "apps.checkin",
     "apps.user_management",
     "apps.notificacoes",
+    "apps.jobs",
+    "apps.emails",
     "corsheaders",
     "channels",
     "sslserver",
@@ -126,6 +130,9 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            # Transações de escrita esperam a vez em vez de falhar com
+            # "database is locked" quando há inscrições simultâneas
+            'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
         }
     }
 
@@ -216,12 +223,58 @@ CORS_ALLOW_METHODS = [
     'PUT',
 ]
 
+# Nome dos arquivos baixados (ex.: PDF de analytics) legível pelo frontend
+CORS_EXPOSE_HEADERS = ['Content-Disposition']
+
 ASGI_APPLICATION = 'config.asgi.application'
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer'
+# Com REDIS_URL as mensagens chegam aos sockets de qualquer processo
+# (várias instâncias do Daphne, workers, comandos); sem ela, só aos do
+# próprio processo.
+if os.getenv('REDIS_URL'):
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {
+                'hosts': [os.getenv('REDIS_URL')],
+            },
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer'
+        }
     }
-}
+
+# Cache compartilhado entre processos com REDIS_URL (ver apps/cache_versions.py)
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Validade máxima do resumo do dashboard em cache (ver apps/dashboard/resumo.py)
+DASHBOARD_CACHE_SEGUNDOS = int(os.getenv("DASHBOARD_CACHE_SEGUNDOS", 300))
+# Validade máxima dos demográficos de um evento em cache (ver apps/analytics/metricas.py)
+ANALYTICS_CACHE_SEGUNDOS = int(os.getenv("ANALYTICS_CACHE_SEGUNDOS", 600))
+# Intervalo entre as atualizações dos agregados das timelines (ver apps/analytics/agregados.py)
+ANALYTICS_AGREGADOS_SEGUNDOS = int(os.getenv("ANALYTICS_AGREGADOS_SEGUNDOS", 60))
+# A partir de quantas inscrições o PDF de analytics é gerado em segundo plano (ver apps/analytics/relatorio.py)
+ANALYTICS_PDF_LIMITE_SINCRONO = int(os.getenv("ANALYTICS_PDF_LIMITE_SINCRONO", 5000))
+# Onde os PDFs de analytics ficam guardados: fora de MEDIA_ROOT, para só saírem pela view que confere o organizador
+ANALYTICS_PDF_ROOT = Path(os.getenv("ANALYTICS_PDF_ROOT", BASE_DIR / 'privado' / 'relatorios'))
+# Processos que renderizam os certificados de um evento (ver apps/inscricoes/certificados.py); 0 = um por CPU
+CERTIFICADOS_PROCESSOS = int(os.getenv("CERTIFICADOS_PROCESSOS", 0))
+# Exportações de certificados simultâneas por processo do servidor; cada uma usa um pool
+CERTIFICADOS_EXPORTACOES_SIMULTANEAS = int(os.getenv("CERTIFICADOS_EXPORTACOES_SIMULTANEAS", 1))
 
 
 # EMAIL / MAILERSEND CONFIG
@@ -239,4 +292,38 @@ ANYMAIL = {
     "MAILERSEND_API_KEY": MAILERSEND_API_TOKEN
 }
 
-FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
\ No newline at end of file
+# Base da API usada pela caixa de saída (apps/emails); em testes pode apontar
+# para um servidor HTTP local
+MAILERSEND_API_URL = os.getenv("MAILERSEND_API_URL", "https://api.mailersend.com/v1")
+
+FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
+
+# Fila de jobs (apps/jobs): por fila, jobs simultâneos por processo,
+# segundos de reserva de cada job e tentativas antes de desistir
+JOBS_FILAS = {
+    'padrao': {'concorrencia': 2, 'visibilidade': 300, 'max_tentativas': 5},
+    'documentos': {'concorrencia': 2, 'visibilidade': 120, 'max_tentativas': 5},
+    # Um envio por vez: cada job esvazia a caixa de saída em lotes
+    'emails': {'concorrencia': 1, 'visibilidade': 600, 'max_tentativas': 8},
+}
+# Agendamentos de jobs recorrentes; os trabalhadores os chamam periodicamente
+# para que a cadeia de cada um não se perca (ver apps/jobs/trabalhador.py)
+JOBS_RECORRENTES = [
+    'apps.analytics.agregados.agendar',
+]
+# Com `manage.py run_workers` rodando, pode ser desligado para que só os
+# trabalhadores dedicados executem jobs
+JOBS_TRABALHADOR_NO_PROCESSO = os.getenv("JOBS_TRABALHADOR_NO_PROCESSO", "1") == "1"
+
+# Serviço de verificação de documentos (ver apps/users/verificacao.py)
+VERIFICADOR_DOCUMENTO = {
+    'BACKEND': os.getenv("VERIFICADOR_DOCUMENTO_BACKEND", "apps.users.verificacao.VerificadorLocal"),
+    'OPCOES': {},
+}
+
+# Reserva de vaga para inscrições pendentes de pagamento PIX
+RESERVA_VAGA_MINUTOS = int(os.getenv("RESERVA_VAGA_MINUTOS", 30))
+# Prazo extra depois que o usuário informa o pagamento, até o organizador aprovar
+RESERVA_VAGA_APROVACAO_HORAS = int(os.getenv("RESERVA_VAGA_APROVACAO_HORAS", 72))
+# Tempo que quem sai da lista de espera tem para pagar a vaga oferecida
+RESERVA_VAGA_LISTA_ESPERA_HORAS = int(os.getenv("RESERVA_VAGA_LISTA_ESPERA_HORAS", 24))
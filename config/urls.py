@@ -16,12 +16,14 @@ from apps.users.password_views import (
 )
 from apps.eventos.views import (
     EventoCreateView, EventoListView, EventoDetailView,
-    evento_resumo_inscricao, ManageEventosView, EventoRetrieveUpdateView
+    evento_resumo_inscricao, ManageEventosView, EventoRetrieveUpdateView,
+    busca_eventos, eventos_perto_de_mim
 )
 from apps.inscricoes.views import (
     InscricaoCreateView, MinhasInscricoesView, inscricao_detalhes,
     iniciar_inscricao_pagamento, confirmar_pagamento_inscricao,
-    aprovar_pagamento_inscricao, listar_pagamentos_pendentes
+    aprovar_pagamento_inscricao, listar_pagamentos_pendentes, inscricao_qrcode,
+    inscricao_certificado, certificados_evento
 )
 from apps.avaliacoes.views import AvaliacaoListView, AvaliacaoCreateView
 from apps.favoritos.views import list_favorites, toggle_favorite
@@ -30,13 +32,14 @@ from apps.transferencias.views import (
 )
 from apps.waitlist.views import waitlist_status, waitlist_join, waitlist_leave, waitlist_suggestions
 from apps.analytics.views import (
-    evento_analytics_geral, evento_analytics_demograficos, evento_analytics_interacoes,
+    evento_analytics, evento_analytics_geral, registrar_visualizacao, evento_analytics_demograficos, evento_analytics_interacoes,
+    evento_analytics_serie,
     evento_analytics_roi, evento_analytics_atualizar_custo, evento_analytics_exportar_pdf
 )
 from apps.dashboard.views import (
-    dashboard_metricas, eventos_proximos, eventos_anteriores, notificacoes, graficos
+    dashboard, dashboard_metricas, eventos_proximos, eventos_anteriores, notificacoes, graficos
 )
-from apps.checkin.views import realizar_checkin
+from apps.checkin.views import realizar_checkin, sincronizar_checkins
 
 urlpatterns = [
     # Admin
@@ -67,6 +70,8 @@ urlpatterns = [
 
     # Eventos
     path('api/eventos/', EventoListView.as_view(), name='evento-list'),
+    path('api/eventos/busca/', busca_eventos, name='evento-busca'),
+    path('api/eventos/perto-de-mim/', eventos_perto_de_mim, name='evento-perto-de-mim'),
     path('api/eventos/<uuid:id>/', EventoDetailView.as_view(), name='evento-detail'),
     path('api/eventos/criar/', EventoCreateView.as_view(), name='criar-evento'),
     path('api/eventos/<uuid:evento_id>/resumo-inscricao/', evento_resumo_inscricao, name='evento-resumo-inscricao'),
@@ -76,6 +81,7 @@ urlpatterns = [
     # Inscrições
     path('api/inscricoes/', InscricaoCreateView.as_view(), name='inscricao-create'),
     path('api/inscricoes/minhas/', MinhasInscricoesView.as_view(), name='minhas-inscricoes'),
+    path('api/inscricoes/qrcode/<str:codigo>.svg', inscricao_qrcode, name='inscricao-qrcode'),
     path('api/inscricoes/<uuid:inscricao_id>/', inscricao_detalhes, name='inscricao-detail'),
     path('api/registrations/<uuid:inscricao_id>/', inscricao_detalhes, name='registration-detail'),
     
@@ -85,6 +91,10 @@ urlpatterns = [
     path('api/inscricoes/<uuid:inscricao_id>/aprovar-pagamento/', aprovar_pagamento_inscricao, name='aprovar-pagamento'),
     path('api/inscricoes/evento/<uuid:evento_id>/pagamentos-pendentes/', listar_pagamentos_pendentes, name='pagamentos-pendentes'),
 
+    # Certificados de participação
+    path('api/inscricoes/<uuid:inscricao_id>/certificado/', inscricao_certificado, name='inscricao-certificado'),
+    path('api/inscricoes/evento/<uuid:evento_id>/certificados/', certificados_evento, name='certificados-evento'),
+
     # Avaliações
     path('api/eventos/<uuid:evento_id>/avaliacoes/', AvaliacaoListView.as_view(), name='avaliacao-list'),
     path('api/eventos/<uuid:evento_id>/avaliacoes/criar/', AvaliacaoCreateView.as_view(), name='avaliacao-create'),
@@ -105,14 +115,18 @@ urlpatterns = [
     path('api/waitlist/<uuid:event_id>/suggestions/', waitlist_suggestions, name='waitlist-suggestions'),
 
     # Analytics
+    path('api/eventos/<uuid:evento_id>/analytics/', evento_analytics, name='evento-analytics'),
+    path('api/eventos/<uuid:evento_id>/visualizacao/', registrar_visualizacao, name='evento-registrar-visualizacao'),
     path('api/eventos/<uuid:evento_id>/analytics/geral/', evento_analytics_geral, name='evento-analytics-geral'),
     path('api/eventos/<uuid:evento_id>/analytics/demograficos/', evento_analytics_demograficos, name='evento-analytics-demograficos'),
     path('api/eventos/<uuid:evento_id>/analytics/interacoes/', evento_analytics_interacoes, name='evento-analytics-interacoes'),
+    path('api/eventos/<uuid:evento_id>/analytics/serie/', evento_analytics_serie, name='evento-analytics-serie'),
     path('api/eventos/<uuid:evento_id>/analytics/roi/', evento_analytics_roi, name='evento-analytics-roi'),
     path('api/eventos/<uuid:evento_id>/analytics/atualizar-custo/', evento_analytics_atualizar_custo, name='evento-analytics-atualizar-custo'),
     path('api/eventos/<uuid:evento_id>/analytics/exportar-pdf/', evento_analytics_exportar_pdf, name='evento-analytics-exportar-pdf'),
 
     # Dashboard
+    path('api/dashboard/', dashboard, name='dashboard'),
     path('api/dashboard/metricas/', dashboard_metricas, name='dashboard-metricas'),
     path('api/dashboard/eventos-proximos/', eventos_proximos, name='dashboard-eventos-proximos'),
     path('api/dashboard/eventos-anteriores/', eventos_anteriores, name='dashboard-eventos-anteriores'),
@@ -121,6 +135,7 @@ urlpatterns = [
 
     # Check-in
     path('api/checkin/<uuid:inscricao_id>/', realizar_checkin, name='realizar-checkin'),
+    path('api/checkin/evento/<uuid:evento_id>/sincronizar/', sincronizar_checkins, name='sincronizar-checkins'),
 
     # Notificações
     path('api/notificacoes/', include('apps.notificacoes.urls')),
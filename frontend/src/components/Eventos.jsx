@@ -3,6 +3,7 @@ import { useNavigate } from "react-router-dom";
 import { useContext } from "react";
 import { FavoritesContext } from "../contexts/FavoritesContext";
 import api from "../api.js";
+import OptimizedImage from "./OptimizedImage";
 
 function Eventos({ eventos }) {
   const navigate = useNavigate();
@@ -99,12 +100,12 @@ function Eventos({ eventos }) {
             >
               <div className="relative w-full h-48 bg-gradient-to-br from-gray-200 to-gray-300">
                 {getImageUrl(evento.foto_capa) ? (
-                  <img
-                    src={getImageUrl(evento.foto_capa)}
+                  <OptimizedImage
+                    src={evento.foto_capa}
+                    variantes={evento.foto_capa_variantes}
+                    sizes="(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw"
                     alt={evento.titulo}
                     className="w-full h-full object-cover"
-                    loading="lazy"
-                    onError={(e) => e.target.style.display = "none"}
                   />
                 ) : (
                   <div className="w-full h-full flex items-center justify-center">
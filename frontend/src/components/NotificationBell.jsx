@@ -2,6 +2,7 @@ import { useState, useEffect, useRef } from 'react';
 import { FaBell } from 'react-icons/fa';
 import { useNavigate } from 'react-router-dom';
 import api from '../api';
+import { ACCESS_TOKEN } from '../constants.js';
 
 const NotificationBell = () => {
   const [notifications, setNotifications] = useState([]);
@@ -61,11 +62,77 @@ const NotificationBell = () => {
     }
   };
 
-  // Buscar contador periodicamente (a cada 30 segundos)
+  // Notificações em tempo real pelo WebSocket. O polling do contador (a
+  // cada 30 segundos) só roda enquanto o socket não está conectado.
   useEffect(() => {
-    fetchUnreadCount();
-    const interval = setInterval(fetchUnreadCount, 30000);
-    return () => clearInterval(interval);
+    let ws;
+    let pollInterval = null;
+    let reconnectTimeout;
+    let tentativas = 0;
+    let encerrado = false;
+
+    const iniciarPolling = () => {
+      if (pollInterval) return;
+      fetchUnreadCount();
+      pollInterval = setInterval(fetchUnreadCount, 30000);
+    };
+
+    const pararPolling = () => {
+      clearInterval(pollInterval);
+      pollInterval = null;
+    };
+
+    const conectar = () => {
+      const token = localStorage.getItem(ACCESS_TOKEN);
+      if (!token || typeof WebSocket === 'undefined') {
+        iniciarPolling();
+        return;
+      }
+
+      const wsProtocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+      const wsHost = import.meta.env.VITE_LOCAL_IP || window.location.hostname;
+      const wsPort = '8000'; // Porta do backend Daphne
+      ws = new WebSocket(`${wsProtocol}//${wsHost}:${wsPort}/ws/notificacoes/?token=${encodeURIComponent(token)}`);
+
+      ws.onopen = () => {
+        tentativas = 0;
+        pararPolling();
+      };
+
+      ws.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        if (data.type === 'contador') {
+          // Total recalculado ou, para notificações e comunicados novos, quanto somar
+          if (data.nao_lidas !== undefined) {
+            setUnreadCount(data.nao_lidas);
+          } else {
+            setUnreadCount((prev) => prev + data.incremento);
+          }
+        } else if (data.type === 'notificacao' && data.notificacao.id) {
+          setNotifications((prev) => [
+            data.notificacao,
+            ...prev.filter((n) => n.id !== data.notificacao.id),
+          ].slice(0, 5));
+        }
+      };
+
+      ws.onclose = () => {
+        if (encerrado) return;
+        // Token expirado (4401) é renovado pelo interceptor do api durante o polling
+        iniciarPolling();
+        const espera = Math.min(60000, 1000 * 2 ** tentativas);
+        tentativas += 1;
+        reconnectTimeout = setTimeout(conectar, espera);
+      };
+    };
+
+    conectar();
+    return () => {
+      encerrado = true;
+      pararPolling();
+      clearTimeout(reconnectTimeout);
+      if (ws) ws.close();
+    };
   }, []);
 
   // Buscar notificações quando abrir o dropdown
@@ -96,6 +163,7 @@ const NotificationBell = () => {
       transferencia_recusada: '❌',
       transferencia_recebida: '📨',
       inscricao_confirmada: '🎉',
+      evento_cancelado: '🚫',
       checkin_lembrete: '⏰',
       avaliacao_pendente: '⭐',
       documento_aprovado: '✔️',
@@ -2,14 +2,18 @@ import { useState, useEffect } from 'react';
 import { getImageUrl, preloadImage } from '../utils/imageLoader';
 
 /**
- * Componente de imagem otimizado com lazy loading e cache
+ * Componente de imagem otimizado com lazy loading e cache.
+ * Quando `variantes` (campo *_variantes da API) é informado, serve as
+ * versões redimensionadas em WebP/JPEG via srcset em vez do original.
  */
 function OptimizedImage({ 
   src, 
   alt, 
   className = '', 
   fallback = null,
-  eager = false 
+  eager = false,
+  variantes = null,
+  sizes = '100vw'
 }) {
   const [imageSrc, setImageSrc] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
@@ -56,6 +60,23 @@ function OptimizedImage({
     );
   }
 
+  if (variantes?.srcset) {
+    return (
+      <picture>
+        <source type="image/webp" srcSet={variantes.srcset.webp} sizes={sizes} />
+        <img
+          src={variantes.card?.jpeg || imageSrc}
+          srcSet={variantes.srcset.jpeg}
+          sizes={sizes}
+          alt={alt}
+          className={className}
+          loading={eager ? 'eager' : 'lazy'}
+          onError={() => setHasError(true)}
+        />
+      </picture>
+    );
+  }
+
   return (
     <img
       src={imageSrc}
@@ -67,65 +67,13 @@ function DashboardOrganizador() {
           setUser(userRes.value.data);
         }
 
-        // Buscar dados das APIs
-        const [metricas, eventosProximos, eventosAnteriores, notificacoes, graficos] = 
-          await Promise.allSettled([
-            api.get("/api/dashboard/metricas/"),
-            api.get("/api/dashboard/eventos-proximos/"),
-            api.get("/api/dashboard/eventos-anteriores/"),
-            api.get("/api/dashboard/notificacoes/"),
-            api.get("/api/dashboard/graficos/")
-          ]);
-
-        // Atualizar métricas
-        if (metricas.status === 'fulfilled') {
-          setMetrics(metricas.value.data);
-        } else {
-          // Dados de fallback
-          setMetrics({
-            totalInscricoes: 0,
-            taxaComparecimento: 0,
-            receitaTotal: 0,
-            scoreMedia: 0
-          });
-        }
-
-        // Atualizar próximos eventos
-        if (eventosProximos.status === 'fulfilled') {
-          setProximosEventos(eventosProximos.value.data);
-        } else {
-          setProximosEventos([]);
-        }
-
-        // Atualizar eventos anteriores
-        if (eventosAnteriores.status === 'fulfilled') {
-          setEventosAnteriores(eventosAnteriores.value.data);
-        } else {
-          setEventosAnteriores([]);
-        }
-
-        // Atualizar notificações
-        if (notificacoes.status === 'fulfilled') {
-          setNotificacoes(notificacoes.value.data);
-        } else {
-          setNotificacoes([]);
-        }
-
-        // Atualizar gráficos
-        if (graficos.status === 'fulfilled') {
-          setGraficos(graficos.value.data);
-        } else {
-          // Dados de fallback para gráficos
-          setGraficos({
-            comparecimentoMensal: [],
-            scoreMedio: [],
-            desempenhoEventos: [
-              { name: 'Completos', value: 0, color: '#10B981' },
-              { name: 'Em andamento', value: 0, color: '#F59E0B' },
-              { name: 'Cancelados', value: 0, color: '#EF4444' }
-            ]
-          });
-        }
+        // Todos os blocos do dashboard numa única requisição
+        const { data } = await api.get("/api/dashboard/");
+        setMetrics(data.metricas);
+        setProximosEventos(data.eventosProximos);
+        setEventosAnteriores(data.eventosAnteriores);
+        setNotificacoes(data.notificacoes);
+        setGraficos(data.graficos);
 
       } catch (error) {
         console.error("Erro ao carregar dados do dashboard:", error);
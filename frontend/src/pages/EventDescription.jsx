@@ -71,6 +71,9 @@ function EventDescription() {
         setLoading(false);
       });
 
+    // Registra a visualização; falhas não afetam a página
+    api.post(`/api/eventos/${eventId}/visualizacao/`).catch(() => {});
+
     api
       .get(`/api/eventos/${eventId}/avaliacoes/`)
       .then((res) => {
@@ -66,30 +66,23 @@ function EventoAnalytics() {
       const userRes = await api.get("/api/user/me/");
       setUser(userRes.data);
       
-      // Buscar dados de analytics
-      const [geralRes, demograficosRes, interacoesRes, roiRes] = await Promise.allSettled([
-        api.get(`/api/eventos/${eventoId}/analytics/geral/`),
-        api.get(`/api/eventos/${eventoId}/analytics/demograficos/`),
-        api.get(`/api/eventos/${eventoId}/analytics/interacoes/`),
-        api.get(`/api/eventos/${eventoId}/analytics/roi/`)
+      // Geral, ROI e interações vêm numa resposta; demográficos à parte
+      const [analyticsRes, demograficosRes] = await Promise.allSettled([
+        api.get(`/api/eventos/${eventoId}/analytics/`),
+        api.get(`/api/eventos/${eventoId}/analytics/demograficos/`)
       ]);
 
-      if (geralRes.status === 'fulfilled') {
-        setMetricsGeral(geralRes.value.data);
+      if (analyticsRes.status === 'fulfilled') {
+        const { geral, interacoes, roi } = analyticsRes.value.data;
+        setMetricsGeral(geral);
+        setInteracoes(interacoes);
+        setRoi(roi);
+        setCustoEvento(roi.custos.custo_total || '0');
       }
       
       if (demograficosRes.status === 'fulfilled') {
         setDemograficos(demograficosRes.value.data);
       }
-      
-      if (interacoesRes.status === 'fulfilled') {
-        setInteracoes(interacoesRes.value.data);
-      }
-      
-      if (roiRes.status === 'fulfilled') {
-        setRoi(roiRes.value.data);
-        setCustoEvento(roiRes.value.data.custos.custo_total || '0');
-      }
 
     } catch (error) {
       console.error("Erro ao carregar analytics:", error);
@@ -125,22 +118,29 @@ function EventoAnalytics() {
 
   const handleExportarPDF = async () => {
     try {
-      const response = await api.get(`/api/eventos/${eventoId}/analytics/exportar-pdf/`);
-      
-      // Converter base64 para blob e fazer download
-      const byteCharacters = atob(response.data.pdf_base64);
-      const byteNumbers = new Array(byteCharacters.length);
-      for (let i = 0; i < byteCharacters.length; i++) {
-        byteNumbers[i] = byteCharacters.charCodeAt(i);
+      // Relatórios grandes são gerados em segundo plano: o backend responde
+      // 202 até o arquivo ficar pronto no mesmo endereço
+      let response;
+      for (let tentativa = 0; tentativa < 60; tentativa++) {
+        response = await api.get(`/api/eventos/${eventoId}/analytics/exportar-pdf/`, {
+          responseType: 'blob'
+        });
+        if (response.status !== 202) break;
+        await new Promise((resolve) => setTimeout(resolve, 2000));
       }
-      const byteArray = new Uint8Array(byteNumbers);
-      const blob = new Blob([byteArray], { type: 'application/pdf' });
-      
+      if (response.status === 202) {
+        alert('O relatório ainda está sendo gerado. Tente novamente em alguns instantes.');
+        return;
+      }
+
+      const disposition = response.headers['content-disposition'] || '';
+      const filename = disposition.match(/filename="?([^"]+)"?/)?.[1] || 'analytics.pdf';
+
       // Criar link para download
-      const url = window.URL.createObjectURL(blob);
+      const url = window.URL.createObjectURL(response.data);
       const link = document.createElement('a');
       link.href = url;
-      link.download = response.data.filename;
+      link.download = filename;
       document.body.appendChild(link);
       link.click();
       document.body.removeChild(link);
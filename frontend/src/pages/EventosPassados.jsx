@@ -97,6 +97,26 @@ function EventCard({ inscricao }) {
     return endereco && endereco.length > 20 ? endereco.substring(0, 20) + '...' : endereco
   }
 
+  const baixarCertificado = async () => {
+    try {
+      const response = await api.get(`/api/inscricoes/${inscricao.id}/certificado/`, {
+        responseType: 'blob'
+      })
+      const disposition = response.headers['content-disposition'] || ''
+      const url = window.URL.createObjectURL(response.data)
+      const link = document.createElement('a')
+      link.href = url
+      link.download = disposition.match(/filename="?([^"]+)"?/)?.[1] || 'certificado.pdf'
+      document.body.appendChild(link)
+      link.click()
+      document.body.removeChild(link)
+      window.URL.revokeObjectURL(url)
+    } catch (error) {
+      console.error('Erro ao baixar certificado:', error)
+      alert('O certificado fica disponível depois do check-in no evento.')
+    }
+  }
+
   return (
     <div className="bg-white rounded-xl shadow-md hover:shadow-xl transition-all duration-300 overflow-hidden border border-gray-100 h-fit">
       <div className="relative h-48 overflow-hidden">
@@ -166,7 +186,11 @@ function EventCard({ inscricao }) {
               <Award size={18} className="text-orange-600" /> 
               Avaliar
             </button>
-            <button className="w-full text-left px-4 py-3 hover:bg-gray-50 rounded-lg flex items-center gap-3 text-sm font-medium transition-colors">
+            <button
+              onClick={baixarCertificado}
+              disabled={!inscricao.checkin_realizado}
+              className="w-full text-left px-4 py-3 hover:bg-gray-50 rounded-lg flex items-center gap-3 text-sm font-medium transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
+            >
               <Download size={18} className="text-purple-600" /> 
               Certificado
             </button>
@@ -15,6 +15,7 @@ function Home() {
   const [filtroAtivo, setFiltroAtivo] = useState("Todos");
   const [openModal, setOpenModal] = useState(false);
   const [loading, setLoading] = useState(true);
+  const [resultadosBusca, setResultadosBusca] = useState(null);
   const { favorites, setFavorites } = useContext(FavoritesContext);
 
   useEffect(() => {
@@ -54,11 +55,44 @@ function Home() {
     fetchData();
   }, [setFavorites]);
 
-  const eventosFiltrados = eventos.filter(evento => {
+  // Busca textual no servidor (ignora acentos e ordena por relevância)
+  useEffect(() => {
+    const termo = busca.trim();
+    if (termo.length < 2) {
+      setResultadosBusca(null);
+      return;
+    }
+
+    let cancelado = false;
+    const timer = setTimeout(async () => {
+      try {
+        const params = { q: termo };
+        if (filtroAtivo.toLowerCase() !== "todos") {
+          params.categoria = filtroAtivo;
+        }
+        const res = await api.get("/api/eventos/busca/", { params });
+        if (!cancelado) {
+          setResultadosBusca(res.data);
+        }
+      } catch (error) {
+        console.error("Erro na busca de eventos:", error);
+        if (!cancelado) {
+          setResultadosBusca(null);
+        }
+      }
+    }, 300);
+
+    return () => {
+      cancelado = true;
+      clearTimeout(timer);
+    };
+  }, [busca, filtroAtivo]);
+
+  const eventosFiltrados = resultadosBusca ?? eventos.filter(evento => {
     const filtroTipo = filtroAtivo.toLowerCase() === "todos" || 
                        evento.categoria?.toLowerCase() === filtroAtivo.toLowerCase();
     
-    const filtroBusca = !busca || 
+    const filtroBusca = !busca.trim() || 
                         evento.titulo?.toLowerCase().includes(busca.toLowerCase()) ||
                         evento.endereco?.toLowerCase().includes(busca.toLowerCase());
 
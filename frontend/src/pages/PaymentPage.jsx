@@ -169,6 +169,18 @@ const PaymentPage = () => {
           </div>
         </div>
 
+        {paymentData.reserva_expira_em && (
+          <div className="alert-box">
+            <p>
+              Sua vaga está reservada até{' '}
+              {new Date(paymentData.reserva_expira_em).toLocaleTimeString('pt-BR', {
+                hour: '2-digit',
+                minute: '2-digit'
+              })}. Após esse horário, sem a confirmação do pagamento, a vaga é liberada.
+            </p>
+          </div>
+        )}
+
         {paymentData.pagamento?.qr_code_pix_url ? (
           <div className="qr-code-section">
             <h3>QR Code PIX</h3>
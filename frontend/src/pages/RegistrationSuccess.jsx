@@ -70,8 +70,8 @@ function RegistrationSuccess() {
                 id: data.id,
                 event: data.evento_id || data.event || data.event,
                 event_title: data.evento_titulo || data.event_title || data.event?.title || data.evento?.titulo,
-                // prefer the data-uri image when available; fallback to textual qr_code only for copy
-                qr_code_image: data.qr_code_image || data.qr_code || null,
+                // URL do SVG do QR code; o texto em qr_code é usado só para copiar
+                qr_code_image: data.qr_code_image || null,
                 event_start_date: data.evento_data || data.event_start_date || data.event?.data_evento,
                 organizer_contact: data.organizador_telefone || data.organizer_contact || data.organizador_telefone || null,
                 organizer_name: data.organizador_nome || data.organizer_name || null,
@@ -122,7 +122,7 @@ function RegistrationSuccess() {
         if (registration?.qr_code_image) {
             const link = document.createElement('a');
             link.href = registration.qr_code_image;
-            link.download = `qrcode-${registration.event_title || registration.raw.evento_titulo || registration.raw.event_title}.png`;
+            link.download = `qrcode-${registration.event_title || registration.raw.evento_titulo || registration.raw.event_title}.svg`;
             document.body.appendChild(link);
             link.click();
             document.body.removeChild(link);
@@ -131,8 +131,7 @@ function RegistrationSuccess() {
 
     const handleCopyCode = async () => {
         try {
-            // Tenta copiar o valor textual do qr (se existir no raw) senão copia a data-uri
-            const code = registration?.raw?.qr_code || registration?.raw?.qr_code_image || registration?.qr_code_image;
+            const code = registration?.raw?.qr_code;
             if (!code) return;
             await navigator.clipboard.writeText(code);
             alert('Código QR copiado para a área de transferência');
@@ -43,6 +43,30 @@ function VerificarDocumento() {
     fetchData();
   }, []);
 
+  // A verificação roda em segundo plano: consulta o status até sair de "verificando"
+  useEffect(() => {
+    if (statusAtual !== "verificando") return;
+
+    const interval = setInterval(async () => {
+      try {
+        const res = await api.get("/api/status-documento/");
+        const novoStatus = res.data.documento_verificado;
+        if (novoStatus === "verificando") return;
+        setStatusAtual(novoStatus);
+        setResultado({
+          status: novoStatus,
+          mensagem: novoStatus === "aprovado"
+            ? "Documento verificado com sucesso! Você já pode criar eventos."
+            : "Não foi possível verificar seu documento. Confira os dados e envie novamente.",
+        });
+      } catch (error) {
+        console.error("Erro ao consultar status do documento:", error);
+      }
+    }, 3000);
+
+    return () => clearInterval(interval);
+  }, [statusAtual]);
+
   const handleVerificar = async (e) => {
     e.preventDefault();
     
@@ -63,7 +87,7 @@ function VerificarDocumento() {
       const res = await api.post("/api/verificar-documento/", formData, {
         headers: { "Content-Type": "multipart/form-data" }
       });
-      setResultado(res.data);
+      // 202: documento recebido, o resultado chega pela consulta de status
       setStatusAtual(res.data.status);
     } catch (err) {
       const data = err.response?.data;